@@ -5,48 +5,115 @@ AI 글쓰기 도우미 백엔드 - Ollama 버전
 """
 
 import os
-import json
-from flask import Flask, request, jsonify
+import time
+from flask import Flask, request, jsonify, Response, stream_with_context, has_request_context
 from flask_cors import CORS
 from typing import List, Dict
-import re
-import ollama
-
-# Ollama 모델 설정
-MODEL_NAME = os.getenv('OLLAMA_MODEL', 'qwen3-coder:30b')
+from llm_gateway import gateway, LLM_CONFIG, LLMError, sse_event
+from response_cache import response_cache
+from ollama_scheduler import ollama_scheduler
+from prompts import prompt_registry
+import chunking
+import structured_output
+from structured_output import StructuredOutputError
+
+# Ollama 모델 설정 (OLLAMA_MODEL 환경변수, 기본값은 llm_gateway.LLM_CONFIG)
+MODEL_NAME = LLM_CONFIG['ollama']['model']
 # 다른 모델 옵션: qwen3-coder:30b, qwen2.5-coder:7b
 
 app = Flask(__name__)
 CORS(app)
 
+# 응답 캐시 키에 들어가는 프롬프트 템플릿 (수정하면 이전 캐시는 자연히 무효화)
+SEO_ANALYSIS_PROMPT = """
+다음 블로그 글의 SEO를 분석해주세요.
+
+제목: {title}
+내용: {content}
+
+다음 항목들을 분석해주세요:
+1. 제목 최적화 (길이, 키워드 포함)
+2. 내용 품질 (가독성, 구조)
+3. 키워드 밀도
+4. 개선 제안사항
+
+JSON 형식으로 응답해주세요:
+{{
+    "overall_score": 85,
+    "title_analysis": {{"length": 50, "optimal": true, "suggestion": ""}},
+    "content_analysis": {{"word_count": 500, "readability": "좋음", "keyword_density": "적절"}},
+    "improvements": ["개선사항1", "개선사항2"]
+}}
+"""
+
+KEYWORDS_PROMPT = """
+다음 내용에서 SEO 키워드 10개를 추출해주세요.
+중요도 순으로 정렬하세요.
+
+내용: {content}
+
+키워드 목록 (콤마로 구분):
+"""
+
+def request_priority() -> str:
+    """X-Priority 헤더로 지정한 스케줄러 우선순위 (기본 interactive, 일괄 작업은 batch)"""
+    if has_request_context():
+        return request.headers.get('X-Priority', 'interactive')
+    return 'interactive'
+
 class AIAssistant:
     def __init__(self):
         self.model = MODEL_NAME
         # Ollama 연결 테스트
         try:
-            ollama.list()
+            gateway.client('ollama').list()
             print(f"✅ Ollama 연결 성공! 모델: {self.model}")
+            # OLLAMA_PINNED_MODELS에 지정한 모델은 미리 메모리에 올려 둠
+            ollama_scheduler.warm()
         except Exception as e:
             print(f"❌ Ollama 연결 실패: {e}")
             print("Ollama가 실행 중인지 확인하세요: ollama serve")
     
-    def _call_ollama(self, prompt: str, system_prompt: str = "") -> str:
-        """Ollama 모델 호출 헬퍼 함수"""
+    def _call_ollama(self, prompt: str, system_prompt: str = "", priority: str = None) -> str:
+        """Ollama 모델 호출 헬퍼 함수 (priority를 생략하면 요청의 X-Priority 헤더)"""
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
-            response = ollama.chat(
-                model=self.model,
-                messages=messages
-            )
-            return response['message']['content']
-        except Exception as e:
+            return ollama_scheduler.generate(prompt, system=system_prompt, model=self.model,
+                                             priority=priority or request_priority()).text
+        except LLMError as e:
+            print(f"Ollama 호출 오류: {e}")
+            return f"[오류: {e}]"
+    
+    def _call_ollama_cached(self, endpoint: str, template: str, inputs: Dict, system_prompt: str = "",
+                            validate=None, priority: str = None) -> str:
+        """같은 입력이면 저장된 응답을 재사용하는 Ollama 호출 (오류 응답은 저장하지 않음)"""
+        priority = priority or request_priority()
+        
+        def generate():
+            return ollama_scheduler.generate(template.format(**inputs), system=system_prompt, model=self.model,
+                                             priority=priority).text
+        try:
+            return response_cache.get_or_generate(endpoint, 'ollama', self.model, template,
+                                                  dict(inputs, system=system_prompt), generate, validate)
+        except LLMError as e:
             print(f"Ollama 호출 오류: {e}")
             return f"[오류: {e}]"
     
+    def stream_ollama(self, prompt: str, system_prompt: str = ""):
+        """Ollama 스트리밍 호출 - 토큰을 SSE 이벤트로 변환 (token 여러 번 후 done 또는 error)"""
+        started = time.perf_counter()
+        first_token = None
+        try:
+            for text in ollama_scheduler.stream(prompt, system=system_prompt, model=self.model,
+                                                priority=request_priority()):
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                yield sse_event({'type': 'token', 'text': text})
+            yield sse_event({'type': 'done', 'first_token': round(first_token or 0.0, 3),
+                             'elapsed': round(time.perf_counter() - started, 3)})
+        except LLMError as e:
+            print(f"Ollama 스트리밍 오류: {e}")
+            yield sse_event({'type': 'error', 'message': str(e)})
+    
     def generate_titles(self, topic: str, keywords: List[str] = None) -> List[Dict]:
         """SEO 최적화된 제목 5개 생성"""
         keywords_str = ', '.join(keywords) if keywords else ''
@@ -68,13 +135,10 @@ JSON 형식으로 응답해주세요:
         response = self._call_ollama(prompt, "당신은 SEO 전문가입니다. 한국어로 답변하세요.")
         
         try:
-            # JSON 파싱 시도
-            import re
-            json_match = re.search(r'\[.*\]', response, re.DOTALL)
-            if json_match:
-                titles = json.loads(json_match.group())
-                return titles[:5]  # 최대 5개
-        except:
+            # 응답에서 첫 번째 JSON 배열만 추출
+            titles = structured_output.parse(response, List[dict])
+            return titles[:5]  # 최대 5개
+        except StructuredOutputError:
             pass
         
         # 파싱 실패시 기본 형식
@@ -93,6 +157,10 @@ JSON 형식으로 응답해주세요:
     
     def expand_text(self, text: str, style: str = "detailed") -> str:
         """텍스트 확장"""
+        return self._call_ollama(*self.expand_text_prompt(text, style))
+    
+    def expand_text_prompt(self, text: str, style: str = "detailed"):
+        """텍스트 확장 (프롬프트, 시스템 프롬프트)"""
         style_prompts = {
             "detailed": "매우 자세하고 구체적으로",
             "concise": "간결하지만 핵심을 놓치지 않게",
@@ -110,7 +178,7 @@ JSON 형식으로 응답해주세요:
 확장된 텍스트:
 """
         
-        return self._call_ollama(prompt, "당신은 전문 콘텐츠 작가입니다.")
+        return prompt, "당신은 전문 콘텐츠 작가입니다."
     
     def summarize_text(self, text: str, max_length: int = 200) -> str:
         """텍스트 요약"""
@@ -128,6 +196,10 @@ JSON 형식으로 응답해주세요:
     
     def change_tone(self, text: str, tone: str) -> str:
         """문체 변경"""
+        return self._call_ollama(*self.change_tone_prompt(text, tone))
+    
+    def change_tone_prompt(self, text: str, tone: str):
+        """문체 변경 (프롬프트, 시스템 프롬프트)"""
         tone_styles = {
             "professional": "전문적이고 격식 있는 문체",
             "friendly": "친근하고 편안한 대화체",
@@ -149,83 +221,43 @@ JSON 형식으로 응답해주세요:
 {style_desc}로 변경된 텍스트:
 """
         
-        return self._call_ollama(prompt, f"당신은 {style_desc} 전문가입니다.")
+        return prompt, f"당신은 {style_desc} 전문가입니다."
     
     def generate_from_template(self, template_name: str, content: str) -> str:
         """템플릿 기반 텍스트 생성"""
-        templates = {
-            "blog_post_intro": """
-블로그 포스트 도입부를 작성해주세요.
-독자의 관심을 끌고, 이 글을 읽어야 하는 이유를 명확히 전달하세요.
-내용: {content}
-""",
-            "product_description": """
-제품 설명을 작성해주세요.
-특징, 장점, 사용 사례를 포함하여 구매욕구를 자극하세요.
-제품 정보: {content}
-""",
-            "social_media_post": """
-소셜 미디어 포스트를 작성해주세요.
-짧고 임팩트 있게, 해시태그 3-5개 포함하세요.
-내용: {content}
-""",
-            "how_to_guide": """
-하우투 가이드를 작성해주세요.
-단계별로 명확하게, 초보자도 따라할 수 있도록 설명하세요.
-주제: {content}
-""",
-            "listicle": """
-리스티클(목록형 글)을 작성해주세요.
-5-10개 항목으로 구성하고, 각 항목마다 설명을 추가하세요.
-주제: {content}
-""",
-            "review": """
-리뷰를 작성해주세요.
-장점, 단점, 추천 대상을 포함하세요.
-대상: {content}
-"""
-        }
-        
-        prompt_template = templates.get(template_name, "다음 내용으로 글을 작성해주세요: {content}")
-        prompt = prompt_template.format(content=content)
-        
-        return self._call_ollama(prompt, "당신은 전문 콘텐츠 작가입니다.")
+        return self._call_ollama(*self.template_prompt(template_name, content))
+    
+    def template_prompt(self, template_name: str, content: str):
+        """템플릿 기반 텍스트 생성 (프롬프트, 시스템 프롬프트) - 공유 레지스트리의 컴파일된 템플릿"""
+        return prompt_registry.render(template_name, content=content)
     
     def analyze_seo(self, title: str, content: str) -> Dict:
-        """SEO 분석"""
-        prompt = f"""
-다음 블로그 글의 SEO를 분석해주세요.
-
-제목: {title}
-내용: {content[:500]}...
-
-다음 항목들을 분석해주세요:
-1. 제목 최적화 (길이, 키워드 포함)
-2. 내용 품질 (가독성, 구조)
-3. 키워드 밀도
-4. 개선 제안사항
-
-JSON 형식으로 응답해주세요:
-{{
-    "overall_score": 85,
-    "title_analysis": {{"length": 50, "optimal": true, "suggestion": ""}},
-    "content_analysis": {{"word_count": 500, "readability": "좋음", "keyword_density": "적절"}},
-    "improvements": ["개선사항1", "개선사항2"]
-}}
-"""
-        
-        response = self._call_ollama(prompt, "당신은 SEO 전문가입니다.")
-        
-        try:
-            # JSON 파싱 시도
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-        except:
-            pass
+        """SEO 분석 - 긴 글은 조각별로 분석(조각별 캐시)해 합침"""
+        # 조각 분석은 작업 스레드에서 실행되어 요청 컨텍스트가 없으므로 우선순위를 미리 읽어 둠
+        priority = request_priority()
+        
+        def analyze_chunk(chunk: str):
+            response = self._call_ollama_cached('analyze_seo', SEO_ANALYSIS_PROMPT,
+                                                {'title': title, 'content': chunk},
+                                                "당신은 SEO 전문가입니다.",
+                                                validate=structured_output.validator(dict), priority=priority)
+            try:
+                return structured_output.parse(response, dict)
+            except StructuredOutputError:
+                return None
+        
+        chunks = chunking.split_chunks(content) or [content]
+        results = chunking.map_chunks_sync(chunks, analyze_chunk)
+        parsed = [(result, weight) for result, weight in zip(results, chunking.chunk_weights(chunks)) if result]
+        word_count = len(content.split())
+        if parsed:
+            analysis = chunking.merge_results([result for result, _ in parsed], [weight for _, weight in parsed])
+            if len(chunks) > 1 and isinstance(analysis.get('content_analysis'), dict):
+                # 조각별 단어 수의 평균이 아니라 글 전체의 단어 수
+                analysis['content_analysis']['word_count'] = word_count
+            return analysis
         
         # 기본 분석 결과
-        word_count = len(content.split())
         title_length = len(title)
         
         return {
@@ -294,16 +326,8 @@ SEO를 위한 메타 설명을 생성해주세요.
     
     def suggest_keywords(self, content: str) -> List[str]:
         """키워드 제안"""
-        prompt = f"""
-다음 내용에서 SEO 키워드 10개를 추출해주세요.
-중요도 순으로 정렬하세요.
-
-내용: {content[:500]}
-
-키워드 목록 (콤마로 구분):
-"""
-        
-        response = self._call_ollama(prompt, "당신은 키워드 분석 전문가입니다.")
+        response = self._call_ollama_cached('suggest_keywords', KEYWORDS_PROMPT, {'content': content[:500]},
+                                            "당신은 키워드 분석 전문가입니다.")
         keywords = [k.strip() for k in response.split(',')][:10]
         return keywords
 
@@ -357,6 +381,26 @@ def expand_text():
             'message': str(e)
         }), 500
 
+def stream_response(events):
+    """SSE 응답 (프록시 버퍼링 없이 바로 전달)"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/ai/expand/stream', methods=['POST'])
+def expand_text_stream():
+    """텍스트 확장 스트리밍 API (SSE)"""
+    data = request.get_json() or {}
+    text = data.get('text', '')
+    style = data.get('style', 'detailed')
+    
+    if not text:
+        return jsonify({'error': '텍스트를 입력해주세요'}), 400
+    
+    return stream_response(assistant.stream_ollama(*assistant.expand_text_prompt(text, style)))
+
 @app.route('/api/ai/summarize', methods=['POST'])
 def summarize_text():
     """텍스트 요약 API"""
@@ -403,6 +447,18 @@ def change_tone():
             'message': str(e)
         }), 500
 
+@app.route('/api/ai/change-tone/stream', methods=['POST'])
+def change_tone_stream():
+    """톤 변경 스트리밍 API (SSE)"""
+    data = request.get_json() or {}
+    text = data.get('text', '')
+    tone = data.get('tone', 'friendly')
+    
+    if not text:
+        return jsonify({'error': '텍스트를 입력해주세요'}), 400
+    
+    return stream_response(assistant.stream_ollama(*assistant.change_tone_prompt(text, tone)))
+
 @app.route('/api/ai/generate-from-template', methods=['POST'])
 def generate_from_template():
     """템플릿 기반 텍스트 생성 API"""
@@ -426,6 +482,18 @@ def generate_from_template():
             'message': str(e)
         }), 500
 
+@app.route('/api/ai/generate-from-template/stream', methods=['POST'])
+def generate_from_template_stream():
+    """템플릿 기반 텍스트 생성 스트리밍 API (SSE)"""
+    data = request.get_json() or {}
+    template_name = data.get('template_name', '')
+    content = data.get('content', '')
+    
+    if not template_name or not content:
+        return jsonify({'error': '템플릿 이름과 내용을 모두 입력해주세요'}), 400
+    
+    return stream_response(assistant.stream_ollama(*assistant.template_prompt(template_name, content)))
+
 @app.route('/api/ai/analyze-seo', methods=['POST'])
 def analyze_seo():
     """SEO 분석 API"""
@@ -517,6 +585,23 @@ def suggest_keywords():
             'message': str(e)
         }), 500
 
+@app.route('/api/ai/metrics', methods=['GET'])
+def llm_metrics():
+    """LLM 호출 지표 API"""
+    return jsonify({
+        'status': 'success',
+        'metrics': gateway.metrics(),
+        'scheduler': ollama_scheduler.metrics()
+    })
+
+@app.route('/api/ai/cache-stats', methods=['GET'])
+def cache_stats():
+    """엔드포인트별 응답 캐시 적중률 API"""
+    return jsonify({
+        'status': 'success',
+        'cache': response_cache.stats()
+    })
+
 @app.route('/api/ai/test', methods=['GET'])
 def test_ai():
     """AI API 테스트"""
@@ -527,13 +612,18 @@ def test_ai():
         'endpoints': [
             '/api/ai/generate-titles',
             '/api/ai/expand',
+            '/api/ai/expand/stream',
             '/api/ai/summarize',
             '/api/ai/change-tone',
+            '/api/ai/change-tone/stream',
             '/api/ai/analyze-seo',
             '/api/ai/check-tone',
             '/api/ai/generate-from-template',
+            '/api/ai/generate-from-template/stream',
             '/api/ai/meta-description',
-            '/api/ai/suggest-keywords'
+            '/api/ai/suggest-keywords',
+            '/api/ai/metrics',
+            '/api/ai/cache-stats'
         ]
     })
 
@@ -1,15 +1,33 @@
 import asyncio
-import aiohttp
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
-import feedparser
 from bs4 import BeautifulSoup
+from rate_limiter import rate_limiter
+from http_client import http_client
+from feed_cache import feed_cache, CacheStats
+from feed_parser_pool import feed_parser_pool, parse_rss_feed
+from dedup import cluster_items
+from relevance import RelevanceScorer, top_k
+
+TRANSLATE_CONCURRENCY = 4  # 동시에 진행하는 번역 요청 수
+TRANSLATE_TIMEOUT = 30.0  # 항목별 번역 제한 시간 (초)
+TRANSLATION_CACHE_SIZE = 1000
+LOCALIZED_FIELDS = ('korean_title', 'korean_summary', 'localized')
 
 class AINewsCrawler:
     """AI 뉴스 자동 수집 및 처리 시스템"""
     
-    def __init__(self):
+    def __init__(self, translate_concurrency: int = TRANSLATE_CONCURRENCY,
+                 translate_timeout: float = TRANSLATE_TIMEOUT):
+        self.cache_stats = CacheStats()
+        self.translate_concurrency = translate_concurrency
+        self.translate_timeout = translate_timeout
+        # 내용 해시 -> 번역 결과 (이미 번역한 항목은 다시 보내지 않음)
+        self.translation_cache: OrderedDict = OrderedDict()
+        self.relevance = RelevanceScorer()
         self.sources = {
             'openai': {
                 'url': 'https://openai.com/blog',
@@ -40,17 +58,19 @@ class AINewsCrawler:
         
     async def fetch_all_news(self) -> List[Dict]:
         """모든 소스에서 뉴스 수집"""
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for source_id, source_info in self.sources.items():
-                if source_info.get('rss'):
-                    tasks.append(self.fetch_rss_news(session, source_id, source_info))
-                elif source_info.get('api'):
-                    tasks.append(self.fetch_api_news(session, source_id, source_info))
-                else:
-                    tasks.append(self.fetch_web_news(session, source_id, source_info))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 프로세스 공유 세션의 keep-alive 연결을 실행마다 재사용
+        session = http_client.async_session()
+        self.cache_stats = CacheStats()
+        tasks = []
+        for source_id, source_info in self.sources.items():
+            if source_info.get('rss'):
+                tasks.append(self.fetch_rss_news(session, source_id, source_info, self.cache_stats))
+            elif source_info.get('api'):
+                tasks.append(self.fetch_api_news(session, source_id, source_info, self.cache_stats))
+            else:
+                tasks.append(self.fetch_web_news(session, source_id, source_info))
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
             
         # 결과 통합 및 정렬
         all_news = []
@@ -63,24 +83,25 @@ class AINewsCrawler:
         
         return all_news
     
-    async def fetch_rss_news(self, session, source_id: str, source_info: Dict) -> List[Dict]:
-        """RSS 피드에서 뉴스 수집"""
+    async def fetch_rss_news(self, session, source_id: str, source_info: Dict,
+                             cache_stats: CacheStats = None) -> List[Dict]:
+        """RSS 피드에서 뉴스 수집 (변경이 없으면 캐시된 항목 사용)"""
         try:
-            async with session.get(source_info['rss']) as response:
-                content = await response.text()
-                
-            feed = feedparser.parse(content)
+            await rate_limiter.acquire_async(source_info['rss'])
+            entries = await feed_cache.fetch_async(session, source_info['rss'],
+                                                   feed_parser_pool.bind_async(parse_rss_feed),
+                                                   stats=cache_stats, observe=rate_limiter.observe)
             news_items = []
             
-            for entry in feed.entries[:10]:  # 최신 10개만
+            for entry in entries:
                 news_items.append({
                     'source_id': source_id,
                     'source_name': source_info['name'],
-                    'title': entry.title,
-                    'url': entry.link,
-                    'summary': entry.get('summary', ''),
-                    'published_date': datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now(),
-                    'tags': [tag.term for tag in entry.get('tags', [])],
+                    'title': entry['title'],
+                    'url': entry['url'],
+                    'summary': entry['summary'],
+                    'published_date': datetime(*entry['published_parsed']) if entry['published_parsed'] else datetime.now(),
+                    'tags': entry['tags'],
                     'crawled_date': datetime.now()
                 })
                 
@@ -90,12 +111,16 @@ class AINewsCrawler:
             print(f"Error fetching RSS from {source_id}: {e}")
             return []
     
-    async def fetch_api_news(self, session, source_id: str, source_info: Dict) -> List[Dict]:
-        """API에서 뉴스 수집"""
+    async def fetch_api_news(self, session, source_id: str, source_info: Dict,
+                             cache_stats: CacheStats = None) -> List[Dict]:
+        """API에서 뉴스 수집 (변경이 없으면 캐시된 응답 사용)"""
         try:
             headers = {'User-Agent': 'AI-Auto-Blog/1.0'}
-            async with session.get(source_info['url'], headers=headers) as response:
-                data = await response.json()
+            await rate_limiter.acquire_async(source_info['url'])
+            data = await feed_cache.fetch_async(session, source_info['url'], json.loads, headers=headers,
+                                                stats=cache_stats, observe=rate_limiter.observe)
+            if not data:
+                return []
             
             news_items = []
             
@@ -152,50 +177,8 @@ class AINewsCrawler:
         ]
     
     def analyze_news_relevance(self, news_item: Dict) -> float:
-        """뉴스 관련성 점수 계산"""
-        score = 0.0
-        
-        # 제목과 요약에서 키워드 분석
-        keywords = ['ai', 'artificial intelligence', 'machine learning', 'deep learning',
-                   'gpt', 'claude', 'gemini', 'llm', 'neural network', 'automation']
-        
-        title_lower = news_item['title'].lower()
-        summary_lower = news_item.get('summary', '').lower()
-        
-        for keyword in keywords:
-            if keyword in title_lower:
-                score += 2.0
-            if keyword in summary_lower:
-                score += 1.0
-        
-        # 소스별 가중치
-        source_weights = {
-            'openai': 1.5,
-            'anthropic': 1.5,
-            'google_ai': 1.3,
-            'reddit_ai': 1.0,
-            'hackernews': 1.2
-        }
-        
-        score *= source_weights.get(news_item['source_id'], 1.0)
-        
-        # 최근성 가중치
-        age_days = (datetime.now() - news_item['published_date']).days
-        if age_days == 0:
-            score *= 2.0
-        elif age_days == 1:
-            score *= 1.5
-        elif age_days <= 3:
-            score *= 1.2
-        
-        # 인기도 (있는 경우)
-        if 'score' in news_item:
-            if news_item['score'] > 100:
-                score *= 1.5
-            elif news_item['score'] > 50:
-                score *= 1.2
-        
-        return min(score, 10.0)  # 최대 10점
+        """뉴스 관련성 점수 계산 (단건 - 여러 건은 self.relevance.score로 한 번에 계산)"""
+        return float(self.relevance.score([news_item])[0])
     
     async def translate_and_localize(self, news_item: Dict) -> Dict:
         """뉴스 번역 및 로컬라이징 (시뮬레이션)"""
@@ -206,29 +189,92 @@ class AINewsCrawler:
         
         return news_item
     
+    @staticmethod
+    def translation_key(news_item: Dict) -> str:
+        """번역 대상 내용(제목+요약)의 해시"""
+        content = f"{news_item['title']}\x00{news_item.get('summary', '')}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _apply_cached(self, key: str, news_item: Dict) -> bool:
+        cached = self.translation_cache.get(key)
+        if cached is None:
+            return False
+        self.translation_cache.move_to_end(key)
+        news_item.update(cached)
+        return True
+    
+    async def _localize_one(self, semaphore: asyncio.Semaphore, news_item: Dict) -> Dict:
+        key = self.translation_key(news_item)
+        if self._apply_cached(key, news_item):
+            return news_item
+        
+        async with semaphore:
+            # 기다리는 동안 다른 호출이 같은 내용을 번역했을 수 있음
+            if self._apply_cached(key, news_item):
+                return news_item
+            try:
+                await asyncio.wait_for(self.translate_and_localize(news_item), timeout=self.translate_timeout)
+            except asyncio.TimeoutError:
+                print(f"번역 시간 초과: {news_item['title']}")
+                news_item['localized'] = False
+                return news_item
+            except Exception as e:
+                print(f"번역 오류 ({news_item['title']}): {e}")
+                news_item['localized'] = False
+                return news_item
+        
+        self.translation_cache[key] = {
+            field: news_item[field] for field in LOCALIZED_FIELDS if field in news_item
+        }
+        if len(self.translation_cache) > TRANSLATION_CACHE_SIZE:
+            self.translation_cache.popitem(last=False)
+        return news_item
+    
+    async def localize_all(self, news_items: List[Dict]) -> List[Dict]:
+        """동시 실행 수를 제한해 번역 - 결과는 입력 순서 그대로 반환"""
+        semaphore = asyncio.Semaphore(self.translate_concurrency)
+        # 같은 내용(제목+요약)은 한 번만 번역하고 결과를 나머지 항목에 복사
+        groups: Dict[str, List[Dict]] = {}
+        for news in news_items:
+            groups.setdefault(self.translation_key(news), []).append(news)
+        tasks = [asyncio.ensure_future(self._localize_one(semaphore, items[0])) for items in groups.values()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 호출 측이 취소되면 아직 진행 중인 번역도 함께 취소
+            for task in tasks:
+                task.cancel()
+            raise
+        for first, *duplicates in groups.values():
+            for news in duplicates:
+                news.update({field: first[field] for field in LOCALIZED_FIELDS if field in first})
+        return news_items
+    
     async def process_news_pipeline(self) -> List[Dict]:
         """전체 뉴스 처리 파이프라인"""
         # 1. 뉴스 수집
         print("뉴스 수집 중...")
         all_news = await self.fetch_all_news()
         print(f"총 {len(all_news)}개의 뉴스를 수집했습니다.")
+        print(f"피드 캐시: {self.cache_stats.bytes_saved:,} bytes 절약 "
+              f"({self.cache_stats.not_modified}/{self.cache_stats.requests}건 미변경)")
         
         # 2. 관련성 분석
         print("관련성 분석 중...")
-        for news in all_news:
-            news['relevance_score'] = self.analyze_news_relevance(news)
+        scores = self.relevance.score(all_news)
+        for news, score in zip(all_news, scores):
+            news['relevance_score'] = float(score)
         
-        # 3. 상위 뉴스 선별
-        top_news = sorted(all_news, key=lambda x: x['relevance_score'], reverse=True)[:10]
+        # 3. 유사 중복 묶기 (같은 이야기는 가장 관련성 높은 대표 하나만 다음 단계로)
+        stories = cluster_items(all_news, id_key='url', rank_key=lambda x: x['relevance_score'])
+        print(f"{len(all_news)}개의 뉴스를 {len(stories)}개의 이야기로 묶었습니다.")
         
-        # 4. 번역 및 로컬라이징
-        print("번역 중...")
-        translated_news = []
-        for news in top_news:
-            translated = await self.translate_and_localize(news)
-            translated_news.append(translated)
+        # 4. 상위 뉴스 선별
+        top_news = top_k(stories, [news['relevance_score'] for news in stories], 10)
         
-        return translated_news
+        # 5. 번역 및 로컬라이징
+        print("번역 중...")
+        return await self.localize_all(top_news)
 
 
 # 테스트 실행
@@ -244,5 +290,7 @@ if __name__ == "__main__":
             print(f"   점수: {item['relevance_score']:.2f}")
             print(f"   URL: {item['url']}")
             print(f"   한국어: {item.get('korean_title', 'N/A')}")
+        
+        await http_client.aclose()
     
     asyncio.run(test_crawler())
\ No newline at end of file
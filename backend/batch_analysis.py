@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+일괄 콘텐츠 분석
+여러 글을 한 프롬프트에 묶어(SEO, 가독성, 해시태그, 메타 태그) 분석하고,
+묶음들은 제한된 동시 실행 수로 돌리며 글별 결과를 끝나는 대로 내보냄
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+from structured_output import StructuredOutputError, extract_json
+
+BATCH_ITEM_CHARS = int(os.getenv('BATCH_ITEM_CHARS', '3000'))  # 글 하나당 프롬프트에 넣는 최대 글자 수
+BATCH_PROMPT_CHARS = int(os.getenv('BATCH_PROMPT_CHARS', '12000'))  # 한 프롬프트에 넣는 본문 총량
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '8'))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+
+# 분석 종류별 지시문 - 결과 형식은 단건 엔드포인트(/api/seo/analyze 등) 응답과 같음
+ANALYSES = {
+    'seo': {
+        'instruction': "SEO 분석을 수행하고, 100점 만점의 점수('score')와 구체적인 개선 제안 목록('suggestions')을 제공",
+        'example': '{"score": 80, "suggestions": ["..."]}',
+    },
+    'readability': {
+        'instruction': "가독성을 분석하고, 100점 만점의 'score', 가독성 수준 'level' (예: 초급, 중급, 고급), 개선 제안 목록 'suggestions'를 제공",
+        'example': '{"score": 70, "level": "중급", "suggestions": ["..."]}',
+    },
+    'hashtags': {
+        'instruction': "가장 적합한 해시태그 목록('hashtags', 각 해시태그는 '#'으로 시작)을 생성",
+        'example': '{"hashtags": ["#태그1", "#태그2"]}',
+    },
+    'meta_tags': {
+        'instruction': "SEO에 최적화된 title (50자 이내)과 meta description (150자 이내)을 'title', 'description' 키로 생성",
+        'example': '{"title": "...", "description": "..."}',
+    },
+}
+
+BATCH_PROMPT = """다음 {count}개의 블로그 글 각각에 대해 {instruction}해주세요.
+결과는 글마다 하나씩, 입력의 "id"를 그대로 넣은 JSON 배열로만 반환해주세요.
+예: [{{"id": "{first_id}", "result": {example}}}]
+
+{items}"""
+
+
+def content_hash(title: str, content: str) -> str:
+    return hashlib.sha256(f"{title}\x00{content}".encode('utf-8')).hexdigest()
+
+
+def pack_batches(items: List[Dict], max_items: int = BATCH_MAX_ITEMS,
+                 max_chars: int = BATCH_PROMPT_CHARS) -> List[List[Dict]]:
+    """글 목록을 프롬프트 크기 한도(글 수, 본문 총 글자 수) 안에서 묶음으로 나눔"""
+    batches, current, used = [], [], 0
+    for item in items:
+        size = len(item['title']) + min(len(item['content']), BATCH_ITEM_CHARS)
+        if current and (len(current) >= max_items or used + size > max_chars):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_prompt(analysis: str, batch: List[Dict]) -> str:
+    spec = ANALYSES[analysis]
+    blocks = [
+        json.dumps({'id': item['id'], 'title': item['title'], 'content': item['content'][:BATCH_ITEM_CHARS]},
+                   ensure_ascii=False)
+        for item in batch
+    ]
+    return BATCH_PROMPT.format(count=len(batch), instruction=spec['instruction'], example=spec['example'],
+                               first_id=batch[0]['id'], items="\n".join(blocks))
+
+
+def parse_response(text: str) -> Dict[str, Dict]:
+    """모델 응답의 JSON 배열 -> {id: result} (형식이 어긋난 항목은 버림)"""
+    try:
+        rows = extract_json(text, expect='[')
+    except StructuredOutputError:
+        return {}
+    results = {}
+    for row in rows if isinstance(rows, list) else []:
+        if isinstance(row, dict) and 'id' in row and isinstance(row.get('result'), (dict, list)):
+            result = row['result']
+            # 해시태그를 리스트로만 돌려주는 경우도 단건 응답 형식으로 맞춤
+            results[str(row['id'])] = {'hashtags': result} if isinstance(result, list) else result
+    return results
+
+
+async def run_batches(items: List[Dict], analyses: List[str], generate: Callable[[str], Awaitable[str]],
+                      concurrency: int = BATCH_CONCURRENCY, max_items: int = BATCH_MAX_ITEMS
+                      ) -> AsyncIterator[Dict]:
+    """(분석 종류, 묶음)마다 generate(prompt)를 호출하고 글별 결과를 끝나는 순서대로 yield
+
+    결과 프레임: {'id', 'analysis', 'status': 'ok'|'error', 'result' 또는 'error'}
+    묶음 응답에서 빠진 글은 한 번만 단독 프롬프트로 다시 요청
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def analyze(analysis: str, batch: List[Dict], retry_missing: bool = True):
+        try:
+            async with semaphore:
+                results = parse_response(await generate(build_prompt(analysis, batch)))
+        except Exception as e:
+            results, error = {}, str(e)
+        else:
+            error = 'missing from model response'
+        missing = []
+        for item in batch:
+            if item['id'] in results:
+                await queue.put({'id': item['id'], 'analysis': analysis, 'status': 'ok',
+                                 'result': results[item['id']]})
+            elif retry_missing and len(batch) > 1:
+                missing.append(item)
+            else:
+                await queue.put({'id': item['id'], 'analysis': analysis, 'status': 'error', 'error': error})
+        await asyncio.gather(*(analyze(analysis, [item], retry_missing=False) for item in missing))
+
+    async def run_all():
+        try:
+            await asyncio.gather(*(analyze(analysis, batch)
+                                   for analysis in analyses
+                                   for batch in pack_batches(items, max_items=max_items)))
+        finally:
+            await queue.put(None)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                break
+            yield frame
+    finally:
+        # 클라이언트가 끊으면 남은 묶음 호출을 취소
+        if not runner.done():
+            runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
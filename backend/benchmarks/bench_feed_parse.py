@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+피드 파싱 처리량 벤치마크
+합성 Atom 피드를 작업 프로세스 수별로 파싱해 초당 항목 수를 비교
+
+    cd backend && python benchmarks/bench_feed_parse.py --feeds 64 --entries 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from feed_parser_pool import parse_arxiv_feed  # noqa: E402
+
+
+def make_feed(entries: int, seed: int) -> bytes:
+    """arXiv 응답과 비슷한 모양의 Atom 피드"""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<feed xmlns="http://www.w3.org/2005/Atom"><title>bench</title>']
+    for index in range(entries):
+        parts.append(
+            f'<entry><id>http://arxiv.org/abs/{seed}.{index:05d}</id>'
+            f'<published>2024-01-{index % 28 + 1:02d}T00:00:00Z</published>'
+            f'<title>Large language model study {seed}-{index}</title>'
+            f'<summary>&lt;p&gt;{"We study neural networks and machine learning systems. " * 12}&lt;/p&gt;</summary>'
+            f'<author><name>Author {index}</name></author><author><name>Coauthor {seed}</name></author>'
+            f'<category term="cs.AI"/><category term="cs.LG"/></entry>'
+        )
+    parts.append('</feed>')
+    return ''.join(parts).encode('utf-8')
+
+
+def run(feeds, workers: int) -> float:
+    started = time.perf_counter()
+    if workers == 0:
+        results = [parse_arxiv_feed(feed) for feed in feeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            pool.submit(int).result()  # 작업 프로세스 기동 시간은 제외
+            started = time.perf_counter()
+            results = list(pool.map(parse_arxiv_feed, feeds))
+    elapsed = time.perf_counter() - started
+    items = sum(len(result) for result in results)
+    return items / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='피드 파싱 처리량 벤치마크')
+    parser.add_argument('--feeds', type=int, default=32)
+    parser.add_argument('--entries', type=int, default=200)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    feeds = [make_feed(args.entries, seed) for seed in range(args.feeds)]
+    size = sum(len(feed) for feed in feeds)
+    print(f"피드 {args.feeds}개 x 항목 {args.entries}개 ({size / 1024 / 1024:.1f} MB), CPU {os.cpu_count()}개")
+
+    baseline = run(feeds, 0)
+    print(f"{'workers':>8} {'items/s':>12} {'speedup':>8}")
+    print(f"{'inline':>8} {baseline:12.0f} {1.0:8.2f}")
+    workers = 1
+    while workers <= args.max_workers:
+        rate = run(feeds, workers)
+        print(f"{workers:>8} {rate:12.0f} {rate / baseline:8.2f}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
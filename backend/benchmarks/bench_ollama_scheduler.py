@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Ollama 스케줄러 벤치마크
+로컬 가짜 Ollama 서버(/api/chat, /api/tags)를 띄우고, 일괄 작업이 큐를 채운 상태에서
+편집기(interactive) 요청의 대기 시간을 직접 호출 방식과 비교
+
+    cd backend && python benchmarks/bench_ollama_scheduler.py --batch 16 --interactive 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """한 번에 하나씩 처리하는 GPU 없는 서버 흉내 - keep_alive가 0이면 다음 요청에서 모델을 다시 로드"""
+    generate_time = 0.1
+    load_time = 0.5
+    lock = threading.Lock()
+    loaded = set()
+    keep_alive = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload: dict, content_type: str = 'application/json'):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send({'models': [{'name': model} for model in sorted(self.loaded)]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        model = request['model']
+        with FakeOllama.lock:
+            load = 0.0
+            if model not in FakeOllama.loaded:
+                load = FakeOllama.load_time
+                time.sleep(load)
+            if request.get('keep_alive', '5m') in (0, '0', '0s'):
+                FakeOllama.loaded.discard(model)
+            else:
+                FakeOllama.loaded.add(model)
+            messages = request.get('messages') or []
+            if not messages:
+                self._send({'model': model, 'message': {'role': 'assistant', 'content': ''}, 'done': True,
+                            'load_duration': int(load * 1e9)})
+                return
+            time.sleep(FakeOllama.generate_time)
+        text = 'echo: ' + messages[-1]['content'][:40]
+        if request.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            for word in text.split(' '):
+                self.wfile.write((json.dumps({'model': model, 'message': {'role': 'assistant', 'content': word + ' '},
+                                              'done': False}) + '\n').encode('utf-8'))
+            self.wfile.write((json.dumps({'model': model, 'message': {'role': 'assistant', 'content': ''}, 'done': True,
+                                          'load_duration': int(load * 1e9), 'eval_count': 3}) + '\n').encode('utf-8'))
+            return
+        self._send({'model': model, 'message': {'role': 'assistant', 'content': text}, 'done': True,
+                    'load_duration': int(load * 1e9), 'prompt_eval_count': 5, 'eval_count': 3})
+
+
+def start_server(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', port), FakeOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label: str, call, batch: int, interactive: int):
+    """일괄 요청을 먼저 쏟아 넣고 잠시 뒤 들어온 편집기 요청의 응답 시간을 측정"""
+    latencies = []
+    threads = [threading.Thread(target=call, args=(f'batch {index}', 'batch')) for index in range(batch)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+
+    def interactive_call(index: int):
+        started = time.perf_counter()
+        call(f'editor {index}', 'interactive')
+        latencies.append(time.perf_counter() - started)
+    editors = [threading.Thread(target=interactive_call, args=(index,)) for index in range(interactive)]
+    started = time.perf_counter()
+    for thread in editors:
+        thread.start()
+    for thread in editors + threads:
+        thread.join()
+    print(f"{label:<10} interactive avg {sum(latencies) / len(latencies):.2f}s  max {max(latencies):.2f}s  "
+          f"(all done in {time.perf_counter() - started:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch', type=int, default=16)
+    parser.add_argument('--interactive', type=int, default=4)
+    parser.add_argument('--port', type=int, default=11998)
+    args = parser.parse_args()
+
+    os.environ['OLLAMA_HOST'] = f'http://127.0.0.1:{args.port}'
+    start_server(args.port)
+
+    from llm_gateway import LLMGateway, LLM_CONFIG
+    from ollama_scheduler import OllamaScheduler
+    model = LLM_CONFIG['ollama']['model']
+
+    # 직접 호출: 큐 없이 keep_alive=0 (요청마다 모델 언로드)
+    direct = LLMGateway()
+    run('direct', lambda prompt, priority: direct.generate('ollama', prompt, model=model, keep_alive=0),
+        args.batch, args.interactive)
+
+    FakeOllama.loaded.clear()
+    scheduler = OllamaScheduler(LLMGateway(), workers=1, pinned=[model])
+    for future in scheduler.warm():
+        future.result()
+    run('scheduler', lambda prompt, priority: scheduler.generate(prompt, model=model, priority=priority),
+        args.batch, args.interactive)
+    print(json.dumps(scheduler.metrics(), indent=2))
+    scheduler.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+HTML 본문 추출 벤치마크
+기존 방식(BeautifulSoup html.parser 트리 + <p> get_text, 정규식 태그 제거)과 text_extract 모듈 비교
+
+    cd backend && python benchmarks/bench_text_extract.py --blocks 2000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import text_extract  # noqa: E402
+from text_extract import extract_text, html_to_text  # noqa: E402
+
+PARAGRAPH = ('<p>인공지능 <b>모델</b>과 machine learning &amp; <a href="#">관련 기사</a>. '
+             + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 12 + '</p>\n')
+
+
+def make_page(blocks: int) -> bytes:
+    """광고/내비게이션/스크립트가 섞인 큰 기사 페이지"""
+    body = ''.join(
+        f'<div class="block-{index}"><nav><a href="/{index}">메뉴 {index}</a></nav>'
+        f'<script>window.ad{index} = "<p>광고</p>";</script>{PARAGRAPH}'
+        f'<ul><li>관련 {index}</li><li>더보기</li></ul></div>'
+        for index in range(blocks)
+    )
+    return (f'<html><head><meta charset="utf-8"><title>bench</title><style>p {{ margin: 0 }}</style></head>'
+            f'<body>{body}</body></html>').encode('utf-8')
+
+
+def bs4_paragraphs(html: bytes) -> str:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    return " ".join([p.get_text() for p in soup.find_all("p")])
+
+
+def regex_clean(text: str) -> str:
+    text = re.sub('<.*?>', '', text)
+    return ' '.join(text.split()).strip()
+
+
+def timed(label: str, func, *args, repeat: int = 3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<38} {best * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML 본문 추출 벤치마크')
+    parser.add_argument('--blocks', type=int, default=2000)
+    parser.add_argument('--summaries', type=int, default=20000)
+    args = parser.parse_args()
+
+    page = make_page(args.blocks)
+    print(f"페이지 {len(page) / 1024 / 1024:.1f} MB, text_extract 백엔드: {text_extract.BACKEND}")
+
+    try:
+        timed('기존: BeautifulSoup html.parser', bs4_paragraphs, page)
+    except ImportError:
+        print('기존: BeautifulSoup 미설치 - 건너뜀')
+    timed('extract_text (전체)', extract_text, page)
+    timed('extract_text (앞 4000자)', extract_text, page, max_chars=4000)
+
+    summaries = [PARAGRAPH[:300]] * args.summaries + ['plain summary without markup'] * args.summaries
+    print(f"\n피드 요약 {len(summaries):,}개 정리")
+    timed("기존: re.sub('<.*?>') + split/join", lambda: [regex_clean(text) for text in summaries])
+    timed('html_to_text', lambda: [html_to_text(text) for text in summaries])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+2단계 캐시
+1단계: 프로세스 내 LRU (TTL 지원), 2단계: SQLite cache_entries 테이블
+메모리에서 빠지거나 재시작해도 2단계에 남아 있으면 다시 메모리로 올림
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import crud
+import models
+from database import SessionLocal, engine
+
+models.Base.metadata.create_all(bind=engine)
+
+CACHE_PURGE_INTERVAL = float(os.getenv('CACHE_PURGE_INTERVAL', '3600'))  # 만료 항목 정리 최소 간격 (초)
+
+_MISSING = object()
+
+
+def cache_key(*parts) -> str:
+    """여러 값을 묶은 안정적인 해시 키 (dict는 키 순서와 무관)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """스레드 안전 LRU + 항목별 만료 시각"""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.data: 'OrderedDict[str, Tuple[Any, Optional[float]]]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str, default=_MISSING):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.data[key]
+                return default
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, expires_at: Optional[float] = None):
+        with self.lock:
+            self.data[key] = (value, expires_at)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+
+class TieredCache:
+    """LRU(메모리) + SQLite(영구) 2단계 캐시 - 값은 JSON으로 저장 가능한 것만"""
+
+    def __init__(self, namespace: str, maxsize: int = 512, ttl: Optional[float] = None,
+                 persistent: bool = True, session_factory=SessionLocal):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.persistent = persistent
+        self.session_factory = session_factory
+        self.memory = LRUCache(maxsize)
+        self.stats_lock = threading.Lock()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'sets': 0, 'refreshes': 0, 'errors': 0}
+
+    def _count(self, name: str):
+        with self.stats_lock:
+            self.counters[name] += 1
+
+    def _expires_at(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is not _MISSING:
+            self._count('memory_hits')
+            return value
+
+        if self.persistent:
+            db = self.session_factory()
+            try:
+                row = crud.get_cache_entry(db, self.namespace, key)
+                if row is not None:
+                    if row.expires_at is None or row.expires_at > time.time():
+                        self.memory.set(key, row.value, row.expires_at)
+                        self._count('disk_hits')
+                        return row.value
+                    crud.delete_cache_entry(db, self.namespace, key)
+            except Exception as e:
+                self._count('errors')
+                print(f"캐시 조회 오류 ({self.namespace}): {e}")
+            finally:
+                db.close()
+
+        self._count('misses')
+        return default
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        expires_at = self._expires_at(ttl)
+        self.memory.set(key, value, expires_at)
+        self._count('sets')
+        if not self.persistent:
+            return
+        db = self.session_factory()
+        try:
+            crud.set_cache_entry(db, self.namespace, key, value, expires_at)
+        except Exception as e:
+            db.rollback()
+            self._count('errors')
+            print(f"캐시 저장 오류 ({self.namespace}): {e}")
+        finally:
+            db.close()
+        purge_expired_if_due()
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.persistent:
+            db = self.session_factory()
+            try:
+                crud.delete_cache_entry(db, self.namespace, key)
+            finally:
+                db.close()
+
+    def get_or_set(self, key: str, produce: Callable[[], Any], ttl: Optional[float] = None,
+                   refresh: bool = False):
+        """캐시에 있으면 그 값, 없거나 refresh=True면 produce()로 만들어 저장 (None은 저장하지 않음)"""
+        if refresh:
+            self._count('refreshes')
+        else:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        value = produce()
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict:
+        with self.stats_lock:
+            counters = dict(self.counters)
+        lookups = counters['memory_hits'] + counters['disk_hits'] + counters['misses']
+        hits = counters['memory_hits'] + counters['disk_hits']
+        return {
+            **counters,
+            'memory_size': len(self.memory),
+            'ttl': self.ttl,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# 이름별 캐시 레지스트리 (지표 API에서 한 번에 조회)
+_caches: Dict[str, TieredCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(namespace: str, **options) -> TieredCache:
+    """같은 이름이면 같은 캐시 인스턴스를 반환"""
+    with _registry_lock:
+        if namespace not in _caches:
+            _caches[namespace] = TieredCache(namespace, **options)
+        return _caches[namespace]
+
+
+def cache_stats() -> Dict[str, Dict]:
+    with _registry_lock:
+        caches = dict(_caches)
+    return {namespace: cache.stats() for namespace, cache in sorted(caches.items())}
+
+
+def purge_expired() -> int:
+    """만료된 영구 캐시 항목 정리"""
+    db = SessionLocal()
+    try:
+        return crud.purge_expired_cache_entries(db, time.time())
+    finally:
+        db.close()
+
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+
+def purge_expired_if_due(interval: float = CACHE_PURGE_INTERVAL) -> Optional[int]:
+    """마지막 정리 후 interval초가 지났으면 만료 항목 정리 (저장할 때마다 호출, 다시 읽히지 않는 항목이 쌓이지 않게)"""
+    global _last_purge
+    with _purge_lock:
+        now = time.time()
+        if now - _last_purge < interval:
+            return None
+        _last_purge = now
+    try:
+        return purge_expired()
+    except Exception as e:
+        print(f"만료 캐시 정리 오류: {e}")
+        return None
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+긴 콘텐츠 조각 분석 (map-reduce)
+본문을 문단/문장 경계에서 토큰 예산에 맞춰 나누고, 조각별로 동시에 분석한 뒤 하나의 결과로 합침
+조각 경계는 내용으로 정해져(앞부분을 고쳐도 뒤 조각은 그대로) 조각별 응답 캐시가 수정되지 않은 부분에 적중
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from research import estimate_tokens
+
+CHUNK_TOKENS = int(os.getenv('CHUNK_TOKENS', '1500'))  # 조각 하나의 최대 토큰 수
+CHUNK_CONCURRENCY = int(os.getenv('CHUNK_CONCURRENCY', '4'))
+CHUNK_BOUNDARY_EVERY = 4  # 평균 몇 문단마다 내용 기반 경계를 둘지
+CHUNK_LIST_LIMIT = 10  # 합친 제안 목록 등의 최대 길이
+
+# 빈 줄/줄바꿈, 그리고 편집기 HTML의 블록 태그 뒤에서 문단을 나눔
+_PARAGRAPH_RE = re.compile(r'\s*\n\s*|(?<=</p>)|(?<=</li>)|(?<=</h[1-6]>)|(?<=</blockquote>)', re.IGNORECASE)
+_SENTENCE_RE = re.compile(r'(?<=[.!?。])\s+')
+
+
+def _split_long(text: str, max_tokens: int) -> List[str]:
+    """예산보다 긴 문단 -> 문장 단위, 그래도 긴 문장은 글자 수로 자름"""
+    pieces = []
+    for sentence in _SENTENCE_RE.split(text):
+        tokens = estimate_tokens(sentence)
+        if tokens <= max_tokens:
+            pieces.append(sentence)
+            continue
+        size = max(1, len(sentence) * max_tokens // tokens)
+        pieces.extend(sentence[start:start + size] for start in range(0, len(sentence), size))
+    return pieces
+
+
+def split_units(text: str, max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """조각을 이루는 단위 (문단, 예산보다 긴 문단은 문장)"""
+    units = []
+    for paragraph in _PARAGRAPH_RE.split(text or ''):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append(paragraph)
+        else:
+            units.extend(_split_long(paragraph, max_tokens))
+    return units
+
+
+def _is_boundary(unit: str) -> bool:
+    digest = hashlib.sha256(unit.encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'big') % CHUNK_BOUNDARY_EVERY == 0
+
+
+def split_chunks(text: str, max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """문단/문장 경계에서 max_tokens 이하의 조각으로 나눔 (짧은 글은 조각 하나)
+
+    예산을 넘을 때 외에는 해시가 조건을 만족하는 문단 뒤에서만 끊기 때문에
+    한 문단을 고치면 그 문단이 든 조각(과 예산이 밀린 다음 조각 정도)만 달라짐
+    """
+    chunks = []
+    current: List[str] = []
+    tokens = 0
+    for unit in split_units(text, max_tokens):
+        unit_tokens = estimate_tokens(unit)
+        if current and tokens + unit_tokens > max_tokens:
+            chunks.append('\n'.join(current))
+            current, tokens = [], 0
+        current.append(unit)
+        tokens += unit_tokens
+        if tokens >= max_tokens // 4 and _is_boundary(unit):
+            chunks.append('\n'.join(current))
+            current, tokens = [], 0
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+# --- map ---
+
+async def map_chunks(chunks: List[str], analyze: Callable[[str], Awaitable],
+                     concurrency: int = CHUNK_CONCURRENCY) -> List:
+    """조각마다 analyze(조각)을 동시에 실행하고 조각 순서대로 결과 반환 (하나라도 실패하면 예외)"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: str):
+        async with semaphore:
+            return await analyze(chunk)
+    return list(await asyncio.gather(*(run(chunk) for chunk in chunks)))
+
+
+def map_chunks_sync(chunks: List[str], analyze: Callable[[str], object],
+                    concurrency: int = CHUNK_CONCURRENCY) -> List:
+    """map_chunks의 동기 버전 (Flask, 동기 FastAPI 엔드포인트용)"""
+    if len(chunks) <= 1:
+        return [analyze(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        return list(pool.map(analyze, chunks))
+
+
+# --- reduce ---
+
+def chunk_weights(chunks: List[str]) -> List[int]:
+    """합칠 때 쓰는 조각별 가중치 (토큰 수)"""
+    return [max(1, estimate_tokens(chunk)) for chunk in chunks]
+
+
+def _key(value) -> str:
+    return ' '.join(str(value).lower().split())
+
+
+def merge_unique(lists: Sequence[Sequence], limit: Optional[int] = None, key: Callable = _key) -> List:
+    """여러 목록을 순서를 유지하며 합치고 중복 제거"""
+    seen = set()
+    merged = []
+    for values in lists:
+        for value in values or []:
+            marker = key(value)
+            if marker in seen:
+                continue
+            seen.add(marker)
+            merged.append(value)
+    return merged[:limit] if limit else merged
+
+
+def rank_by_frequency(lists: Sequence[Sequence], limit: Optional[int] = None) -> List:
+    """여러 조각에서 반복해서 나온 항목을 앞으로 (같으면 먼저 나온 순서)"""
+    counts = Counter(_key(value) for values in lists for value in dict.fromkeys(values or []))
+    merged = merge_unique(lists)
+    merged.sort(key=lambda value: -counts[_key(value)])
+    return merged[:limit] if limit else merged
+
+
+def _majority(values: List, weights: List[int]):
+    totals: Dict[str, float] = {}
+    first: Dict[str, object] = {}
+    for value, weight in zip(values, weights):
+        marker = _key(value)
+        totals[marker] = totals.get(marker, 0) + weight
+        first.setdefault(marker, value)
+    return first[max(totals, key=totals.get)]
+
+
+def merge_results(results: List[Dict], weights: List[int], limit: int = CHUNK_LIST_LIMIT) -> Dict:
+    """조각별 분석 dict를 하나로 - 숫자는 가중 평균, 목록은 중복 없이 합침, 문자열/불리언은 가중 다수결"""
+    if len(results) == 1:
+        return results[0]
+    merged = {}
+    for name in dict.fromkeys(name for result in results for name in result):
+        pairs = [(result[name], weight) for result, weight in zip(results, weights) if result.get(name) is not None]
+        if not pairs:
+            merged[name] = None
+            continue
+        values = [value for value, _ in pairs]
+        value_weights = [weight for _, weight in pairs]
+        sample = values[0]
+        if isinstance(sample, dict):
+            nested = [(value, weight) for value, weight in pairs if isinstance(value, dict)]
+            merged[name] = merge_results([value for value, _ in nested], [weight for _, weight in nested], limit)
+        elif isinstance(sample, list):
+            merged[name] = merge_unique(values, limit)
+        elif isinstance(sample, (int, float)) and not isinstance(sample, bool):
+            numbers = [(value, weight) for value, weight in pairs
+                       if isinstance(value, (int, float)) and not isinstance(value, bool)]
+            mean = sum(value * weight for value, weight in numbers) / sum(weight for _, weight in numbers)
+            merged[name] = round(mean) if all(isinstance(value, int) for value, _ in numbers) else round(mean, 1)
+        else:
+            merged[name] = _majority(values, value_weights)
+    return merged
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+동시 크롤링 엔진
+(소스, 키워드) 단위 작업을 스레드 풀에서 병렬로 실행하는 엔진
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from typing import Callable, Dict, Iterator, List
+
+# 소스별 동시 실행 한도 기본값
+DEFAULT_SOURCE_LIMITS = {
+    'google': 4,
+    'reddit': 2,
+    'hackernews': 4,
+    'arxiv': 2,
+}
+
+
+class CrawlTask:
+    """하나의 (소스, 키워드) 크롤링 작업"""
+
+    def __init__(self, source: str, keyword: str, fetch: Callable[[], List[Dict]], label: str = None):
+        self.source = source
+        self.keyword = keyword
+        self.fetch = fetch
+        self.label = label or f"{source}/{keyword}"
+
+
+class CrawlEngine:
+    """소스별 동시성 한도와 전체 마감 시간을 갖는 팬아웃 크롤러"""
+
+    def __init__(self, source_limits: Dict[str, int] = None, default_limit: int = 2,
+                 max_workers: int = 16, deadline: float = 60.0):
+        self.source_limits = {**DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+        self.default_limit = default_limit
+        self.max_workers = max_workers
+        self.deadline = deadline
+
+    def _limit(self, source: str) -> int:
+        return max(1, self.source_limits.get(source, self.default_limit))
+
+    def iter_results(self, tasks: List[CrawlTask], deadline: float = None,
+                     timings: Dict = None) -> Iterator[Dict]:
+        """작업이 끝나는 순서대로 결과를 내보냄 (마감 시간이 지나면 중단)"""
+        deadline = self.deadline if deadline is None else deadline
+        timings = {} if timings is None else timings
+        started = time.monotonic()
+        expires = started + deadline
+
+        queues = {}
+        for task in tasks:
+            queues.setdefault(task.source, deque()).append(task)
+            stats = timings.setdefault(task.source, {
+                'tasks': 0, 'completed': 0, 'failed': 0, 'skipped': 0,
+                'items': 0, 'busy': 0.0, 'elapsed': 0.0
+            })
+            stats['tasks'] += 1
+
+        running = {}
+        active = {source: 0 for source in queues}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl')
+
+        def run_task(task):
+            task_started = time.monotonic()
+            items, error = [], None
+            try:
+                items = task.fetch() or []
+            except Exception as e:
+                error = str(e)
+            return items, error, time.monotonic() - task_started
+
+        def fill():
+            for source, queue in queues.items():
+                while queue and active[source] < self._limit(source):
+                    task = queue.popleft()
+                    active[source] += 1
+                    running[executor.submit(run_task, task)] = task
+
+        try:
+            fill()
+            while running:
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(list(running), timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    active[task.source] -= 1
+                    items, error, elapsed = future.result()
+
+                    stats = timings[task.source]
+                    stats['busy'] += elapsed
+                    stats['elapsed'] = time.monotonic() - started
+                    if error:
+                        stats['failed'] += 1
+                        print(f"크롤링 오류 ({task.label}): {error}")
+                    else:
+                        stats['completed'] += 1
+                        stats['items'] += len(items)
+
+                    yield {
+                        'source': task.source,
+                        'keyword': task.keyword,
+                        'label': task.label,
+                        'items': items,
+                        'error': error,
+                        'elapsed': elapsed,
+                    }
+                fill()
+        finally:
+            # 마감 시간 초과 시 대기 중인 작업은 취소하고, 실행 중인 요청은 자체 타임아웃으로 정리됨
+            for task in running.values():
+                timings[task.source]['skipped'] += 1
+            for queue in queues.values():
+                for task in queue:
+                    timings[task.source]['skipped'] += 1
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, tasks: List[CrawlTask], deadline: float = None) -> Dict:
+        """모든 작업을 실행하고 (부분) 결과와 소스별 소요 시간을 반환"""
+        started = time.monotonic()
+        timings = {}
+        items = []
+        for result in self.iter_results(tasks, deadline=deadline, timings=timings):
+            items.extend(result['items'])
+
+        for stats in timings.values():
+            stats['busy'] = round(stats['busy'], 3)
+            stats['elapsed'] = round(stats['elapsed'], 3)
+
+        timed_out = any(stats['skipped'] for stats in timings.values())
+        return {
+            'items': items,
+            'timings': timings,
+            'timed_out': timed_out,
+            'elapsed': round(time.monotonic() - started, 3),
+        }
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
+from sqlalchemy import func, desc, or_, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta, timezone
 import models, schemas
 import urllib.parse
 
@@ -248,3 +249,150 @@ def mark_insight_as_read(db: Session, insight_id: int):
         db.commit()
         db.refresh(db_insight)
     return db_insight
+
+
+# --- News Items CRUD ---
+NEWS_ITEM_COLUMNS = {'id', 'title', 'link', 'source', 'keyword', 'summary', 'published', 'collected_at'}
+
+def _news_item_row(item: dict) -> dict:
+    collected_at = item.get('collected_at')
+    if isinstance(collected_at, str):
+        collected_at = datetime.fromisoformat(collected_at)
+    if collected_at is None:
+        collected_at = datetime.now(timezone.utc)
+    elif collected_at.tzinfo is None:
+        # 키셋 정렬 컬럼에 naive/aware 시각이 섞이지 않도록 시간대 없는 값은 UTC로 간주
+        collected_at = collected_at.replace(tzinfo=timezone.utc)
+    return {
+        "url_hash": item['id'],
+        "title": item.get('title', ''),
+        "link": item.get('link', ''),
+        "source": item.get('source', ''),
+        "keyword": item.get('keyword'),
+        "summary": item.get('summary', ''),
+        "published": item.get('published'),
+        "extra": {key: value for key, value in item.items() if key not in NEWS_ITEM_COLUMNS},
+        "collected_at": collected_at,
+    }
+
+def upsert_news_items(db: Session, items: list, batch_size: int = 500) -> int:
+    # url_hash 기준으로 배치 upsert (처음 수집 시각은 유지, 키워드는 마지막으로 찾은 키워드로 갱신)
+    rows = {}
+    for item in items:
+        if item.get('id'):
+            rows[item['id']] = _news_item_row(item)
+    rows = list(rows.values())
+
+    for start in range(0, len(rows), batch_size):
+        stmt = sqlite_insert(models.NewsItem).values(rows[start:start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.NewsItem.url_hash],
+            set_={
+                "title": stmt.excluded.title,
+                "link": stmt.excluded.link,
+                "keyword": stmt.excluded.keyword,
+                "summary": stmt.excluded.summary,
+                "published": stmt.excluded.published,
+                "extra": stmt.excluded.extra,
+            },
+        )
+        db.execute(stmt)
+    db.commit()
+    return len(rows)
+
+def encode_news_cursor(news_item: models.NewsItem) -> str:
+    return f"{news_item.collected_at.isoformat()}|{news_item.id}"
+
+def get_news_items(db: Session, limit: int = 50, cursor: str = None, keyword: str = None, source: str = None):
+    # collected_at 내림차순 키셋 페이지네이션 - (items, next_cursor) 반환
+    query = db.query(models.NewsItem)
+    if keyword:
+        query = query.filter(models.NewsItem.keyword == keyword)
+    if source:
+        query = query.filter(models.NewsItem.source == source)
+    if cursor:
+        collected_at, news_id = cursor.rsplit('|', 1)
+        collected_at = datetime.fromisoformat(collected_at)
+        query = query.filter(or_(
+            models.NewsItem.collected_at < collected_at,
+            and_(models.NewsItem.collected_at == collected_at, models.NewsItem.id < int(news_id))
+        ))
+    items = query.order_by(desc(models.NewsItem.collected_at), desc(models.NewsItem.id)).limit(limit + 1).all()
+    next_cursor = encode_news_cursor(items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
+
+# --- Crawl Watermarks CRUD ---
+def get_crawl_watermarks(db: Session) -> dict:
+    return {(row.source, row.keyword): row.published_ts for row in db.query(models.CrawlWatermark).all()}
+
+def set_crawl_watermarks(db: Session, watermarks: dict):
+    for (source, keyword), published_ts in watermarks.items():
+        row = db.query(models.CrawlWatermark).filter(
+            models.CrawlWatermark.source == source,
+            models.CrawlWatermark.keyword == keyword
+        ).first()
+        if row is None:
+            row = models.CrawlWatermark(source=source, keyword=keyword)
+            db.add(row)
+        row.published_ts = published_ts
+    db.commit()
+
+def get_cache_entry(db: Session, namespace: str, key: str):
+    return db.query(models.CacheEntry).filter(
+        models.CacheEntry.namespace == namespace, models.CacheEntry.key == key
+    ).first()
+
+def set_cache_entry(db: Session, namespace: str, key: str, value, expires_at: float = None):
+    stmt = sqlite_insert(models.CacheEntry).values(
+        namespace=namespace, key=key, value=value, expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.CacheEntry.namespace, models.CacheEntry.key],
+        set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at, "created_at": func.now()},
+    )
+    db.execute(stmt)
+    db.commit()
+
+def delete_cache_entry(db: Session, namespace: str, key: str):
+    db.query(models.CacheEntry).filter(
+        models.CacheEntry.namespace == namespace, models.CacheEntry.key == key
+    ).delete()
+    db.commit()
+
+def purge_expired_cache_entries(db: Session, now: float) -> int:
+    deleted = db.query(models.CacheEntry).filter(models.CacheEntry.expires_at < now).delete()
+    db.commit()
+    return deleted
+
+# --- Post Analyses CRUD ---
+def upsert_post_analyses(db: Session, rows: list) -> int:
+    # (content_hash, analysis) 기준 upsert - 같은 글을 다시 분석하면 최신 결과로 덮어씀
+    if not rows:
+        return 0
+    stmt = sqlite_insert(models.PostAnalysis).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.PostAnalysis.content_hash, models.PostAnalysis.analysis],
+        set_={
+            "post_id": stmt.excluded.post_id,
+            "result": stmt.excluded.result,
+            "model": stmt.excluded.model,
+            "created_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+    return len(rows)
+
+def get_post_analyses(db: Session, post_id: int = None, analysis: str = None, content_hash: str = None,
+                      skip: int = 0, limit: int = 100):
+    query = db.query(models.PostAnalysis)
+    if post_id is not None:
+        query = query.filter(models.PostAnalysis.post_id == post_id)
+    if analysis:
+        query = query.filter(models.PostAnalysis.analysis == analysis)
+    if content_hash:
+        query = query.filter(models.PostAnalysis.content_hash == content_hash)
+    return query.order_by(desc(models.PostAnalysis.created_at), desc(models.PostAnalysis.id)).offset(skip).limit(limit).all()
+
+def get_posts_by_ids(db: Session, post_ids: list):
+    return db.query(models.Post).filter(models.Post.id.in_(post_ids)).all()
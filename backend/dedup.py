@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+유사 중복 뉴스 클러스터링
+제목+요약의 SimHash를 밴드 단위 LSH 인덱스에 넣어 같은 이야기를 묶음
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+HASH_BITS = 64
+# 해밍 거리 3 이하를 찾기 위해 64비트를 16비트 밴드 4개로 분할 (비둘기집 원리)
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+DEFAULT_MAX_DISTANCE = 3
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_TITLE_PREFIX_RE = re.compile(r'^\[[^\]]*\]\s*')  # "[논문] " 같은 접두어
+_TITLE_SUFFIX_RE = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')  # " - 매체명" 같은 접미어
+
+
+def normalize_text(title: str, summary: str = '') -> str:
+    """비교용 텍스트 정규화 (접두/접미 매체명 제거, 소문자, 유니코드 정규화)"""
+    title = _TITLE_SUFFIX_RE.sub('', _TITLE_PREFIX_RE.sub('', title or ''))
+    text = unicodedata.normalize('NFKC', f"{title} {summary or ''}").lower()
+    return ' '.join(_TOKEN_RE.findall(text))
+
+
+def _features(text: str) -> Dict[str, int]:
+    # 단어 단위 shingle: 단어 + 연속 단어쌍, 등장 횟수를 가중치로 사용
+    tokens = text.split()
+    features = {}
+    for token in tokens:
+        features[token] = features.get(token, 0) + 1
+    for first, second in zip(tokens, tokens[1:]):
+        pair = f"{first} {second}"
+        features[pair] = features.get(pair, 0) + 1
+    return features
+
+
+# 각 비트를 LANE_BITS 폭의 레인에 펼쳐, 가중치 누적을 큰 정수 덧셈 한 번으로 처리
+LANE_BITS = 24
+LANE_MASK = (1 << LANE_BITS) - 1
+_SPREAD_BYTE = [
+    sum(((value >> bit) & 1) << (bit * LANE_BITS) for bit in range(8))
+    for value in range(256)
+]
+
+
+def _spread(digest: bytes) -> int:
+    spread = 0
+    for position, value in enumerate(reversed(digest)):
+        spread |= _SPREAD_BYTE[value] << (position * 8 * LANE_BITS)
+    return spread
+
+
+def simhash(text: str) -> Optional[int]:
+    """64비트 SimHash (특징이 없는 빈 텍스트는 None)"""
+    features = _features(text)
+    if not features:
+        return None
+    lanes = 0
+    total = 0
+    for feature, weight in features.items():
+        lanes += weight * _spread(hashlib.blake2b(feature.encode(), digest_size=8).digest())
+        total += weight
+    fingerprint = 0
+    for bit in range(HASH_BITS):
+        # 비트가 1인 특징의 가중치 합이 절반을 넘으면 1
+        if 2 * (lanes >> (bit * LANE_BITS) & LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class StoryClusterIndex:
+    """증분 SimHash LSH 인덱스 - 항목이 들어오는 즉시 클러스터를 배정"""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self.fingerprints: List[Optional[int]] = []
+        self.cluster_of: List[int] = []
+        self.clusters: Dict[int, List[str]] = {}
+
+    def _candidates(self, fingerprint: int):
+        seen = set()
+        for band in range(BANDS):
+            key = fingerprint >> (band * BAND_BITS) & BAND_MASK
+            for index in self.bands[band].get(key, ()):
+                if index not in seen:
+                    seen.add(index)
+                    yield index
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """가장 가까운 기존 항목의 클러스터 ID (없으면 None)"""
+        best, best_distance = None, self.max_distance + 1
+        for index in self._candidates(fingerprint):
+            distance = hamming(fingerprint, self.fingerprints[index])
+            if distance < best_distance:
+                best, best_distance = self.cluster_of[index], distance
+        return best
+
+    def add(self, item_id: str, title: str, summary: str = '') -> int:
+        """항목을 인덱스에 추가하고 배정된 클러스터 ID 반환"""
+        fingerprint = simhash(normalize_text(title, summary))
+        # 제목/요약이 비어 있으면 비교할 근거가 없으므로 다른 항목과 묶지 않음 (단독 클러스터)
+        cluster_id = self.find(fingerprint) if fingerprint is not None else None
+
+        index = len(self.fingerprints)
+        if cluster_id is None:
+            cluster_id = index
+            self.clusters[cluster_id] = []
+        self.fingerprints.append(fingerprint)
+        self.cluster_of.append(cluster_id)
+        self.clusters[cluster_id].append(item_id)
+        if fingerprint is None:
+            return cluster_id
+        for band in range(BANDS):
+            key = fingerprint >> (band * BAND_BITS) & BAND_MASK
+            self.bands[band].setdefault(key, []).append(index)
+        return cluster_id
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+
+def cluster_items(items: List[Dict], index: StoryClusterIndex = None, id_key: str = 'id',
+                  rank_key=None) -> List[Dict]:
+    """항목마다 cluster_id/cluster_size를 붙이고, 클러스터별 대표 항목 목록을 반환
+
+    rank_key가 주어지면 클러스터 안에서 그 값이 가장 큰 항목이 대표가 됨 (기본: 먼저 들어온 항목)
+    """
+    index = index or StoryClusterIndex()
+    members: Dict[int, List[Dict]] = {}
+    for position, item in enumerate(items):
+        item_id = item.get(id_key) or str(position)
+        cluster_id = index.add(item_id, item.get('title', ''), item.get('summary', ''))
+        item['cluster_id'] = cluster_id
+        members.setdefault(cluster_id, []).append(item)
+
+    representatives = []
+    for cluster_id, cluster in members.items():
+        size = len(index.clusters[cluster_id])
+        for item in cluster:
+            item['cluster_size'] = size
+        representative = max(cluster, key=rank_key) if rank_key else cluster[0]
+        representatives.append(representative)
+    return representatives
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+다중 모델 동시 생성
+하나의 프롬프트를 설정된 여러 모델(Gemini, Ollama, OpenAI)에 동시에 보내고 모드에 따라 결과를 고름
+
+- first: 가장 먼저 (쓸 만한) 응답을 준 모델이 승리, 나머지 호출은 취소
+- all: 마감 시간까지 끝난 응답을 모두 반환, 늦은 호출은 취소
+- quorum: 같은 답(정규화 기준)이 정족수만큼 모이면 바로 반환
+모델별 지연 시간/비용/승리 횟수를 기록해 가장 빠른 적정 모델을 고를 수 있게 함
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from llm_gateway import gateway as default_gateway, LLMGateway, LLMResponse
+
+# provider:model 목록 (README의 6개 모델 구성)
+FANOUT_MODELS = [
+    target.strip() for target in os.getenv(
+        'FANOUT_MODELS',
+        'gemini:gemini-1.5-flash,gemini:gemini-pro,ollama:deepseek-v3,ollama:qwen2.5-coder,'
+        'ollama:llama3.3,ollama:qwen2.5'
+    ).split(',') if target.strip()
+]
+FANOUT_DEADLINE = float(os.getenv('FANOUT_DEADLINE', '60'))
+MODES = ('first', 'all', 'quorum')
+
+# 1K 토큰당 USD (입력, 출력) - 로컬 Ollama는 0, FANOUT_MODEL_COSTS(JSON)로 덮어쓰기 가능
+MODEL_COSTS = {
+    'gemini:gemini-1.5-flash': (0.000075, 0.0003),
+    'gemini:gemini-pro': (0.0005, 0.0015),
+    'openai:gpt-3.5-turbo': (0.0005, 0.0015),
+}
+MODEL_COSTS.update({key: tuple(value) for key, value in json.loads(os.getenv('FANOUT_MODEL_COSTS', '{}')).items()})
+LATENCY_WINDOW = 200
+
+
+def parse_target(target: str) -> Tuple[str, str]:
+    """'ollama:qwen2.5' -> ('ollama', 'qwen2.5') (모델 이름에 ':'가 있어도 첫 구분자만 사용)"""
+    provider, _, model = target.partition(':')
+    return provider, model
+
+
+def estimate_cost(target: str, prompt_tokens: int, completion_tokens: int) -> float:
+    input_cost, output_cost = MODEL_COSTS.get(target, (0.0, 0.0))
+    return (prompt_tokens * input_cost + completion_tokens * output_cost) / 1000
+
+
+def normalize_answer(text: str) -> str:
+    """정족수 비교용 기본 정규화 (대소문자, 공백 차이 무시)"""
+    return ' '.join(text.lower().split())
+
+
+class ModelStats:
+    """모델별 성공/오류/취소 횟수, 지연 시간, 비용, 승리 횟수"""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.wins = 0
+        self.cost = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.latencies)
+        percentile = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else None
+        finished = self.successes + self.errors
+        return {
+            'calls': self.calls,
+            'successes': self.successes,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'wins': self.wins,
+            'success_rate': round(self.successes / finished, 3) if finished else None,
+            'p50_latency': percentile(0.5),
+            'p95_latency': percentile(0.95),
+            'total_cost': round(self.cost, 6),
+            'avg_cost': round(self.cost / self.successes, 6) if self.successes else None,
+        }
+
+
+class FanoutService:
+    """한 프롬프트를 여러 모델에 동시에 보내는 생성 서비스"""
+
+    def __init__(self, llm_gateway: LLMGateway = None, targets: List[str] = None,
+                 deadline: float = FANOUT_DEADLINE):
+        self.gateway = llm_gateway or default_gateway
+        self.targets = targets or FANOUT_MODELS
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.stats: Dict[str, ModelStats] = {}
+
+    def _stats(self, target: str) -> ModelStats:
+        if target not in self.stats:
+            self.stats[target] = ModelStats()
+        return self.stats[target]
+
+    def _record(self, result: Dict):
+        with self.lock:
+            stats = self._stats(result['target'])
+            stats.calls += 1
+            if result['status'] == 'ok':
+                stats.successes += 1
+                stats.latencies.append(result['latency'])
+                stats.cost += result['cost']
+            elif result['status'] == 'error':
+                stats.errors += 1
+            else:
+                stats.cancelled += 1
+
+    async def _call(self, target: str, prompt: str, system: Optional[str], options: Dict) -> Dict:
+        provider, model = parse_target(target)
+        started = time.perf_counter()
+        try:
+            response: LLMResponse = await self.gateway.generate_async(provider, prompt, system=system,
+                                                                      model=model or None, **options)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return {'target': target, 'provider': provider, 'model': model, 'status': 'error',
+                    'error': str(e), 'latency': round(time.perf_counter() - started, 3)}
+        return {
+            'target': target, 'provider': provider, 'model': response.model, 'status': 'ok',
+            'text': response.text, 'latency': round(response.latency, 3),
+            'prompt_tokens': response.prompt_tokens, 'completion_tokens': response.completion_tokens,
+            'cost': estimate_cost(target, response.prompt_tokens, response.completion_tokens),
+        }
+
+    async def generate(self, prompt: str, system: str = None, mode: str = 'first', targets: List[str] = None,
+                       deadline: float = None, quorum: int = None, accept: Callable[[str], bool] = None,
+                       key: Callable[[str], str] = normalize_answer, **options) -> Dict:
+        """설정된 모델들에 동시에 생성 요청
+
+        accept: first 모드에서 승자로 인정할 응답인지 (기본: 빈 응답이 아니면 인정)
+        quorum: quorum 모드에서 같은 답이 몇 개 모여야 하는지 (기본: 과반)
+        key: quorum 모드의 답 비교 기준 (구조화된 응답이면 승자 필드 등을 뽑는 함수)
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown fan-out mode: {mode}")
+        targets = list(dict.fromkeys(targets or self.targets))
+        if not targets:
+            raise ValueError('no fan-out targets configured')
+        deadline = deadline or self.deadline
+        accept = accept or (lambda text: bool(text and text.strip()))
+        quorum = quorum or len(targets) // 2 + 1
+        started = time.perf_counter()
+
+        tasks = {asyncio.ensure_future(self._call(target, prompt, system, options)): target for target in targets}
+        results: Dict[str, Dict] = {}
+        votes: Dict[str, List[str]] = {}
+        winner = None
+        try:
+            pending = set(tasks)
+            while pending and winner is None:
+                remaining = deadline - (time.perf_counter() - started)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                # 같은 순간에 끝난 응답은 지연 시간 순으로 처리
+                for task in sorted(done, key=lambda task: task.result()['latency']):
+                    result = task.result()
+                    results[result['target']] = result
+                    if result['status'] != 'ok' or winner is not None:
+                        continue
+                    if mode == 'first' and accept(result['text']):
+                        winner = result['target']
+                    elif mode == 'quorum':
+                        group = votes.setdefault(key(result['text']), [])
+                        group.append(result['target'])
+                        if len(group) >= quorum:
+                            winner = group[0]
+                if mode == 'quorum' and winner is None and \
+                        max(map(len, votes.values()), default=0) + len(pending) < quorum:
+                    # 남은 응답이 모두 같은 답이어도 정족수를 채울 수 없음
+                    break
+        finally:
+            for task, target in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    results.setdefault(target, {
+                        'target': target, 'provider': parse_target(target)[0], 'model': parse_target(target)[1],
+                        'status': 'cancelled' if winner else 'timeout',
+                        'latency': round(time.perf_counter() - started, 3),
+                    })
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is None and mode in ('all', 'quorum'):
+            winner = self._best(results, votes if mode == 'quorum' else None)
+        for result in results.values():
+            self._record(result)
+        if winner:
+            with self.lock:
+                self._stats(winner).wins += 1
+
+        ordered = [results[target] for target in targets]
+        return {
+            'mode': mode,
+            'winner': winner,
+            'text': results[winner]['text'] if winner else None,
+            'quorum_reached': mode == 'quorum' and winner is not None and any(
+                len(group) >= quorum and winner in group for group in votes.values()),
+            'elapsed': round(time.perf_counter() - started, 3),
+            'total_cost': round(sum(result.get('cost', 0.0) for result in ordered), 6),
+            'results': ordered,
+        }
+
+    @staticmethod
+    def _best(results: Dict[str, Dict], votes: Optional[Dict[str, List[str]]]) -> Optional[str]:
+        """정족수/승자 없이 끝났을 때 - 표가 가장 많은 답, 같으면 가장 빠른 모델"""
+        succeeded = [result for result in results.values() if result['status'] == 'ok']
+        if not succeeded:
+            return None
+        if votes:
+            group = max(votes.values(), key=lambda targets: (len(targets), -min(results[t]['latency'] for t in targets)))
+            return min(group, key=lambda target: results[target]['latency'])
+        return min(succeeded, key=lambda result: result['latency'])['target']
+
+    def recommend(self, min_success_rate: float = 0.9, min_calls: int = 5) -> Optional[str]:
+        """성공률이 기준 이상인 모델 중 p50 지연 시간이 가장 짧은 모델"""
+        with self.lock:
+            candidates = [(target, stats.to_dict()) for target, stats in self.stats.items()]
+        adequate = [
+            (summary['p50_latency'], summary['avg_cost'] or 0.0, target)
+            for target, summary in candidates
+            if summary['successes'] >= min_calls and (summary['success_rate'] or 0) >= min_success_rate
+        ]
+        return min(adequate)[2] if adequate else None
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            models = {target: stats.to_dict() for target, stats in self.stats.items()}
+        return {'targets': self.targets, 'models': models, 'recommended': self.recommend()}
+
+
+# 프로세스 전역에서 공유하는 기본 동시 생성 서비스
+fanout = FanoutService()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+조건부 GET 피드 캐시
+URL별 ETag/Last-Modified를 저장하고, 304 응답이면 저장된 파싱 결과를 재사용
+"""
+
+import asyncio
+import inspect
+import threading
+from typing import Callable, Dict, List, Optional
+
+import models
+from database import SessionLocal, engine
+
+models.Base.metadata.create_all(bind=engine)
+
+
+class CacheStats:
+    """한 번의 크롤링 동안의 캐시 사용량 집계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def record(self, not_modified: bool, downloaded: int = 0, saved: int = 0):
+        with self.lock:
+            self.requests += 1
+            self.not_modified += 1 if not_modified else 0
+            self.bytes_downloaded += downloaded
+            self.bytes_saved += saved
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'bytes_downloaded': self.bytes_downloaded,
+                'bytes_saved': self.bytes_saved,
+            }
+
+
+class FeedCache:
+    """ETag/Last-Modified 기반 피드 캐시 (DB 저장 + 메모리 사본)"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.memory: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        with self.lock:
+            if url in self.memory:
+                return self.memory[url]
+
+        db = self.session_factory()
+        try:
+            row = db.query(models.FeedCacheEntry).filter(models.FeedCacheEntry.url == url).first()
+            if row is None:
+                return None
+            entry = {
+                'etag': row.etag,
+                'last_modified': row.last_modified,
+                'entries': row.entries or [],
+                'body_size': row.body_size or 0,
+            }
+        finally:
+            db.close()
+
+        with self.lock:
+            self.memory[url] = entry
+        return entry
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              entries: List, body_size: int):
+        entry = {'etag': etag, 'last_modified': last_modified, 'entries': entries, 'body_size': body_size}
+        with self.lock:
+            self.memory[url] = entry
+
+        db = self.session_factory()
+        try:
+            row = db.query(models.FeedCacheEntry).filter(models.FeedCacheEntry.url == url).first()
+            if row is None:
+                row = models.FeedCacheEntry(url=url)
+                db.add(row)
+            row.etag = etag
+            row.last_modified = last_modified
+            row.entries = entries
+            row.body_size = body_size
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"피드 캐시 저장 오류 ({url}): {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _reuse(self, entry: Dict, stats: Optional[CacheStats]) -> List:
+        if stats:
+            stats.record(True, saved=entry['body_size'])
+        return entry['entries']
+
+    def _update(self, url: str, status: int, headers, body: Optional[bytes], entries: List,
+                stats: Optional[CacheStats]) -> List:
+        if stats:
+            stats.record(False, downloaded=len(body or b''))
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if status == 200 and (etag or last_modified):
+            self.store(url, etag, last_modified, entries, len(body))
+        return entries
+
+    @staticmethod
+    def _stale(url: str, status: int, entry: Optional[Dict], stats: Optional[CacheStats]) -> List:
+        """200/304가 아닌 응답(429, 5xx 등) - 저장된 항목이 있으면 그대로 사용해 이번 크롤링에서 소스를 잃지 않음"""
+        if stats:
+            stats.record(False)
+        if entry is None:
+            return []
+        print(f"피드 응답 {status}, 저장된 항목 사용: {url}")
+        return entry['entries']
+
+    def fetch(self, url: str, get: Callable, parse: Callable[[bytes], List],
+              headers: Dict = None, stats: CacheStats = None) -> List:
+        """동기 조건부 GET - get(url, headers=...)는 requests 형식의 응답을 반환해야 함"""
+        entry = self.lookup(url)
+        response = get(url, headers={**(headers or {}), **self.conditional_headers(entry)})
+        if response.status_code == 304 and entry is not None:
+            return self._reuse(entry, stats)
+        if response.status_code != 200:
+            return self._stale(url, response.status_code, entry, stats)
+        body = response.content
+        return self._update(url, response.status_code, response.headers, body, parse(body), stats)
+
+    async def fetch_async(self, session, url: str, parse: Callable[[bytes], List],
+                          headers: Dict = None, stats: CacheStats = None,
+                          observe: Callable = None) -> List:
+        """aiohttp 세션을 사용하는 비동기 조건부 GET (observe로 응답 상태를 전달)
+
+        parse는 코루틴을 반환해도 됨 (프로세스 풀 파싱 등)
+        저장소 조회/저장(SQLite)은 작업 스레드에서 실행해 이벤트 루프를 막지 않음
+        """
+        entry = await asyncio.to_thread(self.lookup, url)
+        request_headers = {**(headers or {}), **self.conditional_headers(entry)}
+        async with session.get(url, headers=request_headers) as response:
+            if observe:
+                observe(url, response.status, response.headers)
+            if response.status == 304 and entry is not None:
+                return self._reuse(entry, stats)
+            if response.status != 200:
+                return self._stale(url, response.status, entry, stats)
+            body = await response.read()
+            status, response_headers = response.status, response.headers
+        # 파싱은 응답을 닫은 뒤에 수행해 연결을 바로 풀에 돌려줌
+        entries = parse(body)
+        if inspect.isawaitable(entries):
+            entries = await entries
+        return await asyncio.to_thread(self._update, url, status, response_headers, body, entries, stats)
+
+
+# 프로세스 전역에서 공유하는 기본 캐시
+feed_cache = FeedCache()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+피드 파싱 프로세스 풀
+feedparser/HTML 파싱은 CPU를 많이 쓰고 GIL을 잡고 있으므로 별도 프로세스에서 실행
+원본 바이트를 넘기고, 피클 가능한 간단한 dict 목록만 돌려받음
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
+
+import feedparser
+
+from text_extract import html_to_text
+
+# 0이면 프로세스 풀 없이 호출한 곳에서 바로 파싱
+FEED_PARSE_WORKERS = int(os.getenv('FEED_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# 이보다 작은 본문은 프로세스 간 전달 비용이 파싱 비용보다 커서 바로 파싱
+INLINE_PARSE_BYTES = int(os.getenv('FEED_PARSE_INLINE_BYTES', str(16 * 1024)))
+
+
+def clean_text(text) -> str:
+    """HTML 태그 제거 + 엔티티 변환 + 공백 정리"""
+    return html_to_text(text)
+
+
+# --- 작업 프로세스에서 실행되는 파서 (모듈 최상위 함수여야 피클 가능) ---
+
+def parse_google_feed(content: bytes, limit: int = 10) -> List[Dict]:
+    """Google News RSS -> [{link, title, published, summary}]"""
+    feed = feedparser.parse(content)
+    return [
+        {
+            'link': entry.link,
+            'title': entry.title,
+            'published': entry.get('published', ''),
+            'summary': clean_text(entry.get('summary', ''))
+        }
+        for entry in feed.entries[:limit]
+    ]
+
+
+def parse_arxiv_feed(content: bytes) -> List[Dict]:
+    """arXiv Atom -> [{id, title, published, summary, authors, categories}]"""
+    feed = feedparser.parse(content)
+    return [
+        {
+            'id': entry.id,
+            'title': entry.title,
+            'published': entry.published,
+            'summary': clean_text(entry.summary)[:500],
+            'authors': [author.name for author in entry.get('authors', [])],
+            'categories': [tag.term for tag in entry.get('tags', [])]
+        }
+        for entry in feed.entries
+    ]
+
+
+def parse_rss_feed(content: bytes, limit: int = 10) -> List[Dict]:
+    """일반 RSS/Atom -> [{title, url, summary, published_parsed, tags}]"""
+    feed = feedparser.parse(content)
+    return [
+        {
+            'title': entry.title,
+            'url': entry.link,
+            'summary': entry.get('summary', ''),
+            'published_parsed': list(entry.published_parsed[:6]) if entry.get('published_parsed') else None,
+            'tags': [tag.term for tag in entry.get('tags', [])]
+        }
+        for entry in feed.entries[:limit]
+    ]
+
+
+class FeedParserPool:
+    """피드 파싱 전용 프로세스 풀 (처음 쓸 때 생성, 풀이 깨지면 다시 생성)"""
+
+    def __init__(self, max_workers: int = FEED_PARSE_WORKERS, inline_bytes: int = INLINE_PARSE_BYTES):
+        self.max_workers = max_workers
+        self.inline_bytes = inline_bytes
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+        self.stats = {'pooled': 0, 'inline': 0, 'restarts': 0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # 스레드가 돌고 있는 서버 프로세스를 fork하지 않도록 spawn 사용
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+            return self.executor
+
+    def _reset(self, broken: ProcessPoolExecutor):
+        with self.lock:
+            if self.executor is broken:
+                self.executor = None
+                self.stats['restarts'] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, name: str):
+        # 크롤 엔진의 여러 작업 스레드에서 동시에 호출됨
+        with self.lock:
+            self.stats[name] += 1
+
+    def _inline(self, content: Optional[bytes]) -> bool:
+        return self.max_workers <= 0 or not content or len(content) < self.inline_bytes
+
+    def parse(self, parser: Callable[[bytes], List], content: bytes) -> List:
+        """동기 파싱 - 요청 스레드는 결과를 기다리는 동안 GIL을 놓음"""
+        if self._inline(content):
+            self._count('inline')
+            return parser(content)
+        executor = self._executor()
+        try:
+            result = executor.submit(parser, content).result()
+        except BrokenProcessPool:
+            self._reset(executor)
+            self._count('inline')
+            return parser(content)
+        self._count('pooled')
+        return result
+
+    async def parse_async(self, parser: Callable[[bytes], List], content: bytes) -> List:
+        """비동기 파싱 - 이벤트 루프를 막지 않음"""
+        if self._inline(content):
+            self._count('inline')
+            return parser(content)
+        executor = self._executor()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, parser, content)
+        except BrokenProcessPool:
+            self._reset(executor)
+            self._count('inline')
+            return parser(content)
+        self._count('pooled')
+        return result
+
+    def bind(self, parser: Callable[[bytes], List]) -> Callable[[bytes], List]:
+        """feed_cache.fetch에 넘길 동기 파서"""
+        return lambda content: self.parse(parser, content)
+
+    def bind_async(self, parser: Callable[[bytes], List]):
+        """feed_cache.fetch_async에 넘길 비동기 파서"""
+        return lambda content: self.parse_async(parser, content)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+        return {'max_workers': self.max_workers, 'inline_bytes': self.inline_bytes, **stats}
+
+
+# 프로세스 전역에서 공유하는 기본 풀
+feed_parser_pool = FeedParserPool()
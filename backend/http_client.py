@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+공유 HTTP 클라이언트
+호스트별 keep-alive 연결 풀, HTTP/2(가능한 경우), gzip/brotli 디코딩, 풀 적중률 지표
+"""
+
+import os
+import threading
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx의 HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+# 연결 풀 설정 (환경변수로 조정 가능)
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '20'))  # 유지할 호스트별 풀 개수
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))          # 호스트당 keep-alive 연결 수
+KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', '1') == '1'
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+class _PoolCounter:
+    """호스트별 요청 수 / 새 연결 수 집계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, int]] = {}
+
+    def add(self, host: str, requests_count: int = 0, new_connections: int = 0):
+        with self.lock:
+            counts = self.hosts.setdefault(host, {'requests': 0, 'new_connections': 0})
+            counts['requests'] += requests_count
+            counts['new_connections'] += new_connections
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {host: dict(counts) for host, counts in self.hosts.items()}
+
+
+class _CountingAdapter(HTTPAdapter):
+    """urllib3 풀이 폐기될 때도 요청/연결 수를 잃지 않도록 보관하는 어댑터"""
+
+    def __init__(self, counter: _PoolCounter, **kwargs):
+        self.counter = counter
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def retire(pool):
+            self.counter.add(pool.host, pool.num_requests, pool.num_connections)
+            if dispose:
+                dispose(pool)
+
+        pools.dispose_func = retire
+
+    def live_pools(self):
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                yield pool
+
+
+class HttpClient:
+    """모든 외부 요청이 공유하는 HTTP 클라이언트"""
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 http2: bool = HTTP2_ENABLED):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.counter = _PoolCounter()
+        self.async_counter = _PoolCounter()
+        self._async_sessions = {}
+        self._lock = threading.Lock()
+
+        if self.http2:
+            self.session = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                limits=httpx.Limits(
+                    max_connections=pool_connections * pool_maxsize,
+                    max_keepalive_connections=pool_connections * pool_maxsize,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
+            self.adapter = None
+        else:
+            self.session = requests.Session()
+            self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            self.adapter = _CountingAdapter(self.counter, pool_connections=pool_connections,
+                                            pool_maxsize=pool_maxsize)
+            self.session.mount('http://', self.adapter)
+            self.session.mount('https://', self.adapter)
+
+    @property
+    def backend(self) -> str:
+        return 'httpx' if self.http2 else 'requests'
+
+    def request(self, method: str, url: str, **kwargs):
+        """공유 연결 풀을 통한 요청 (requests와 같은 응답 인터페이스)"""
+        if not self.http2:
+            return self.session.request(method, url, **kwargs)
+
+        # httpx: 새 TCP 연결이 열렸는지 trace 이벤트로 판별
+        host = urlparse(url).hostname or url
+        connected = []
+
+        def trace(event_name, info):
+            if event_name == 'connection.connect_tcp.complete':
+                connected.append(True)
+
+        extensions = {**kwargs.pop('extensions', {}), 'trace': trace}
+        try:
+            return self.session.request(method, url, extensions=extensions, **kwargs)
+        finally:
+            self.counter.add(host, 1, 1 if connected else 0)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def async_session(self):
+        """현재 이벤트 루프에서 공유할 aiohttp 세션 (루프마다 하나씩 생성)"""
+        import asyncio
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._async_sessions.get(loop)
+            if session is not None and not session.closed:
+                return session
+
+            counter = self.async_counter
+
+            async def on_create(session, ctx, params):
+                counter.add(ctx.host, 1, 1)
+
+            async def on_reuse(session, ctx, params):
+                counter.add(ctx.host, 1, 0)
+
+            async def on_request_start(session, ctx, params):
+                ctx.host = params.url.host
+
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(on_request_start)
+            trace_config.on_connection_create_end.append(on_create)
+            trace_config.on_connection_reuseconn.append(on_reuse)
+
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_connections * self.pool_maxsize,
+                limit_per_host=self.pool_maxsize,
+                keepalive_timeout=KEEPALIVE_EXPIRY,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                trace_configs=[trace_config],
+            )
+            # 닫힌 루프의 세션은 정리
+            for old_loop in [l for l in self._async_sessions if l.is_closed()]:
+                del self._async_sessions[old_loop]
+            self._async_sessions[loop] = session
+            return session
+
+    async def aclose(self):
+        """현재 이벤트 루프의 aiohttp 세션 종료"""
+        import asyncio
+
+        with self._lock:
+            session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def close(self):
+        self.session.close()
+
+    def metrics(self) -> Dict:
+        """호스트별 연결 풀 적중(재사용)/미스(새 연결) 지표"""
+        hosts = self.counter.snapshot()
+        if self.adapter is not None:
+            for pool in self.adapter.live_pools():
+                counts = hosts.setdefault(pool.host, {'requests': 0, 'new_connections': 0})
+                counts['requests'] += pool.num_requests
+                counts['new_connections'] += pool.num_connections
+
+        def summarize(table):
+            result = {}
+            for host, counts in table.items():
+                hits = max(0, counts['requests'] - counts['new_connections'])
+                result[host] = {
+                    'requests': counts['requests'],
+                    'hits': hits,
+                    'misses': counts['new_connections'],
+                    'hit_rate': round(hits / counts['requests'], 3) if counts['requests'] else 0.0,
+                }
+            return result
+
+        return {
+            'backend': self.backend,
+            'http2': self.http2,
+            'accept_encoding': ACCEPT_ENCODING,
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'hosts': summarize(hosts),
+            'async_hosts': summarize(self.async_counter.snapshot()),
+        }
+
+
+# 프로세스 전역에서 공유하는 기본 클라이언트
+http_client = HttpClient()
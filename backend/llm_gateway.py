@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+LLM 게이트웨이
+Gemini / OpenAI / Ollama 호출을 한 곳에서 처리 - 클라이언트는 프로세스 전역에서 재사용하고,
+모델 이름/타임아웃/재시도/동시 실행 수는 LLM_CONFIG에서만 정의
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from singleflight import SingleFlight, flight_key
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+try:
+    import ollama
+except ImportError:
+    ollama = None
+
+LLM_CONFIG = {
+    'gemini': {
+        'model': os.getenv('GEMINI_MODEL', 'gemini-pro'),
+        'timeout': float(os.getenv('GEMINI_TIMEOUT', '120')),
+        'max_retries': int(os.getenv('GEMINI_MAX_RETRIES', '2')),
+        'concurrency': int(os.getenv('GEMINI_CONCURRENCY', '32')),
+    },
+    'openai': {
+        'model': os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo'),
+        'timeout': float(os.getenv('OPENAI_TIMEOUT', '60')),
+        'max_retries': int(os.getenv('OPENAI_MAX_RETRIES', '2')),
+        'concurrency': int(os.getenv('OPENAI_CONCURRENCY', '32')),
+    },
+    'ollama': {
+        'model': os.getenv('OLLAMA_MODEL', 'qwen3-coder:30b'),
+        'host': os.getenv('OLLAMA_HOST', 'http://localhost:11434'),
+        'timeout': float(os.getenv('OLLAMA_TIMEOUT', '300')),
+        'max_retries': int(os.getenv('OLLAMA_MAX_RETRIES', '1')),
+        'concurrency': int(os.getenv('OLLAMA_CONCURRENCY', '4')),
+        # ollama_scheduler 설정: 동시에 돌리는 작업 수, 모델을 메모리에 유지하는 시간, 항상 유지할 모델
+        'workers': int(os.getenv('OLLAMA_WORKERS', '1')),
+        'keep_alive': os.getenv('OLLAMA_KEEP_ALIVE', '30m'),
+        'pinned': [model.strip() for model in os.getenv('OLLAMA_PINNED_MODELS', '').split(',') if model.strip()],
+        'queue_timeout': float(os.getenv('OLLAMA_QUEUE_TIMEOUT', '600')),
+    },
+}
+
+RETRY_BACKOFF = 0.5  # 첫 재시도 대기 (초), 이후 두 배씩
+NON_RETRYABLE_STATUS = {400, 401, 403, 404, 422}
+LATENCY_WINDOW = 500  # 백분위 계산에 쓰는 최근 호출 수
+
+
+class LLMError(Exception):
+    """재시도 후에도 실패한 LLM 호출"""
+
+    def __init__(self, provider: str, message: str):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+
+
+class LLMResponse:
+    """생성 결과 + 호출 정보"""
+
+    def __init__(self, text: str, provider: str, model: str, latency: float = 0.0,
+                 prompt_tokens: int = 0, completion_tokens: int = 0, load_time: float = 0.0):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.latency = latency
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.load_time = load_time  # 모델을 메모리에 올리는 데 걸린 시간 (Ollama load_duration, 초)
+
+    def to_dict(self) -> Dict:
+        return {
+            'text': self.text,
+            'provider': self.provider,
+            'model': self.model,
+            'latency': round(self.latency, 3),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'load_time': round(self.load_time, 3),
+        }
+
+
+class ProviderMetrics:
+    """제공자별 호출 수/지연/토큰/오류 집계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_total = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.streams = 0
+        self.first_token_latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False):
+        with self.lock:
+            self.calls += 1
+            self.errors += 1 if error else 0
+            self.latency_total += latency
+            self.latencies.append(latency)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def record_first_token(self, latency: float):
+        with self.lock:
+            self.streams += 1
+            self.first_token_latencies.append(latency)
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            ordered = sorted(self.latencies)
+            percentile = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else 0.0
+            first_tokens = sorted(self.first_token_latencies)
+            ttft = lambda q: round(first_tokens[min(len(first_tokens) - 1, int(q * len(first_tokens)))], 3) if first_tokens else 0.0
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'error_rate': round(self.errors / self.calls, 3) if self.calls else 0.0,
+                'retries': self.retries,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'avg_latency': round(self.latency_total / self.calls, 3) if self.calls else 0.0,
+                'p50_latency': percentile(0.5),
+                'p95_latency': percentile(0.95),
+                'streams': self.streams,
+                'p50_first_token': ttft(0.5),
+                'p95_first_token': ttft(0.95),
+            }
+
+
+def _status_of(exc: Exception) -> Optional[int]:
+    for attr in ('status_code', 'code', 'status'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, (ValueError, TypeError, KeyError)):
+        return False
+    return _status_of(exc) not in NON_RETRYABLE_STATUS
+
+
+def _gemini_chunk_text(chunk) -> str:
+    """Gemini 스트림 조각의 텍스트 - 내용이 없는 조각(마지막 사용량 조각 등)은 빈 문자열
+
+    chunk.text는 parts가 없으면 ValueError를 내므로 먼저 확인하고, 안전 필터로 막힌 응답은 LLMError로 알림
+    """
+    candidates = getattr(chunk, 'candidates', None) or []
+    if candidates and getattr(candidates[0].content, 'parts', None):
+        return chunk.text
+    feedback = getattr(chunk, 'prompt_feedback', None)
+    block_reason = getattr(feedback, 'block_reason', None)
+    if block_reason:
+        raise LLMError('gemini', f'안전 필터로 차단된 응답입니다 ({getattr(block_reason, "name", block_reason)})')
+    return ''
+
+
+def _backoff(attempt: int) -> float:
+    return RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.8, 1.2)
+
+
+def sse_event(frame: Dict) -> str:
+    """{'type': ..., ...} 프레임을 Server-Sent Events 한 건으로 인코딩"""
+    return f"event: {frame['type']}\ndata: {json.dumps(frame, ensure_ascii=False)}\n\n"
+
+
+class ConcurrencyLimit:
+    """제공자별 동시 실행 한도 - 동기(스레드) 호출과 비동기(이벤트 루프) 호출이 같은 자리를 나눠 씀
+
+    비동기 쪽은 자리가 없으면 워커 스레드에서 기다려 이벤트 루프를 막지 않음
+    """
+
+    def __init__(self, size: int):
+        self.semaphore = threading.BoundedSemaphore(size)
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+
+    def _release_acquired(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self.semaphore.release()
+
+    async def __aenter__(self):
+        if self.semaphore.acquire(blocking=False):
+            return self
+        future = asyncio.ensure_future(asyncio.to_thread(self.semaphore.acquire))
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 기다리던 스레드는 결국 자리를 얻으므로, 얻는 즉시 돌려줌
+            future.add_done_callback(self._release_acquired)
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class LLMGateway:
+    """제공자 공통 생성 인터페이스 (동기/비동기)"""
+
+    def __init__(self, config: Dict = None):
+        self.config = config or LLM_CONFIG
+        self.lock = threading.Lock()
+        self.clients: Dict = {}
+        self.metrics_by_provider = {provider: ProviderMetrics() for provider in self.config}
+        self.limits = {provider: ConcurrencyLimit(options.get('concurrency', 8))
+                       for provider, options in self.config.items()}
+        self.flights = {provider: SingleFlight() for provider in self.config}
+
+    # --- 클라이언트 (처음 쓸 때 한 번만 생성) ---
+
+    def _client(self, key, factory):
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = factory()
+            return self.clients[key]
+
+    def client(self, provider: str, model: str = None, asynchronous: bool = False):
+        """제공자별 장수명 클라이언트 (Gemini는 모델별 GenerativeModel)"""
+        options = self.config[provider]
+        if provider == 'gemini':
+            if genai is None:
+                raise LLMError(provider, 'google-generativeai 패키지가 설치되어 있지 않습니다')
+            model = model or options['model']
+
+            def factory():
+                if os.getenv('GOOGLE_API_KEY'):
+                    genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+                return genai.GenerativeModel(model)
+            return self._client(('gemini', model), factory)
+        if provider == 'openai':
+            if openai is None:
+                raise LLMError(provider, 'openai 패키지가 설치되어 있지 않습니다')
+            # 재시도는 게이트웨이에서 일괄 처리
+            factory = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+            return self._client(('openai', asynchronous),
+                                lambda: factory(timeout=options['timeout'], max_retries=0))
+        if provider == 'ollama':
+            if ollama is None:
+                raise LLMError(provider, 'ollama 패키지가 설치되어 있지 않습니다')
+            factory = ollama.AsyncClient if asynchronous else ollama.Client
+            return self._client(('ollama', asynchronous),
+                                lambda: factory(host=options['host'], timeout=options['timeout']))
+        raise LLMError(provider, '알 수 없는 제공자입니다')
+
+    # --- 제공자별 요청/응답 변환 ---
+
+    @staticmethod
+    def _messages(prompt: str, system: str = None) -> List[Dict]:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _request(self, provider: str, prompt: str, system: str, model: str, options: Dict):
+        temperature = options.get('temperature')
+        max_tokens = options.get('max_tokens')
+        timeout = self.config[provider]['timeout']
+        if provider == 'gemini':
+            # gemini-pro는 system instruction을 지원하지 않으므로 프롬프트 앞에 붙임
+            contents = f"{system}\n\n{prompt}" if system else prompt
+            generation_config = {}
+            if temperature is not None:
+                generation_config['temperature'] = temperature
+            if max_tokens is not None:
+                generation_config['max_output_tokens'] = max_tokens
+            return {'contents': contents, 'generation_config': generation_config or None,
+                    'request_options': {'timeout': timeout}}
+        if provider == 'openai':
+            request = {'model': model, 'messages': self._messages(prompt, system)}
+            if temperature is not None:
+                request['temperature'] = temperature
+            if max_tokens is not None:
+                request['max_tokens'] = max_tokens
+            return request
+        request_options = {key: value for key, value in options.get('ollama_options', {}).items()}
+        if temperature is not None:
+            request_options['temperature'] = temperature
+        if max_tokens is not None:
+            request_options['num_predict'] = max_tokens
+        request = {'model': model, 'messages': self._messages(prompt, system)}
+        if request_options:
+            request['options'] = request_options
+        if options.get('keep_alive') is not None:
+            request['keep_alive'] = options['keep_alive']
+        return request
+
+    @staticmethod
+    def _parse(provider: str, response):
+        """(텍스트, 입력 토큰, 출력 토큰)"""
+        if provider == 'gemini':
+            usage = getattr(response, 'usage_metadata', None)
+            return (response.text,
+                    getattr(usage, 'prompt_token_count', 0) or 0,
+                    getattr(usage, 'candidates_token_count', 0) or 0)
+        if provider == 'openai':
+            usage = getattr(response, 'usage', None)
+            return (response.choices[0].message.content.strip(),
+                    getattr(usage, 'prompt_tokens', 0) or 0,
+                    getattr(usage, 'completion_tokens', 0) or 0)
+        return (response['message']['content'],
+                response.get('prompt_eval_count', 0) or 0,
+                response.get('eval_count', 0) or 0)
+
+    @staticmethod
+    def _load_time(provider: str, response) -> float:
+        if provider != 'ollama':
+            return 0.0
+        return (response.get('load_duration', 0) or 0) / 1e9
+
+    def _call(self, provider: str, client, request: Dict):
+        if provider == 'gemini':
+            return client.generate_content(**request)
+        if provider == 'openai':
+            return client.chat.completions.create(**request)
+        return client.chat(**request)
+
+    async def _call_async(self, provider: str, client, request: Dict):
+        if provider == 'gemini':
+            # 타임아웃은 asyncio.wait_for로 처리
+            request = {key: value for key, value in request.items() if key != 'request_options'}
+            return await client.generate_content_async(**request)
+        if provider == 'openai':
+            return await client.chat.completions.create(**request)
+        return await client.chat(**request)
+
+    def _call_stream(self, provider: str, client, request: Dict):
+        if provider == 'gemini':
+            return client.generate_content(**request, stream=True)
+        if provider == 'openai':
+            return client.chat.completions.create(**request, stream=True)
+        return client.chat(**request, stream=True)
+
+    async def _call_stream_async(self, provider: str, client, request: Dict):
+        if provider == 'gemini':
+            request = {key: value for key, value in request.items() if key != 'request_options'}
+            return await client.generate_content_async(**request, stream=True)
+        if provider == 'openai':
+            return await client.chat.completions.create(**request, stream=True)
+        return await client.chat(**request, stream=True)
+
+    @staticmethod
+    def _parse_chunk(provider: str, chunk):
+        """스트림 조각 -> (텍스트, 입력 토큰, 출력 토큰) - 토큰 수는 마지막 조각에만 있는 경우가 많음"""
+        if provider == 'gemini':
+            usage = getattr(chunk, 'usage_metadata', None)
+            return (_gemini_chunk_text(chunk),
+                    getattr(usage, 'prompt_token_count', 0) or 0,
+                    getattr(usage, 'candidates_token_count', 0) or 0)
+        if provider == 'openai':
+            usage = getattr(chunk, 'usage', None)
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            return (text or '',
+                    getattr(usage, 'prompt_tokens', 0) or 0,
+                    getattr(usage, 'completion_tokens', 0) or 0)
+        return (chunk.get('message', {}).get('content', ''),
+                chunk.get('prompt_eval_count', 0) or 0,
+                chunk.get('eval_count', 0) or 0)
+
+    # --- 공개 인터페이스 ---
+
+    def generate(self, provider: str, prompt: str, system: str = None, model: str = None,
+                 **options) -> LLMResponse:
+        """동기 생성 - 실패하면 설정된 횟수만큼 재시도 후 LLMError
+
+        같은 (제공자, 모델, 시스템 프롬프트, 프롬프트, 옵션) 호출이 이미 진행 중이면 그 결과를 함께 받음
+        """
+        model = model or self.config[provider]['model']
+        key = flight_key(provider, model, system, prompt, options)
+        return self.flights[provider].do(key, lambda: self._generate(provider, prompt, system, model, options))
+
+    async def generate_async(self, provider: str, prompt: str, system: str = None, model: str = None,
+                             **options) -> LLMResponse:
+        """비동기 생성 - 제공자별 동시 실행 수(동기 호출과 공유)를 넘는 요청은 루프를 막지 않고 대기
+
+        같은 호출이 이미 진행 중이면 그 결과를 함께 받음
+        """
+        model = model or self.config[provider]['model']
+        key = flight_key(provider, model, system, prompt, options)
+        return await self.flights[provider].do_async(
+            key, lambda: self._generate_async(provider, prompt, system, model, options))
+
+    def _generate(self, provider: str, prompt: str, system: Optional[str], model: str,
+                  options: Dict) -> LLMResponse:
+        settings = self.config[provider]
+        metrics = self.metrics_by_provider[provider]
+        client = self.client(provider, model)
+        request = self._request(provider, prompt, system, model, options)
+
+        for attempt in range(settings['max_retries'] + 1):
+            started = time.perf_counter()
+            try:
+                with self.limits[provider]:
+                    started = time.perf_counter()
+                    response = self._call(provider, client, request)
+                text, prompt_tokens, completion_tokens = self._parse(provider, response)
+            except Exception as e:
+                metrics.record(time.perf_counter() - started, error=True)
+                if attempt >= settings['max_retries'] or not _retryable(e):
+                    raise LLMError(provider, str(e)) from e
+                metrics.record_retry()
+                time.sleep(_backoff(attempt))
+                continue
+            latency = time.perf_counter() - started
+            metrics.record(latency, prompt_tokens, completion_tokens)
+            return LLMResponse(text, provider, model, latency, prompt_tokens, completion_tokens,
+                               self._load_time(provider, response))
+
+    async def _generate_async(self, provider: str, prompt: str, system: Optional[str], model: str,
+                              options: Dict) -> LLMResponse:
+        settings = self.config[provider]
+        metrics = self.metrics_by_provider[provider]
+        client = self.client(provider, model, asynchronous=True)
+        request = self._request(provider, prompt, system, model, options)
+
+        for attempt in range(settings['max_retries'] + 1):
+            started = time.perf_counter()
+            try:
+                async with self.limits[provider]:
+                    started = time.perf_counter()
+                    response = await asyncio.wait_for(self._call_async(provider, client, request),
+                                                      timeout=settings['timeout'])
+                text, prompt_tokens, completion_tokens = self._parse(provider, response)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.record(time.perf_counter() - started, error=True)
+                if attempt >= settings['max_retries'] or not _retryable(e):
+                    raise LLMError(provider, str(e) or type(e).__name__) from e
+                metrics.record_retry()
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            latency = time.perf_counter() - started
+            metrics.record(latency, prompt_tokens, completion_tokens)
+            return LLMResponse(text, provider, model, latency, prompt_tokens, completion_tokens,
+                               self._load_time(provider, response))
+
+    def stream(self, provider: str, prompt: str, system: str = None, model: str = None,
+               **options) -> Iterator[str]:
+        """동기 스트리밍 생성 - 모델이 만드는 대로 텍스트 조각을 yield
+
+        첫 조각이 나오기 전의 실패만 재시도 (이미 보낸 조각을 다시 보낼 수는 없으므로)
+        """
+        settings = self.config[provider]
+        model = model or settings['model']
+        metrics = self.metrics_by_provider[provider]
+        client = self.client(provider, model)
+        request = self._request(provider, prompt, system, model, options)
+
+        for attempt in range(settings['max_retries'] + 1):
+            started = time.perf_counter()
+            emitted = False
+            chunks = None
+            prompt_tokens = completion_tokens = 0
+            try:
+                with self.limits[provider]:
+                    started = time.perf_counter()
+                    chunks = self._call_stream(provider, client, request)
+                    for chunk in chunks:
+                        text, chunk_prompt, chunk_completion = self._parse_chunk(provider, chunk)
+                        prompt_tokens = max(prompt_tokens, chunk_prompt)
+                        completion_tokens = max(completion_tokens, chunk_completion)
+                        if not text:
+                            continue
+                        if not emitted:
+                            emitted = True
+                            metrics.record_first_token(time.perf_counter() - started)
+                        yield text
+            except GeneratorExit:
+                # 클라이언트가 연결을 끊음 - 여기까지를 한 번의 호출로 기록
+                metrics.record(time.perf_counter() - started, prompt_tokens, completion_tokens)
+                raise
+            except Exception as e:
+                metrics.record(time.perf_counter() - started, error=True)
+                if emitted or attempt >= settings['max_retries'] or not _retryable(e):
+                    raise LLMError(provider, str(e)) from e
+                metrics.record_retry()
+                time.sleep(_backoff(attempt))
+                continue
+            finally:
+                # 중간에 끊긴 스트림의 HTTP 연결을 바로 돌려줌
+                if hasattr(chunks, 'close'):
+                    chunks.close()
+            metrics.record(time.perf_counter() - started, prompt_tokens, completion_tokens)
+            return
+
+    async def stream_async(self, provider: str, prompt: str, system: str = None, model: str = None,
+                           **options) -> AsyncIterator[str]:
+        """비동기 스트리밍 생성 - 조각 사이 대기가 timeout을 넘으면 실패로 처리"""
+        settings = self.config[provider]
+        model = model or settings['model']
+        metrics = self.metrics_by_provider[provider]
+        client = self.client(provider, model, asynchronous=True)
+        request = self._request(provider, prompt, system, model, options)
+        timeout = settings['timeout']
+
+        for attempt in range(settings['max_retries'] + 1):
+            started = time.perf_counter()
+            emitted = False
+            chunks = None
+            prompt_tokens = completion_tokens = 0
+            try:
+                async with self.limits[provider]:
+                    started = time.perf_counter()
+                    chunks = (await asyncio.wait_for(self._call_stream_async(provider, client, request),
+                                                     timeout=timeout)).__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        text, chunk_prompt, chunk_completion = self._parse_chunk(provider, chunk)
+                        prompt_tokens = max(prompt_tokens, chunk_prompt)
+                        completion_tokens = max(completion_tokens, chunk_completion)
+                        if not text:
+                            continue
+                        if not emitted:
+                            emitted = True
+                            metrics.record_first_token(time.perf_counter() - started)
+                        yield text
+            except (asyncio.CancelledError, GeneratorExit):
+                metrics.record(time.perf_counter() - started, prompt_tokens, completion_tokens)
+                raise
+            except Exception as e:
+                metrics.record(time.perf_counter() - started, error=True)
+                if emitted or attempt >= settings['max_retries'] or not _retryable(e):
+                    raise LLMError(provider, str(e) or type(e).__name__) from e
+                metrics.record_retry()
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            finally:
+                if hasattr(chunks, 'aclose'):
+                    await chunks.aclose()
+            metrics.record(time.perf_counter() - started, prompt_tokens, completion_tokens)
+            return
+
+    def metrics(self) -> Dict:
+        return {
+            provider: {'model': self.config[provider]['model'], **metrics.to_dict(),
+                       'single_flight': self.flights[provider].stats()}
+            for provider, metrics in self.metrics_by_provider.items()
+        }
+
+
+# 프로세스 전역에서 공유하는 기본 게이트웨이
+gateway = LLMGateway()
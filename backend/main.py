@@ -1,20 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel
 from datetime import datetime
 import os
+import json
 import random
+import time
 import re
 import urllib.parse
-import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
 import google.generativeai as genai
 
 import crud, models, schemas
 from database import SessionLocal, engine
+from http_client import http_client
+from text_extract import extract_paragraphs
+from cache import get_cache, cache_key, text_hash, cache_stats, purge_expired_if_due
+import research
+import batch_analysis
+import chunking
+import structured_output
+from fanout import fanout, MODES as FANOUT_MODES
+from structured_output import StructuredOutputError
+from llm_gateway import gateway as llm_gateway, LLM_CONFIG, LLMError, sse_event
+from response_cache import response_cache
+from prompts import prompt_registry, PromptTemplate, DEFAULT_SYSTEM
+from news_crawl import crawler as news_crawler
+from scheduler import CrawlScheduler
 
 models.Base.metadata.create_all(bind=engine)
 
@@ -43,8 +60,25 @@ def get_db():
         db.close()
 
 # --- In-memory Stores ---
-news_items = []
-settings = {"crawling": {"keywords": ["AI"], "sources": ["google"]}}
+settings = {"crawling": {"keywords": ["AI"], "sources": ["google"], "interval_minutes": 60, "jitter_ratio": 0.1}}
+
+# --- Background Crawl Scheduler ---
+crawl_scheduler = CrawlScheduler(news_crawler, lambda: settings["crawling"])
+
+@app.on_event("startup")
+def purge_expired_cache():
+    # 이전 실행에서 남은 만료 항목을 시작할 때 한 번 정리 (이후에는 캐시에 저장할 때 주기적으로)
+    purge_expired_if_due(interval=0)
+
+@app.on_event("startup")
+def start_crawl_scheduler():
+    # 워커마다 스케줄러가 따로 돌면 같은 크롤링이 중복되므로 기본은 꺼 두고, 워커 하나에서만 켬
+    if os.getenv("CRAWL_SCHEDULER_ENABLED", "0") == "1":
+        crawl_scheduler.start()
+
+@app.on_event("shutdown")
+def stop_crawl_scheduler():
+    crawl_scheduler.stop()
 
 # --- Endpoints ---
 
@@ -109,12 +143,68 @@ def create_new_idea(idea: schemas.IdeaCreate, db: Session = Depends(get_db)):
 
 @app.post("/api/crawling/run")
 def run_crawling_api():
-    # ... (crawling logic remains the same)
-    return {"message": "Crawling finished."}
-
-@app.get("/api/news")
-def get_news():
-    return news_items
+    """다음 예약 시각을 기다리지 않고 크롤링을 바로 시작합니다."""
+    if not crawl_scheduler.trigger():
+        return {"message": "Crawling is already running.", "started": False}
+    return {"message": "Crawling started.", "started": True}
+
+@app.get("/api/crawling/status")
+def get_crawling_status():
+    """예약 크롤링 상태와 소스별 워터마크를 가져옵니다."""
+    return crawl_scheduler.status()
+
+@app.get("/api/news", response_model=List[schemas.NewsItem])
+def get_news(response: Response, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+             keyword: Optional[str] = None, source: Optional[str] = None, db: Session = Depends(get_db)):
+    """수집된 뉴스를 최신순으로 페이지 단위로 가져옵니다. 다음 페이지 커서는 X-Next-Cursor 헤더로 전달됩니다."""
+    try:
+        items, next_cursor = crud.get_news_items(db, limit=limit, cursor=cursor, keyword=keyword, source=source)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# --- Research Cache ---
+RESEARCH_MODEL = LLM_CONFIG["gemini"]["model"]
+RESEARCH_PROMPT = "Please summarize the following text in Korean, focusing on the key points:\n\n{text}"
+RESEARCH_MULTI_PROMPT = ("Please summarize the following passages from several web sources in Korean, "
+                         "focusing on the key points. Cite sources with their [number].\n\n{text}")
+RESEARCH_PAGE_CHARS = 20000  # 페이지당 추출하는 최대 본문 길이
+research_search_cache = get_cache("research_search", ttl=6 * 3600)  # 검색어 -> URL 목록
+research_page_cache = get_cache("research_page", maxsize=256, ttl=24 * 3600)  # URL -> 본문 문단 목록
+RESEARCH_REDUCE_PROMPT = ("The following are Korean summaries of consecutive parts of one web page. "
+                          "Combine them into a single Korean summary focusing on the key points:\n\n{text}")
+RESEARCH_CHUNK_TOKENS = 3000  # 페이지 요약에서 한 번에 보내는 본문 조각 크기
+research_summary_cache = get_cache("research_summary", ttl=7 * 24 * 3600)  # (본문 해시, 프롬프트) -> 요약
+
+def search_urls(query: str, num_results: int = 1, refresh: bool = False) -> List[str]:
+    key = cache_key(query, num_results, "ko")
+    # 빈 결과는 저장하지 않도록 None 반환
+    produce = lambda: list(search(query, num_results=num_results, lang="ko")) or None
+    return research_search_cache.get_or_set(key, produce, refresh=refresh) or []
+
+def fetch_page_paragraphs(url: str, refresh: bool = False, timeout: float = 10) -> List[str]:
+    def produce():
+        response = http_client.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
+        response.raise_for_status()
+        return extract_paragraphs(response.content, max_chars=RESEARCH_PAGE_CHARS) or None
+    key = cache_key(url, "paragraphs", RESEARCH_PAGE_CHARS)
+    return research_page_cache.get_or_set(key, produce, refresh=refresh) or []
+
+def summarize_text(text: str, refresh: bool = False, template: str = RESEARCH_PROMPT) -> str:
+    prompt = template.format(text=text)
+    key = cache_key(text_hash(text), RESEARCH_MODEL, text_hash(template))
+    produce = lambda: llm_gateway.generate("gemini", prompt, model=RESEARCH_MODEL).text
+    return research_summary_cache.get_or_set(key, produce, refresh=refresh)
+
+def summarize_long_text(text: str, refresh: bool = False) -> str:
+    """긴 본문은 조각별로 동시에 요약(조각별 캐시)한 뒤 조각 요약들을 다시 하나로 요약"""
+    chunks = chunking.split_chunks(text, RESEARCH_CHUNK_TOKENS)
+    summaries = chunking.map_chunks_sync(chunks, lambda chunk: summarize_text(chunk, refresh=refresh))
+    if len(summaries) == 1:
+        return summaries[0]
+    return summarize_text("\n\n".join(summaries), refresh=refresh, template=RESEARCH_REDUCE_PROMPT)
 
 @app.post("/api/ai/research")
 def smart_research_api(request: schemas.ResearchRequest):
@@ -122,32 +212,86 @@ def smart_research_api(request: schemas.ResearchRequest):
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
     try:
-        urls = list(search(request.query, num_results=1, lang="ko"))
+        num_results = max(1, min(request.num_results, 10))
+        urls = search_urls(request.query, num_results=num_results, refresh=request.refresh)
         if not urls:
             raise HTTPException(status_code=404, detail="No relevant web page found.")
+        if num_results > 1:
+            return multi_source_research(request, urls[:num_results])
         
         url = urls[0]
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        paragraphs = soup.find_all("p")
-        full_text = " ".join([p.get_text() for p in paragraphs])
+        full_text = " ".join(fetch_page_paragraphs(url, refresh=request.refresh))
 
         if not full_text.strip():
             raise HTTPException(status_code=404, detail="Could not extract text from the page.")
 
-        model = genai.GenerativeModel("gemini-pro")
-        prompt = f"Please summarize the following text in Korean, focusing on the key points:\n\n{full_text[:4000]}"
-        ai_response = model.generate_content(prompt)
+        summary = summarize_long_text(full_text, refresh=request.refresh)
         
         return {
-            "summary": f"<h3>'{request.query}'에 대한 AI 요약</h3><p>{ai_response.text}</p>",
+            "summary": f"<h3>'{request.query}'에 대한 AI 요약</h3><p>{summary}</p>",
             "sources": [{"title": f"Source: {url}", "url": url, "snippet": full_text[:150] + "..."}]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred during research: {str(e)}")
 
+def multi_source_research(request: schemas.ResearchRequest, urls: List[str]):
+    """상위 N개 페이지를 동시에 가져와 관련 구절만 토큰 예산에 맞춰 모은 뒤 한 번에 요약"""
+    timeout = request.page_timeout
+    fetch = lambda url: fetch_page_paragraphs(url, refresh=request.refresh, timeout=timeout)
+    # 전체 대기 시간은 가장 느린 페이지 하나(최대 page_timeout)로 제한
+    pages, errors = research.fetch_all(urls, fetch, timeout=timeout)
+
+    sources = [(url, research.split_passages(pages[url])) for url in urls if pages.get(url)]
+    if not sources:
+        raise HTTPException(status_code=404, detail="Could not extract text from any page.")
+    ranked = research.rank_passages(request.query, sources)
+    selected = research.select_passages(ranked, request.token_budget)
+    used_urls = [url for url, _ in sources if any(p['url'] == url for p in selected)]
+
+    summary = summarize_text(research.format_passages(selected, used_urls), refresh=request.refresh,
+                             template=RESEARCH_MULTI_PROMPT)
+    return {
+        "summary": f"<h3>'{request.query}'에 대한 AI 요약</h3><p>{summary}</p>",
+        "sources": [
+            {
+                "title": f"[{number}] Source: {url}",
+                "url": url,
+                "snippet": next(p['text'] for p in selected if p['url'] == url)[:150] + "...",
+            }
+            for number, url in enumerate(used_urls, 1)
+        ],
+        "failed_sources": [{"url": url, "error": error} for url, error in errors.items()],
+        "passages_used": len(selected),
+        "estimated_tokens": sum(research.estimate_tokens(p['text']) for p in selected),
+    }
+
+@app.get("/api/metrics/cache")
+def get_cache_metrics():
+    """검색/본문/요약 캐시의 적중·미스 지표를 가져옵니다."""
+    return cache_stats()
+
+@app.get("/api/metrics/llm")
+def get_llm_metrics():
+    """LLM 제공자별 호출 수, 지연 시간, 토큰 수, 오류율을 가져옵니다."""
+    return llm_gateway.metrics()
+
+@app.get("/api/metrics/response-cache")
+def get_response_cache_metrics():
+    """엔드포인트별 LLM 응답 캐시 적중률을 가져옵니다."""
+    return response_cache.stats()
+
+@app.get("/api/metrics/fanout")
+def get_fanout_metrics():
+    """다중 모델 동시 생성의 모델별 지연 시간, 비용, 승리 횟수와 추천 모델을 가져옵니다."""
+    return fanout.metrics()
+
+@app.get("/api/metrics/http")
+def get_http_metrics():
+    """공유 HTTP 연결 풀의 적중/미스 지표를 가져옵니다."""
+    return http_client.metrics()
+
 # --- Dashboard API Endpoints ---
 @app.get("/api/stats", response_model=schemas.DashboardStats)
 def get_dashboard_stats(db: Session = Depends(get_db)):
@@ -198,27 +342,50 @@ def increment_post_view(post_id: int, db: Session = Depends(get_db)):
 def generate_from_template(request: schemas.TemplateRequest):
     return {"generated_text": f"<h3>{request.topic}에 대한 생성된 템플릿 (더미)</h3>"}
 
+# --- Gemini 호출 (게이트웨이의 장수명 클라이언트 + 공유 동시 실행 제한) ---
+async def gemini_generate(prompt: str, model_name: str = None, system: str = None):
+    """워커 스레드를 점유하지 않는 Gemini 호출 - 한도를 넘는 요청은 이벤트 루프에서 순서를 기다림"""
+    return await llm_gateway.generate_async("gemini", prompt, system=system, model=model_name)
+
+async def cached_gemini_text(endpoint: str, template: PromptTemplate, validate=None, **inputs) -> str:
+    """같은 (모델, 템플릿 ID, 정규화된 입력)이면 저장된 응답을 재사용하는 Gemini 호출"""
+    async def generate():
+        prompt, system = template.messages(**inputs)
+        return (await gemini_generate(prompt, system=system)).text
+    return await response_cache.get_or_generate_async(endpoint, "gemini", LLM_CONFIG["gemini"]["model"],
+                                                      template, inputs, generate, validate)
+
+async def chunked_gemini_texts(endpoint: str, template: PromptTemplate, content: str, validate=None):
+    """긴 콘텐츠를 조각으로 나눠 동시에 분석 -> (조각 목록, 조각별 응답)
+
+    조각별 응답은 응답 캐시에 따로 저장되므로 글을 고쳐 다시 분석하면 바뀐 조각만 모델을 호출
+    """
+    chunks = chunking.split_chunks(content)
+    texts = await chunking.map_chunks(chunks, lambda chunk: cached_gemini_text(endpoint, template, validate,
+                                                                                content=chunk))
+    return chunks, texts
+
 # --- AI Content Generation ---
+# HTML 출력 요구는 시스템 프롬프트에 두어 템플릿 앞부분이 서비스와 무관하게 같도록 함
+CONTENT_HTML_SYSTEM = (f"{DEFAULT_SYSTEM} 결과는 HTML 형식으로 h2, h3, h4, p, ul, li 태그를 사용하여 "
+                       "보기 좋게 만들어주세요.")
+
+def content_prompt(request: dict):
+    """/api/ai/generate 요청의 (프롬프트, 시스템 프롬프트) - 스트리밍 버전과 공유"""
+    # 모르는 템플릿 이름은 예전처럼 블로그 도입부로
+    template = prompt_registry.get(request.get("template", "blog-intro"), fallback="blog-intro")
+    return template.render(content=request.get("title", "Untitled")), CONTENT_HTML_SYSTEM
+
 @app.post("/api/ai/generate")
-def generate_content_api(request: dict):
+async def generate_content_api(request: dict):
     """AI 템플릿 기반 콘텐츠 생성 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
 
-    template_type = request.get("template", "blog-intro")
-    title = request.get("title", "Untitled")
-    
-    prompts = {
-        "blog-intro": f"'{title}'에 대한 블로그 포스트 서론을 작성해주세요. 흥미를 유발하고, 무엇에 대해 다룰지 알려주는 내용을 포함해야 합니다. 결과는 HTML 형식으로 h2, h3, p, ul, li 태그를 사용하여 보기 좋게 만들어주세요.",
-        "product-review": f"'{title}' 제품에 대한 리뷰 기사를 작성해주세요. 제품 개요, 장점, 단점, 총평을 포함해야 합니다. 결과는 HTML 형식으로 h2, h3, p, ul, li 태그를 사용하여 보기 좋게 만들어주세요.",
-        "how-to": f"'{title}'에 대한 단계별 가이드(How-to)를 작성해주세요. 각 단계를 명확히 구분하고, 독자가 따라하기 쉽게 설명해야 합니다. 결과는 HTML 형식으로 h2, h3, h4, p, ul, li 태그를 사용하여 보기 좋게 만들어주세요."
-    }
-    
-    prompt = prompts.get(template_type, prompts["blog-intro"])
+    prompt, system = content_prompt(request)
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
+        ai_response = await gemini_generate(prompt, system=system)
         
         # 마크다운을 HTML로 변환 (기본적인 변환)
         html_content = ai_response.text.replace("\n", "<br>")
@@ -227,8 +394,48 @@ def generate_content_api(request: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI content generation failed: {str(e)}")
 
+@app.post("/api/ai/generate/stream")
+async def generate_content_stream_api(request: dict):
+    """AI 템플릿 기반 콘텐츠 생성 - 생성되는 대로 SSE로 전송 (token 이벤트 여러 번 후 done 또는 error)"""
+    if not GOOGLE_API_KEY:
+        raise HTTPException(status_code=500, detail="Google API Key is not configured.")
+
+    prompt, system = content_prompt(request)
+
+    async def events():
+        started = time.perf_counter()
+        first_token = None
+        try:
+            async for text in llm_gateway.stream_async("gemini", prompt, system=system):
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                yield sse_event({"type": "token", "text": text.replace("\n", "<br>")})
+            yield sse_event({"type": "done", "first_token": round(first_token or 0.0, 3),
+                             "elapsed": round(time.perf_counter() - started, 3)})
+        except LLMError as e:
+            yield sse_event({"type": "error", "message": f"AI content generation failed: {str(e)}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/ai/templates")
+def list_templates_api():
+    """공유 프롬프트 템플릿 목록 (ID는 템플릿 문구의 해시를 포함해 문구가 바뀌면 달라짐)"""
+    return {"templates": prompt_registry.catalog()}
+
+@app.post("/api/ai/fanout")
+async def fanout_generate_api(request: schemas.FanoutRequest):
+    """하나의 프롬프트를 여러 모델에 동시에 보내 first/all/quorum 모드로 결과를 고릅니다."""
+    if request.mode not in FANOUT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(FANOUT_MODES)}")
+    if not request.prompt.strip():
+        raise HTTPException(status_code=400, detail="prompt is required.")
+    return await fanout.generate(request.prompt, system=request.system, mode=request.mode,
+                                 targets=request.models or None, deadline=request.deadline,
+                                 quorum=request.quorum)
+
 @app.post("/api/ai/generate-titles")
-def generate_titles_api(request: dict):
+async def generate_titles_api(request: dict):
     """AI 제목 생성 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -240,17 +447,16 @@ def generate_titles_api(request: dict):
     prompt = f"블로그 주제 '{topic}'에 대한 흥미로운 제목 5개를 제안해주세요. 각 제목은 60자 미만이어야 합니다. 결과는 'titles' 키를 가진 JSON 리스트 형식으로 반환해주세요. 예: [{{'title': '제목1'}}, {{'title': '제목2'}}]"
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        titles = json.loads(cleaned_response)
-        return titles
+        ai_response = await gemini_generate(prompt)
+        # 요청한 {"titles": [...]} 대신 예시처럼 목록만 돌려주는 경우도 받음
+        titles = structured_output.parse(ai_response.text,
+                                         Union[schemas.TitleSuggestions, List[schemas.TitleSuggestion]])
+        return titles if isinstance(titles, dict) else {"titles": titles}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI title generation failed: {str(e)}")
 
 @app.post("/api/ai/tone")
-def change_tone_api(request: dict):
+async def change_tone_api(request: dict):
     """텍스트 톤 변경 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -264,14 +470,15 @@ def change_tone_api(request: dict):
     prompt = f"다음 텍스트를 '{tone}' 톤으로 다시 작성해주세요. 원본의 의미는 유지하면서, 문체만 변경해야 합니다.\n\n원본 텍스트: \"{text}\""
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
+        ai_response = await gemini_generate(prompt)
         return {"text": ai_response.text}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI tone change failed: {str(e)}")
 
+FACT_CHECK_PROMPT = prompt_registry.get("fact_check")
+
 @app.post("/api/ai/fact-check")
-def fact_check_api(request: dict):
+async def fact_check_api(request: dict):
     """팩트체크 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -280,30 +487,27 @@ def fact_check_api(request: dict):
     if not content.strip():
         return {"results": []}
 
-    prompt = f"""다음 텍스트의 주요 주장들을 식별하고, 각 주장에 대한 팩트체크를 수행해주세요. 각 주장에 대해 '검증됨', '검증 필요', '오류' 중 하나의 상태와 함께 간단한 설명을 제공해주세요. 결과를 JSON 형식의 리스트로 반환해주세요. 각 항목은 'claim', 'status', 'explanation' 키를 가져야 합니다.
-
-텍스트: {content}"""
-
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        
-        # Gemini가 반환한 텍스트에서 JSON만 추출
-        import json
-        # The response might be in a markdown code block, so we need to clean it.
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        results = json.loads(cleaned_response)
-        return {"results": results}
+        _, texts = await chunked_gemini_texts("fact_check", FACT_CHECK_PROMPT, content,
+                                              structured_output.validator(List[schemas.FactCheckResult]))
     except Exception as e:
-        # Fallback to a simpler text-based analysis if JSON parsing fails
+        raise HTTPException(status_code=500, detail=f"AI fact-check failed: {str(e)}")
+
+    results = []
+    for index, text in enumerate(texts):
         try:
-            return {"results": [{"claim": "분석 결과", "status": "info", "explanation": ai_response.text}]}
-        except:
-             raise HTTPException(status_code=500, detail=f"AI fact-check failed: {str(e)}")
+            # 코드 블록/설명 문장이 섞여 있어도 첫 번째 JSON 리스트만 추출
+            results.append(structured_output.parse(text, List[schemas.FactCheckResult]))
+        except StructuredOutputError:
+            # JSON 형식이 아니면 응답 전체를 하나의 결과로 반환 (조각이 여럿이면 조각 번호를 붙여 중복 제거에서 살림)
+            claim = f"분석 결과 ({index + 1}/{len(texts)})" if len(texts) > 1 else "분석 결과"
+            results.append([{"claim": claim, "status": "info", "explanation": text}])
+    return {"results": chunking.merge_unique(results, key=lambda result: " ".join(result["claim"].split()))}
+
+SEO_ANALYSIS_PROMPT = prompt_registry.get("seo_analysis")
 
 @app.post("/api/seo/analyze")
-def analyze_seo_api(request: dict):
+async def analyze_seo_api(request: dict):
     """SEO 분석 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -312,24 +516,18 @@ def analyze_seo_api(request: dict):
     if not content.strip():
         return {"score": 0, "suggestions": ["분석할 콘텐츠가 없습니다."]}
 
-    prompt = f"""다음 블로그 콘텐츠에 대한 SEO 분석을 수행하고, 100점 만점의 점수와 구체적인 개선 제안 목록을 제공해주세요. 점수는 'score' 키에, 제안 목록은 'suggestions' 키에 담아 JSON 형식으로 반환해주세요.
-
-콘텐츠: {content}"""
-
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        analysis = json.loads(cleaned_response)
-        return analysis
+        chunks, texts = await chunked_gemini_texts("seo_analyze", SEO_ANALYSIS_PROMPT, content,
+                                                   structured_output.validator(schemas.SEOAnalysis))
+        results = [structured_output.parse(text, schemas.SEOAnalysis) for text in texts]
+        return chunking.merge_results(results, chunking.chunk_weights(chunks))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI SEO analysis failed: {str(e)}")
 
+HASHTAG_PROMPT = prompt_registry.get("hashtags")
+
 @app.post("/api/hashtags/generate")
-def generate_hashtags_api(request: dict):
+async def generate_hashtags_api(request: dict):
     """해시태그 생성 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -338,30 +536,31 @@ def generate_hashtags_api(request: dict):
     if not content.strip():
         return {"hashtags": []}
 
-    prompt = f"다음 콘텐츠에 가장 적합한 해시태그 목록을 생성해주세요. 결과는 JSON 형식의 리스트로, 각 해시태그는 '#'으로 시작해야 합니다.\n\n콘텐츠: {content}"
-
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        hashtags = json.loads(cleaned_response)
-        return {"hashtags": hashtags}
+        _, texts = await chunked_gemini_texts("hashtags", HASHTAG_PROMPT, content,
+                                              structured_output.validator(List[str]))
     except Exception as e:
-        # Fallback for non-json response
-        try:
-            # Attempt to parse hashtags from a plain text response
-            hashtags = [tag.strip() for tag in ai_response.text.split() if tag.startswith('#')]
-            if hashtags:
-                return {"hashtags": hashtags}
-        except:
-            pass # Ignore if fallback fails
         raise HTTPException(status_code=500, detail=f"AI hashtag generation failed: {str(e)}")
 
+    tag_lists = []
+    error = None
+    for text in texts:
+        try:
+            tag_lists.append(structured_output.parse(text, List[str]))
+        except StructuredOutputError as e:
+            # Fallback for non-json response: parse hashtags from a plain text response
+            error = e
+            tag_lists.append([tag.strip() for tag in text.split() if tag.startswith('#')])
+    # 여러 조각에서 반복해서 나온 해시태그를 앞으로
+    hashtags = chunking.rank_by_frequency(tag_lists, limit=chunking.CHUNK_LIST_LIMIT if len(texts) > 1 else None)
+    if not hashtags and error is not None:
+        raise HTTPException(status_code=500, detail=f"AI hashtag generation failed: {str(error)}")
+    return {"hashtags": hashtags}
+
+READABILITY_PROMPT = prompt_registry.get("readability")
+
 @app.post("/api/readability/analyze")
-def analyze_readability_api(request: dict):
+async def analyze_readability_api(request: dict):
     """가독성 분석 (Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -370,24 +569,16 @@ def analyze_readability_api(request: dict):
     if not content.strip():
         return {"score": 0, "level": "N/A", "suggestions": ["분석할 콘텐츠가 없습니다."]}
 
-    prompt = f"""다음 텍스트의 가독성을 분석해주세요. 100점 만점의 'score', 가독성 수준을 나타내는 'level' (예: 초급, 중급, 고급), 그리고 개선 제안 목록인 'suggestions'를 포함한 JSON 형식으로 결과를 반환해주세요.
-
-텍스트: {content}"""
-
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        analysis = json.loads(cleaned_response)
-        return analysis
+        chunks, texts = await chunked_gemini_texts("readability", READABILITY_PROMPT, content,
+                                                   structured_output.validator(schemas.ReadabilityAnalysis))
+        results = [structured_output.parse(text, schemas.ReadabilityAnalysis) for text in texts]
+        return chunking.merge_results(results, chunking.chunk_weights(chunks))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI readability analysis failed: {str(e)}")
 
 @app.post("/api/youtube/analyze")
-def analyze_youtube_api(request: dict):
+async def analyze_youtube_api(request: dict):
     """유튜브 영상 분석 (Scraping + Gemini API)"""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -398,9 +589,10 @@ def analyze_youtube_api(request: dict):
 
     try:
         headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "en-US,en;q=0.5"}
-        response = requests.get(url, headers=headers, timeout=10)
+        # 동기 HTTP 요청과 파싱은 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        response = await run_in_threadpool(http_client.get, url, headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        soup = await run_in_threadpool(BeautifulSoup, response.content, "html.parser")
 
         # 메타 태그에서 제목과 설명 추출 (더 안정적)
         title = soup.find("meta", property="og:title")["content"]
@@ -412,13 +604,10 @@ def analyze_youtube_api(request: dict):
             raise HTTPException(status_code=404, detail="Could not extract video metadata.")
 
         # Gemini API로 요약 및 분석 요청
-        model = genai.GenerativeModel("gemini-pro")
         prompt = f"""유튜브 영상 정보를 바탕으로 다음 항목들을 생성해주세요:\n1. 영상 내용에 대한 상세한 한국어 요약 (summary)\n2. 영상의 핵심 키워드 목록 (keywords)\n3. 이 영상을 활용한 블로그 포스트 아이디어 (blog_suggestions)\n4. 영상의 흐름을 예측한 가상 타임스탬프 목록 (timestamps)\n\n영상 제목: {title}\n영상 설명: {description}\n\n결과는 'summary', 'keywords', 'blog_suggestions', 'timestamps' 키를 포함하는 JSON 형식으로 반환해주세요."""
         
-        ai_response = model.generate_content(prompt)
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        analysis = json.loads(cleaned_response)
+        ai_response = await gemini_generate(prompt)
+        analysis = structured_output.parse(ai_response.text, schemas.YouTubeAnalysis)
 
         analysis_result = {
             "video_id": video_id,
@@ -444,7 +633,7 @@ def analyze_youtube_api(request: dict):
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 @app.post("/api/ai/ab-test-titles", response_model=schemas.TitleABTestResponse)
-def ab_test_titles_api(request: schemas.TitleABTestRequest):
+async def ab_test_titles_api(request: schemas.TitleABTestRequest):
     """두 개의 제목을 A/B 테스트하고 AI가 승자를 결정합니다."""
     if not GOOGLE_API_KEY:
         raise HTTPException(status_code=500, detail="Google API Key is not configured.")
@@ -478,14 +667,8 @@ def ab_test_titles_api(request: schemas.TitleABTestRequest):
     """
 
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        result = json.loads(cleaned_response)
-        return result
+        ai_response = await gemini_generate(prompt)
+        return structured_output.parse(ai_response.text, schemas.TitleABTestResponse)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI A/B test failed: {str(e)}")
@@ -509,8 +692,10 @@ def generate_thumbnail_api(request: schemas.ThumbnailRequest):
     placeholder_url = f"https://placehold.co/600x400/{colors}?text={text}&font=noto-sans-kr"
     return {"imageUrl": placeholder_url}
 
+META_TAGS_PROMPT = prompt_registry.get("meta_tags")
+
 @app.post("/api/seo/meta-tags")
-def generate_meta_tags_api(request: dict):
+async def generate_meta_tags_api(request: dict):
     """메타 태그 생성 (플레이스홀더)"""
     title = request.get("title", "")
     content = request.get("content", "")
@@ -522,14 +707,11 @@ def generate_meta_tags_api(request: dict):
             "description": content[:150]
         }
 
-    prompt = f"다음 블로그 제목과 내용을 바탕으로 SEO에 최적화된 title (50자 이내)과 meta description (150자 이내)을 생성해주세요. 결과는 'title'과 'description' 키를 가진 JSON 형식으로 반환해주세요.\n\n제목: {title}\n내용: {content[:500]}"
-    
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        ai_response = model.generate_content(prompt)
-        import json
-        cleaned_response = ai_response.text.strip().replace("```json", "").replace("```", "").strip()
-        return json.loads(cleaned_response)
+        response_text = await cached_gemini_text("meta_tags", META_TAGS_PROMPT,
+                                                 structured_output.validator(schemas.MetaTags),
+                                                 title=title, content=content[:500])
+        return structured_output.parse(response_text, schemas.MetaTags)
     except Exception as e:
         # Fallback to simple defaults on error
         return {
@@ -537,6 +719,103 @@ def generate_meta_tags_api(request: dict):
             "description": content[:150]
         }
 
+# --- Batch Analysis ---
+BATCH_STORE_EVERY = 50  # 결과를 모아 한 번에 저장하는 단위
+
+def load_batch_items(request: schemas.BatchAnalysisRequest):
+    """요청의 글 ID/콘텐츠 -> (분석할 글 목록, 찾지 못한 글 ID)"""
+    items = []
+    missing_ids = []
+    if request.post_ids:
+        db = SessionLocal()
+        try:
+            posts = {post.id: post for post in crud.get_posts_by_ids(db, request.post_ids)}
+        finally:
+            db.close()
+        for post_id in dict.fromkeys(request.post_ids):
+            post = posts.get(post_id)
+            if post is None:
+                missing_ids.append(post_id)
+                continue
+            items.append({"id": f"p{post_id}", "post_id": post_id,
+                          "title": post.title or "", "content": post.content or ""})
+    for index, entry in enumerate(request.contents):
+        items.append({"id": f"c{index}", "post_id": None, "title": entry.title, "content": entry.content})
+    for item in items:
+        item["content_hash"] = batch_analysis.content_hash(item["title"], item["content"])
+    return items, missing_ids
+
+def store_post_analyses(rows: list) -> int:
+    db = SessionLocal()
+    try:
+        return crud.upsert_post_analyses(db, rows)
+    finally:
+        db.close()
+
+@app.post("/api/analysis/batch")
+async def batch_analysis_api(request: schemas.BatchAnalysisRequest, format: str = Query("ndjson")):
+    """여러 글을 한 번에 분석 - 여러 글을 한 프롬프트에 묶고, 글별 결과를 끝나는 대로 NDJSON(?format=sse면 SSE)으로 전송하며 DB에 저장"""
+    if not GOOGLE_API_KEY:
+        raise HTTPException(status_code=500, detail="Google API Key is not configured.")
+    unknown = [name for name in request.analyses if name not in batch_analysis.ANALYSES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown analyses: {', '.join(unknown)}")
+
+    items, missing_ids = await run_in_threadpool(load_batch_items, request)
+    if not items and not missing_ids:
+        raise HTTPException(status_code=400, detail="post_ids or contents is required.")
+    items = [item for item in items if item["content"].strip()]
+    by_id = {item["id"]: item for item in items}
+    model = LLM_CONFIG["gemini"]["model"]
+    use_sse = format == "sse"
+
+    def encode(frame):
+        return sse_event(frame) if use_sse else json.dumps(frame, ensure_ascii=False) + "\n"
+
+    async def generate(prompt: str) -> str:
+        return (await gemini_generate(prompt)).text
+
+    async def frames():
+        started = time.perf_counter()
+        counts = {"ok": 0, "error": 0}
+        stored = 0
+        pending = []
+        for post_id in missing_ids:
+            counts["error"] += 1
+            yield encode({"type": "result", "id": f"p{post_id}", "post_id": post_id, "status": "error",
+                          "error": "post not found"})
+        try:
+            async for frame in batch_analysis.run_batches(items, request.analyses, generate,
+                                                          concurrency=request.concurrency,
+                                                          max_items=request.batch_size):
+                item = by_id[frame["id"]]
+                counts[frame["status"]] += 1
+                if frame["status"] == "ok":
+                    pending.append({"post_id": item["post_id"], "content_hash": item["content_hash"],
+                                    "analysis": frame["analysis"], "result": frame["result"], "model": model})
+                    if len(pending) >= BATCH_STORE_EVERY:
+                        stored += await run_in_threadpool(store_post_analyses, pending)
+                        pending = []
+                yield encode({"type": "result", "post_id": item["post_id"], "content_hash": item["content_hash"],
+                              **frame})
+        finally:
+            # 중간에 연결이 끊겨도 이미 받은 결과는 저장
+            if pending:
+                stored += await run_in_threadpool(store_post_analyses, pending)
+        yield encode({"type": "done", "items": len(items), "ok": counts["ok"], "errors": counts["error"],
+                      "stored": stored, "elapsed": round(time.perf_counter() - started, 3)})
+
+    return StreamingResponse(frames(), media_type="text/event-stream" if use_sse else "application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/analysis", response_model=List[schemas.PostAnalysis])
+def get_post_analyses(post_id: Optional[int] = None, analysis: Optional[str] = None,
+                      content_hash: Optional[str] = None, skip: int = 0, limit: int = Query(100, le=1000),
+                      db: Session = Depends(get_db)):
+    """저장된 분석 결과를 글 ID, 분석 종류, 콘텐츠 해시로 조회합니다."""
+    return crud.get_post_analyses(db, post_id=post_id, analysis=analysis, content_hash=content_hash,
+                                  skip=skip, limit=limit)
+
 # --- Data Seeding Endpoint (개발용) ---
 @app.post("/api/seed-data")
 def seed_sample_data(db: Session = Depends(get_db)):
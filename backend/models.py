@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -86,3 +86,70 @@ class Insight(Base):
     priority = Column(String, default="medium")  # low, medium, high
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class FeedCacheEntry(Base):
+    __tablename__ = "feed_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, index=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    entries = Column(JSON)  # 파싱된 항목 (304 응답 시 그대로 사용)
+    body_size = Column(Integer, default=0)  # 마지막 전체 응답 크기 (bytes)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CacheEntry(Base):
+    __tablename__ = "cache_entries"
+    __table_args__ = (
+        Index("ix_cache_entries_namespace_key", "namespace", "key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    namespace = Column(String)  # 캐시 종류 (research_search, research_page 등)
+    key = Column(String)
+    value = Column(JSON)
+    expires_at = Column(Float, nullable=True, index=True)  # epoch 초, 없으면 만료 없음
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class NewsItem(Base):
+    __tablename__ = "news_items"
+    __table_args__ = (
+        Index("ix_news_items_collected_at_id", "collected_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_hash = Column(String, unique=True, index=True)  # AINewsCrawler.generate_id 결과
+    title = Column(String)
+    link = Column(String)
+    source = Column(String, index=True)
+    keyword = Column(String, index=True)
+    summary = Column(Text)
+    published = Column(String, nullable=True)
+    extra = Column(JSON)  # 점수, 저자 등 소스별 추가 필드
+    collected_at = Column(DateTime(timezone=True), index=True)
+
+class CrawlWatermark(Base):
+    __tablename__ = "crawl_watermarks"
+    __table_args__ = (
+        Index("ix_crawl_watermarks_source_keyword", "source", "keyword", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String)
+    keyword = Column(String)
+    published_ts = Column(Float)  # 마지막으로 처리한 항목의 발행 시각 (epoch 초)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PostAnalysis(Base):
+    __tablename__ = "post_analyses"
+    __table_args__ = (
+        Index("ix_post_analyses_content_hash_analysis", "content_hash", "analysis", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=True, index=True)  # 직접 보낸 콘텐츠는 None
+    content_hash = Column(String)  # 제목+본문 sha256 (batch_analysis.content_hash)
+    analysis = Column(String, index=True)  # seo, readability, hashtags, meta_tags
+    result = Column(JSON)
+    model = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+AI 뉴스 크롤러
+실시간으로 AI 관련 뉴스를 수집하는 시스템 (Flask 서버와 FastAPI 백엔드가 함께 사용, 웹 프레임워크 의존 없음)
+"""
+
+from datetime import datetime, timezone
+from typing import List, Dict, Iterator, Optional
+import hashlib
+import time
+from urllib.parse import quote
+from email.utils import parsedate_to_datetime
+from functools import partial
+from crawl_engine import CrawlEngine, CrawlTask
+from rate_limiter import rate_limiter
+from http_client import http_client
+from feed_cache import feed_cache, CacheStats
+from feed_parser_pool import feed_parser_pool, parse_google_feed, parse_arxiv_feed, clean_text
+from dedup import StoryClusterIndex
+import crud
+from database import SessionLocal
+
+class AINewsCrawler:
+    def __init__(self, request_timeout: float = 10.0, deadline: float = 60.0):
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        self.subreddits = ['artificial', 'MachineLearning', 'technology', 'programming']
+        self.request_timeout = request_timeout  # 요청별 타임아웃 (초)
+        self.engine = CrawlEngine(deadline=deadline)
+        
+    def clean_text(self, text):
+        """텍스트 정리"""
+        return clean_text(text)
+    
+    def generate_id(self, url):
+        """URL로부터 고유 ID 생성"""
+        return hashlib.md5(url.encode()).hexdigest()[:12]
+    
+    def _get(self, url: str, **kwargs):
+        """호스트별 속도 제한을 거쳐 GET 요청 (429 응답 시 한 번 재시도)"""
+        kwargs.setdefault('timeout', self.request_timeout)
+        for attempt in range(2):
+            rate_limiter.acquire(url)
+            response = http_client.get(url, **kwargs)
+            if not rate_limiter.observe(url, response.status_code, response.headers):
+                break
+        return response
+    
+    def fetch_google_news(self, keyword: str, cache_stats: CacheStats = None) -> List[Dict]:
+        """구글 뉴스에서 키워드 하나에 대한 뉴스 검색"""
+        news_items = []
+        
+        # Google News RSS 피드 사용 (변경이 없으면 304 응답과 캐시된 항목 사용)
+        rss_url = f"https://news.google.com/rss/search?q={quote(keyword)}&hl=ko&gl=KR&ceid=KR:ko"
+        entries = feed_cache.fetch(rss_url, self._get, feed_parser_pool.bind(parse_google_feed),
+                                   headers=self.headers, stats=cache_stats)
+        
+        for entry in entries:
+            news_item = {
+                'id': self.generate_id(entry['link']),
+                'title': entry['title'],
+                'link': entry['link'],
+                'source': 'Google News',
+                'published': entry['published'],
+                'summary': entry['summary'],
+                'keyword': keyword,
+                'collected_at': datetime.now(timezone.utc).isoformat()
+            }
+            news_items.append(news_item)
+        
+        return news_items
+    
+    def fetch_reddit(self, keyword: str, subreddit: str) -> List[Dict]:
+        """Reddit 서브레딧 하나에서 키워드 하나에 대한 포스트 검색"""
+        news_items = []
+        
+        url = f"https://www.reddit.com/r/{subreddit}/search.json?q={quote(keyword)}&sort=new&limit=5"
+        response = self._get(url, headers={**self.headers, 'User-Agent': 'AINewsCrawler/1.0'})
+        
+        if response.status_code == 200:
+            data = response.json()
+            posts = data.get('data', {}).get('children', [])
+            
+            for post in posts:
+                post_data = post.get('data', {})
+                news_item = {
+                    'id': self.generate_id(post_data.get('url', '')),
+                    'title': post_data.get('title', ''),
+                    'link': f"https://reddit.com{post_data.get('permalink', '')}",
+                    'source': f'Reddit r/{subreddit}',
+                    'published': datetime.fromtimestamp(post_data.get('created_utc', 0)).isoformat(),
+                    'published_ts': post_data.get('created_utc'),
+                    'summary': self.clean_text(post_data.get('selftext', ''))[:500],
+                    'keyword': keyword,
+                    'score': post_data.get('score', 0),
+                    'num_comments': post_data.get('num_comments', 0),
+                    'collected_at': datetime.now(timezone.utc).isoformat()
+                }
+                news_items.append(news_item)
+        
+        return news_items
+    
+    def fetch_hackernews(self, keyword: str, since: float = None) -> List[Dict]:
+        """Hacker News에서 키워드 하나에 대한 뉴스 검색 (since 이후 항목만 요청 가능)"""
+        news_items = []
+        
+        # Algolia HN Search API 사용
+        url = f"https://hn.algolia.com/api/v1/search?query={quote(keyword)}&tags=story&hitsPerPage=10"
+        if since:
+            # 증분 크롤링: 워터마크 이후 항목만 최신순으로
+            url = (f"https://hn.algolia.com/api/v1/search_by_date?query={quote(keyword)}&tags=story"
+                   f"&hitsPerPage=10&numericFilters=created_at_i>{int(since)}")
+        response = self._get(url)
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            for hit in data.get('hits', []):
+                news_item = {
+                    'id': self.generate_id(hit.get('url', hit.get('objectID', ''))),
+                    'title': hit.get('title', ''),
+                    'link': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"),
+                    'source': 'Hacker News',
+                    'published': hit.get('created_at', ''),
+                    'summary': f"Points: {hit.get('points', 0)}, Comments: {hit.get('num_comments', 0)}",
+                    'keyword': keyword,
+                    'published_ts': hit.get('created_at_i'),
+                    'author': hit.get('author', ''),
+                    'points': hit.get('points', 0),
+                    'num_comments': hit.get('num_comments', 0),
+                    'collected_at': datetime.now(timezone.utc).isoformat()
+                }
+                news_items.append(news_item)
+        
+        return news_items
+    
+    def fetch_arxiv(self, keyword: str, cache_stats: CacheStats = None) -> List[Dict]:
+        """arXiv에서 키워드 하나에 대한 최신 논문 검색"""
+        news_items = []
+        
+        # arXiv API 사용 (변경이 없으면 304 응답과 캐시된 항목 사용)
+        url = f"http://export.arxiv.org/api/query?search_query=all:{quote(keyword)}&start=0&max_results=5&sortBy=submittedDate&sortOrder=descending"
+        entries = feed_cache.fetch(url, self._get, feed_parser_pool.bind(parse_arxiv_feed), stats=cache_stats)
+        
+        for entry in entries:
+            news_item = {
+                'id': self.generate_id(entry['id']),
+                'title': f"[논문] {entry['title']}",
+                'link': entry['id'],
+                'source': 'arXiv',
+                'published': entry['published'],
+                'summary': entry['summary'],
+                'keyword': keyword,
+                'authors': entry['authors'],
+                'categories': entry['categories'],
+                'collected_at': datetime.now(timezone.utc).isoformat()
+            }
+            news_items.append(news_item)
+        
+        return news_items
+    
+    def _search_serial(self, source: str, keywords: List[str]) -> List[Dict]:
+        """한 소스의 작업을 순서대로 실행 (개별 오류는 건너뜀)"""
+        news_items = []
+        for task in self.build_tasks(keywords, [source]):
+            try:
+                news_items.extend(task.fetch())
+            except Exception as e:
+                print(f"크롤링 오류 ({task.label}): {e}")
+        return news_items
+    
+    def search_google_news(self, keywords: List[str]) -> List[Dict]:
+        """구글 뉴스에서 AI 관련 뉴스 검색"""
+        return self._search_serial('google', keywords)
+    
+    def search_reddit(self, keywords: List[str]) -> List[Dict]:
+        """Reddit에서 AI 관련 포스트 검색"""
+        return self._search_serial('reddit', keywords)
+    
+    def search_hackernews(self, keywords: List[str]) -> List[Dict]:
+        """Hacker News에서 AI 관련 뉴스 검색"""
+        return self._search_serial('hackernews', keywords)
+    
+    def search_arxiv(self, keywords: List[str]) -> List[Dict]:
+        """arXiv에서 최신 AI 논문 검색"""
+        return self._search_serial('arxiv', keywords)
+    
+    def published_timestamp(self, item: Dict) -> Optional[float]:
+        """항목의 발행 시각 (epoch 초) - 알 수 없으면 None"""
+        if item.get('published_ts'):
+            return float(item['published_ts'])
+        published = item.get('published')
+        if not published:
+            return None
+        try:
+            parsed = datetime.fromisoformat(published.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(published)
+            except (TypeError, ValueError):
+                return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    
+    def build_tasks(self, keywords: List[str], sources: List[str],
+                    cache_stats: CacheStats = None, watermarks: Dict = None) -> List[CrawlTask]:
+        """(소스, 키워드) 쌍마다 하나의 크롤링 작업 생성"""
+        watermarks = watermarks or {}
+        tasks = []
+        for keyword in keywords:
+            if 'google' in sources:
+                tasks.append(CrawlTask('google', keyword, partial(self.fetch_google_news, keyword, cache_stats)))
+            if 'reddit' in sources:
+                for subreddit in self.subreddits:
+                    tasks.append(CrawlTask('reddit', keyword, partial(self.fetch_reddit, keyword, subreddit),
+                                           label=f"reddit/{subreddit}/{keyword}"))
+            if 'hackernews' in sources:
+                tasks.append(CrawlTask('hackernews', keyword, partial(self.fetch_hackernews, keyword,
+                                                                      watermarks.get(('hackernews', keyword)))))
+            if 'arxiv' in sources:
+                tasks.append(CrawlTask('arxiv', keyword, partial(self.fetch_arxiv, keyword, cache_stats)))
+        return tasks
+    
+    def iter_crawl(self, keywords: List[str], sources: List[str], deadline: float = None,
+                   watermarks: Dict = None) -> Iterator[Dict]:
+        """작업이 끝나는 대로 (소스, 키워드) 배치 프레임을 내보내고, 마지막에 요약 프레임을 내보냄
+
+        watermarks는 {(소스, 키워드): 발행 시각}이며, 그 시각 이전에 발행된 항목은 건너뜀
+        """
+        watermarks = watermarks or {}
+        print(f"크롤링 시작: {keywords}, 소스: {sources}")
+        
+        started = time.monotonic()
+        cache_stats = CacheStats()
+        timings = {}
+        index = StoryClusterIndex()
+        seen = set()
+        
+        tasks = self.build_tasks(keywords, sources, cache_stats, watermarks)
+        for result in self.engine.iter_results(tasks, deadline=deadline, timings=timings):
+            # 워터마크 이후 항목만, 중복 제거 (ID 기준) + 다른 URL로 퍼진 같은 이야기 묶기
+            mark = watermarks.get((result['source'], result['keyword']))
+            latest = None
+            batch = []
+            for item in result['items']:
+                published_ts = self.published_timestamp(item)
+                if published_ts is not None:
+                    if mark is not None and published_ts <= mark:
+                        continue
+                    latest = max(latest or published_ts, published_ts)
+                if item['id'] in seen:
+                    continue
+                seen.add(item['id'])
+                item['cluster_id'] = index.add(item['id'], item.get('title', ''), item.get('summary', ''))
+                batch.append(item)
+            
+            yield {
+                'type': 'batch',
+                'source': result['source'],
+                'keyword': result['keyword'],
+                'label': result['label'],
+                'items': batch,
+                'error': result['error'],
+                'elapsed': round(result['elapsed'], 3),
+                'watermark': latest
+            }
+        
+        for stats in timings.values():
+            stats['busy'] = round(stats['busy'], 3)
+            stats['elapsed'] = round(stats['elapsed'], 3)
+        timed_out = any(stats['skipped'] for stats in timings.values())
+        
+        yield {
+            'type': 'summary',
+            'status': 'partial' if timed_out else 'success',
+            'crawled_at': datetime.now(timezone.utc).isoformat(),
+            'keywords': keywords,
+            'sources': sources,
+            'total_items': len(seen),
+            'total_stories': len(index.clusters),
+            'clusters': {cluster_id: len(members) for cluster_id, members in index.clusters.items()
+                         if len(members) > 1},
+            'timed_out': timed_out,
+            'elapsed': round(time.monotonic() - started, 3),
+            'timings': timings,
+            'feed_cache': cache_stats.to_dict()
+        }
+    
+    def crawl_all_sources(self, keywords: List[str], sources: List[str], deadline: float = None) -> Dict:
+        """모든 소스에서 뉴스 동시 크롤링 (마감 시간 초과 시 부분 결과 반환)"""
+        items = []
+        for frame in self.iter_crawl(keywords, sources, deadline=deadline):
+            if frame['type'] == 'batch':
+                items.extend(frame['items'])
+            else:
+                result = frame
+        
+        clusters = result.pop('clusters')
+        for item in items:
+            item['cluster_size'] = clusters.get(item['cluster_id'], 1)
+        
+        del result['type']
+        result['items'] = items
+        
+        # 최신순으로 정렬
+        result['items'].sort(key=lambda x: x.get('collected_at', ''), reverse=True)
+        
+        return result
+
+    def save_items(self, items: List[Dict]) -> int:
+        """수집한 뉴스를 뉴스 저장소에 배치 upsert (URL 해시 기준 중복 제거)"""
+        db = SessionLocal()
+        try:
+            return crud.upsert_news_items(db, items)
+        except Exception as e:
+            db.rollback()
+            print(f"뉴스 저장 오류: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+# 프로세스 전역에서 공유하는 기본 뉴스 크롤러
+crawler = AINewsCrawler()
@@ -1,222 +1,30 @@
 #!/usr/bin/env python3
 """
-AI 뉴스 크롤러
-실시간으로 AI 관련 뉴스를 수집하는 시스템
+AI 뉴스 크롤러 서버
+news_crawl의 크롤러를 Flask API로 제공
 """
 
 import json
-import requests
-from datetime import datetime, timezone
-from bs4 import BeautifulSoup
-import feedparser
-import time
-from typing import List, Dict
-import hashlib
-import re
-from urllib.parse import quote
-
-class AINewsCrawler:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-    def clean_text(self, text):
-        """텍스트 정리"""
-        if not text:
-            return ""
-        # HTML 태그 제거
-        text = re.sub('<.*?>', '', text)
-        # 여러 공백을 하나로
-        text = ' '.join(text.split())
-        return text.strip()
-    
-    def generate_id(self, url):
-        """URL로부터 고유 ID 생성"""
-        return hashlib.md5(url.encode()).hexdigest()[:12]
-    
-    def search_google_news(self, keywords: List[str]) -> List[Dict]:
-        """구글 뉴스에서 AI 관련 뉴스 검색"""
-        news_items = []
-        
-        for keyword in keywords:
-            try:
-                # Google News RSS 피드 사용
-                rss_url = f"https://news.google.com/rss/search?q={quote(keyword)}&hl=ko&gl=KR&ceid=KR:ko"
-                feed = feedparser.parse(rss_url)
-                
-                for entry in feed.entries[:10]:  # 키워드당 최대 10개
-                    news_item = {
-                        'id': self.generate_id(entry.link),
-                        'title': entry.title,
-                        'link': entry.link,
-                        'source': 'Google News',
-                        'published': entry.get('published', ''),
-                        'summary': self.clean_text(entry.get('summary', '')),
-                        'keyword': keyword,
-                        'collected_at': datetime.now(timezone.utc).isoformat()
-                    }
-                    news_items.append(news_item)
-                    
-            except Exception as e:
-                print(f"Google News 크롤링 오류 ({keyword}): {e}")
-        
-        return news_items
-    
-    def search_reddit(self, keywords: List[str]) -> List[Dict]:
-        """Reddit에서 AI 관련 포스트 검색"""
-        news_items = []
-        subreddits = ['artificial', 'MachineLearning', 'technology', 'programming']
-        
-        for keyword in keywords:
-            for subreddit in subreddits:
-                try:
-                    url = f"https://www.reddit.com/r/{subreddit}/search.json?q={quote(keyword)}&sort=new&limit=5"
-                    response = requests.get(url, headers={**self.headers, 'User-Agent': 'AINewsCrawler/1.0'})
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = data.get('data', {}).get('children', [])
-                        
-                        for post in posts:
-                            post_data = post.get('data', {})
-                            news_item = {
-                                'id': self.generate_id(post_data.get('url', '')),
-                                'title': post_data.get('title', ''),
-                                'link': f"https://reddit.com{post_data.get('permalink', '')}",
-                                'source': f'Reddit r/{subreddit}',
-                                'published': datetime.fromtimestamp(post_data.get('created_utc', 0)).isoformat(),
-                                'summary': self.clean_text(post_data.get('selftext', ''))[:500],
-                                'keyword': keyword,
-                                'score': post_data.get('score', 0),
-                                'num_comments': post_data.get('num_comments', 0),
-                                'collected_at': datetime.now(timezone.utc).isoformat()
-                            }
-                            news_items.append(news_item)
-                    
-                    time.sleep(2)  # Reddit API 제한 준수
-                    
-                except Exception as e:
-                    print(f"Reddit 크롤링 오류 ({subreddit}/{keyword}): {e}")
-        
-        return news_items
-    
-    def search_hackernews(self, keywords: List[str]) -> List[Dict]:
-        """Hacker News에서 AI 관련 뉴스 검색"""
-        news_items = []
-        
-        for keyword in keywords:
-            try:
-                # Algolia HN Search API 사용
-                url = f"https://hn.algolia.com/api/v1/search?query={quote(keyword)}&tags=story&hitsPerPage=10"
-                response = requests.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for hit in data.get('hits', []):
-                        news_item = {
-                            'id': self.generate_id(hit.get('url', hit.get('objectID', ''))),
-                            'title': hit.get('title', ''),
-                            'link': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"),
-                            'source': 'Hacker News',
-                            'published': hit.get('created_at', ''),
-                            'summary': f"Points: {hit.get('points', 0)}, Comments: {hit.get('num_comments', 0)}",
-                            'keyword': keyword,
-                            'author': hit.get('author', ''),
-                            'points': hit.get('points', 0),
-                            'num_comments': hit.get('num_comments', 0),
-                            'collected_at': datetime.now(timezone.utc).isoformat()
-                        }
-                        news_items.append(news_item)
-                        
-            except Exception as e:
-                print(f"Hacker News 크롤링 오류 ({keyword}): {e}")
-        
-        return news_items
-    
-    def search_arxiv(self, keywords: List[str]) -> List[Dict]:
-        """arXiv에서 최신 AI 논문 검색"""
-        news_items = []
-        
-        for keyword in keywords:
-            try:
-                # arXiv API 사용
-                url = f"http://export.arxiv.org/api/query?search_query=all:{quote(keyword)}&start=0&max_results=5&sortBy=submittedDate&sortOrder=descending"
-                response = requests.get(url)
-                
-                if response.status_code == 200:
-                    feed = feedparser.parse(response.content)
-                    
-                    for entry in feed.entries:
-                        news_item = {
-                            'id': self.generate_id(entry.id),
-                            'title': f"[논문] {entry.title}",
-                            'link': entry.id,
-                            'source': 'arXiv',
-                            'published': entry.published,
-                            'summary': self.clean_text(entry.summary)[:500],
-                            'keyword': keyword,
-                            'authors': [author.name for author in entry.authors],
-                            'categories': [tag.term for tag in entry.tags],
-                            'collected_at': datetime.now(timezone.utc).isoformat()
-                        }
-                        news_items.append(news_item)
-                        
-            except Exception as e:
-                print(f"arXiv 크롤링 오류 ({keyword}): {e}")
-        
-        return news_items
-    
-    def crawl_all_sources(self, keywords: List[str], sources: List[str]) -> Dict:
-        """모든 소스에서 뉴스 크롤링"""
-        all_news = []
-        
-        print(f"크롤링 시작: {keywords}, 소스: {sources}")
-        
-        if 'google' in sources:
-            print("Google News 크롤링 중...")
-            all_news.extend(self.search_google_news(keywords))
-        
-        if 'reddit' in sources:
-            print("Reddit 크롤링 중...")
-            all_news.extend(self.search_reddit(keywords))
-        
-        if 'hackernews' in sources:
-            print("Hacker News 크롤링 중...")
-            all_news.extend(self.search_hackernews(keywords))
-        
-        if 'arxiv' in sources:
-            print("arXiv 크롤링 중...")
-            all_news.extend(self.search_arxiv(keywords))
-        
-        # 중복 제거 (ID 기준)
-        unique_news = {}
-        for item in all_news:
-            unique_news[item['id']] = item
-        
-        result = {
-            'status': 'success',
-            'crawled_at': datetime.now(timezone.utc).isoformat(),
-            'keywords': keywords,
-            'sources': sources,
-            'total_items': len(unique_news),
-            'items': list(unique_news.values())
-        }
-        
-        # 최신순으로 정렬
-        result['items'].sort(key=lambda x: x.get('collected_at', ''), reverse=True)
-        
-        return result
+from rate_limiter import rate_limiter
+from http_client import http_client
+from feed_parser_pool import feed_parser_pool
+from news_crawl import crawler
 
 # Flask 서버
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app)  # CORS 허용
 
-crawler = AINewsCrawler()
+def parse_deadline(value):
+    """요청의 deadline 값 -> 초(float) 또는 None (생략 시), 숫자가 아니거나 0 이하면 ValueError"""
+    if value is None:
+        return None
+    deadline = float(value)
+    if not deadline > 0:
+        raise ValueError('deadline must be positive')
+    return deadline
 
 @app.route('/api/news/crawl', methods=['POST'])
 def crawl_news():
@@ -225,11 +33,16 @@ def crawl_news():
         data = request.get_json()
         keywords = data.get('keywords', ['AI', '인공지능'])
         sources = data.get('sources', ['google', 'reddit', 'hackernews'])
+        try:
+            deadline = parse_deadline(data.get('deadline'))  # 전체 마감 시간 (초, 선택)
+        except (TypeError, ValueError):
+            return jsonify({'status': 'error', 'message': 'deadline은 0보다 큰 초 단위 숫자여야 합니다'}), 400
         
         if not keywords:
             return jsonify({'status': 'error', 'message': '키워드를 입력해주세요'}), 400
         
-        result = crawler.crawl_all_sources(keywords, sources)
+        result = crawler.crawl_all_sources(keywords, sources, deadline=deadline)
+        result['stored_items'] = crawler.save_items(result['items'])
         return jsonify(result)
         
     except Exception as e:
@@ -238,12 +51,69 @@ def crawl_news():
             'message': str(e)
         }), 500
 
+@app.route('/api/news/crawl/stream', methods=['POST'])
+def crawl_news_stream():
+    """뉴스 크롤링 스트리밍 API (기본 NDJSON, ?format=sse 또는 Accept: text/event-stream이면 SSE)"""
+    data = request.get_json() or {}
+    keywords = data.get('keywords', ['AI', '인공지능'])
+    sources = data.get('sources', ['google', 'reddit', 'hackernews'])
+    try:
+        deadline = parse_deadline(data.get('deadline'))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'deadline은 0보다 큰 초 단위 숫자여야 합니다'}), 400
+    
+    if not keywords:
+        return jsonify({'status': 'error', 'message': '키워드를 입력해주세요'}), 400
+    
+    use_sse = request.args.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+    
+    def encode(frame):
+        payload = json.dumps(frame, ensure_ascii=False, default=str)
+        if use_sse:
+            return f"event: {frame['type']}\ndata: {payload}\n\n"
+        return payload + "\n"
+    
+    def generate():
+        items = []
+        try:
+            for frame in crawler.iter_crawl(keywords, sources, deadline=deadline):
+                if frame['type'] == 'batch':
+                    items.extend(frame['items'])
+                else:
+                    frame['stored_items'] = crawler.save_items(items)
+                yield encode(frame)
+        except Exception as e:
+            yield encode({'type': 'error', 'status': 'error', 'message': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/news/test', methods=['GET'])
 def test_news():
     """테스트용 API"""
     sample_result = crawler.crawl_all_sources(['ChatGPT', 'AI'], ['google', 'hackernews'])
     return jsonify(sample_result)
 
+@app.route('/api/news/rate-limits', methods=['GET'])
+def rate_limit_stats():
+    """호스트별 속도 제한 현황 API"""
+    return jsonify({
+        'status': 'success',
+        'hosts': rate_limiter.stats()
+    })
+
+@app.route('/api/news/http-metrics', methods=['GET'])
+def http_metrics():
+    """공유 HTTP 연결 풀 / 피드 파싱 풀 지표 API"""
+    return jsonify({
+        'status': 'success',
+        'metrics': http_client.metrics(),
+        'feed_parser': feed_parser_pool.metrics()
+    })
+
 @app.route('/api/news/translate', methods=['POST'])
 def translate_news():
     """뉴스 번역 API (구글 번역 API 사용 시뮬레이션)"""
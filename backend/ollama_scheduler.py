@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Ollama 요청 스케줄러
+로컬 Ollama 호출을 우선순위 큐에 넣고 제한된 수의 작업 스레드로만 실행
+(편집기 요청(interactive)이 일괄 작업(batch)보다 먼저), keep_alive로 자주 쓰는 모델을 메모리에 유지
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Iterator, List
+
+from llm_gateway import gateway as default_gateway, LLMGateway, LLMError, LLMResponse, LLM_CONFIG
+from singleflight import SingleFlight, flight_key
+
+PRIORITIES = {'interactive': 0, 'batch': 10}
+COLD_LOAD_THRESHOLD = 0.5  # 이 시간(초) 이상 걸린 로드는 디스크에서 다시 올린 것으로 봄
+WAIT_WINDOW = 500
+
+
+class _Job:
+    def __init__(self, fn: Callable, priority: str):
+        self.fn = fn
+        self.priority = priority
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class OllamaScheduler:
+    """우선순위 큐 + 고정 작업 스레드 풀"""
+
+    def __init__(self, llm_gateway: LLMGateway = None, workers: int = None, keep_alive=None,
+                 pinned: List[str] = None, queue_timeout: float = None):
+        options = LLM_CONFIG['ollama']
+        self.gateway = llm_gateway or default_gateway
+        self.workers = max(1, workers or options['workers'])
+        self.keep_alive = keep_alive if keep_alive is not None else options['keep_alive']
+        self.pinned = set(pinned if pinned is not None else options['pinned'])
+        self.queue_timeout = queue_timeout or options['queue_timeout']
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.threads: List[threading.Thread] = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.depth = {name: 0 for name in PRIORITIES}
+        self.waits = {name: deque(maxlen=WAIT_WINDOW) for name in PRIORITIES}
+        self.loads: Dict[str, Dict] = {}
+        self.flights = SingleFlight()
+
+    # --- 작업 스레드 ---
+
+    def _start(self):
+        with self.lock:
+            if self.threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'ollama-worker-{index}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def _work(self):
+        while True:
+            _, _, job = self.queue.get()
+            if job is None:
+                return
+            with self.lock:
+                self.depth[job.priority] -= 1
+                self.waits[job.priority].append(time.perf_counter() - job.enqueued)
+                self.running += 1
+            outcome = None
+            # 기다리다 취소된 작업(시간 초과, 연결 끊김)은 실행하지 않음
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn())
+                    outcome = 'completed'
+                except BaseException as e:
+                    job.future.set_exception(e)
+                    outcome = 'failed'
+            with self.lock:
+                self.running -= 1
+                if outcome == 'completed':
+                    self.completed += 1
+                elif outcome == 'failed':
+                    self.failed += 1
+
+    def submit(self, fn: Callable, priority: str = 'interactive') -> Future:
+        """fn을 우선순위 큐에 넣고 Future 반환 (같은 우선순위는 들어온 순서대로)"""
+        priority = priority if priority in PRIORITIES else 'interactive'
+        self._start()
+        job = _Job(fn, priority)
+        with self.lock:
+            self.depth[priority] += 1
+        self.queue.put((PRIORITIES[priority], next(self.sequence), job))
+        return job.future
+
+    def shutdown(self):
+        with self.lock:
+            threads, self.threads = self.threads, []
+        for _ in threads:
+            # 우선순위 값이 가장 커서 남은 작업이 모두 끝난 뒤에 처리됨
+            self.queue.put((float('inf'), next(self.sequence), None))
+        for thread in threads:
+            thread.join()
+
+    # --- 생성 ---
+
+    def keep_alive_for(self, model: str):
+        """고정(pinned) 모델은 무기한, 나머지는 설정된 시간만큼 메모리에 유지"""
+        return -1 if model in self.pinned else self.keep_alive
+
+    def _record_load(self, model: str, load_time: float):
+        with self.lock:
+            stats = self.loads.setdefault(model, {'calls': 0, 'cold_loads': 0, 'load_time_total': 0.0,
+                                                  'max_load_time': 0.0, 'last_load_time': 0.0})
+            stats['calls'] += 1
+            stats['load_time_total'] += load_time
+            stats['last_load_time'] = load_time
+            stats['max_load_time'] = max(stats['max_load_time'], load_time)
+            if load_time >= COLD_LOAD_THRESHOLD:
+                stats['cold_loads'] += 1
+
+    def _wait(self, future: Future):
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise LLMError('ollama', f'scheduler queue timeout after {self.queue_timeout:.0f}s')
+
+    def generate(self, prompt: str, system: str = None, model: str = None, priority: str = 'interactive',
+                 **options) -> LLMResponse:
+        """큐를 거쳐 실행하는 동기 생성 (호출 스레드는 결과가 나올 때까지 대기)
+
+        같은 우선순위의 같은 요청이 이미 큐에 있거나 실행 중이면 새 작업을 넣지 않고 그 결과를 함께 받음
+        """
+        model = model or LLM_CONFIG['ollama']['model']
+
+        def run():
+            response = self.gateway.generate('ollama', prompt, system=system, model=model,
+                                             keep_alive=self.keep_alive_for(model), **options)
+            self._record_load(model, response.load_time)
+            return response
+        # keep_alive는 스케줄러가 모델별로 정하는 값이라 키에 넣지 않음
+        # 우선순위는 키에 넣어, 대화형 요청이 큐 뒤쪽의 같은 배치 작업을 기다리지 않게 함
+        key = flight_key('ollama', model, system, prompt, options, priority)
+        return self.flights.do(key, lambda: self._wait(self.submit(run, priority)))
+
+    def stream(self, prompt: str, system: str = None, model: str = None, priority: str = 'interactive',
+               **options) -> Iterator[str]:
+        """큐를 거쳐 실행하는 스트리밍 생성 - 작업 스레드가 만든 조각을 호출 스레드에서 yield"""
+        model = model or LLM_CONFIG['ollama']['model']
+        chunks: queue.Queue = queue.Queue()
+        finished = object()
+        closed = threading.Event()
+
+        def run():
+            try:
+                if closed.is_set():
+                    return
+                for text in self.gateway.stream('ollama', prompt, system=system, model=model,
+                                                keep_alive=self.keep_alive_for(model), **options):
+                    if closed.is_set():
+                        break
+                    chunks.put(text)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(finished)
+
+        future = self.submit(run, priority)
+        try:
+            started = time.perf_counter()
+            while True:
+                try:
+                    item = chunks.get(timeout=max(0.0, self.queue_timeout - (time.perf_counter() - started)))
+                except queue.Empty:
+                    raise LLMError('ollama', f'scheduler queue timeout after {self.queue_timeout:.0f}s')
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                started = time.perf_counter()
+                yield item
+        finally:
+            # 클라이언트가 끊으면 작업 스레드도 다음 조각에서 멈춤
+            closed.set()
+            future.cancel()
+
+    def warm(self, models: List[str] = None) -> List[Future]:
+        """모델을 미리 메모리에 올림 (빈 messages로 chat을 호출하면 로드만 수행)"""
+        def load(model: str):
+            started = time.perf_counter()
+            self.gateway.client('ollama').chat(model=model, messages=[], keep_alive=self.keep_alive_for(model))
+            self._record_load(model, time.perf_counter() - started)
+        return [self.submit(lambda model=model: load(model), 'batch') for model in (models or sorted(self.pinned))]
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            waits = {name: sorted(values) for name, values in self.waits.items()}
+            loads = {model: dict(stats) for model, stats in self.loads.items()}
+            summary = {
+                'workers': self.workers,
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'queue_depth': dict(self.depth),
+                'keep_alive': self.keep_alive,
+                'pinned': sorted(self.pinned),
+            }
+        percentile = lambda ordered, q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else 0.0
+        summary['wait_time'] = {
+            name: {'p50': percentile(ordered, 0.5), 'p95': percentile(ordered, 0.95), 'max': round(ordered[-1], 3) if ordered else 0.0}
+            for name, ordered in waits.items()
+        }
+        for stats in loads.values():
+            total = stats.pop('load_time_total')
+            stats['avg_load_time'] = round(total / stats['calls'], 3) if stats['calls'] else 0.0
+            stats['max_load_time'] = round(stats['max_load_time'], 3)
+            stats['last_load_time'] = round(stats['last_load_time'], 3)
+        summary['models'] = loads
+        summary['single_flight'] = self.flights.stats()
+        return summary
+
+
+# 프로세스 전역에서 공유하는 기본 Ollama 스케줄러
+ollama_scheduler = OllamaScheduler()
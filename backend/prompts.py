@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+프롬프트 템플릿 레지스트리
+글 생성/분석 프롬프트 템플릿을 시작할 때 한 번만 컴파일해 모든 서비스(main, Ollama, OpenAI)가 공유
+고정된 지시문을 앞에, 바뀌는 입력은 항상 맨 뒤에 두어(prefix-stable) 제공자 측 프롬프트 캐시와
+Ollama 컨텍스트 재사용이 앞부분을 그대로 적중할 수 있게 함
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROMPT_TEMPLATES_FILE = os.getenv('PROMPT_TEMPLATES_FILE', '')  # 템플릿을 덮어쓰거나 추가하는 JSON 파일
+DEFAULT_SYSTEM = "당신은 전문 콘텐츠 작가입니다."
+DEFAULT_TEMPLATE = 'default'
+DEFAULT_LOCALE = 'ko'
+
+# 이름 -> 지시문, 입력 필드(표시 이름, 키), 별칭 (서비스마다 다르게 부르던 이름), 언어별 변형
+# 변형이 없는 언어로 요청하면 그 언어의 default 템플릿을 사용
+CONTENT_TEMPLATES = {
+    'blog_post_intro': {
+        'instructions': "블로그 포스트 도입부를 작성해주세요.\n"
+                        "독자의 관심을 끌고, 이 글을 읽어야 하는 이유와 무엇을 다룰지 명확히 전달하세요.",
+        'fields': [['내용', 'content']],
+        'aliases': ['blog-intro', 'blog_intro'],
+        'variants': {
+            'en': {'system': "You are a professional blogger.",
+                   'instructions': "Write an engaging blog post introduction based on the following content.",
+                   'fields': [['Content', 'content']]},
+        },
+    },
+    'product_description': {
+        'instructions': "제품 설명을 작성해주세요.\n특징, 장점, 사용 사례를 포함하여 구매욕구를 자극하세요.",
+        'fields': [['제품 정보', 'content']],
+        'aliases': ['product-description'],
+        'variants': {
+            'en': {'system': "You are a marketing expert.",
+                   'instructions': "Write a compelling product description based on the following product details.",
+                   'fields': [['Product details', 'content']]},
+        },
+    },
+    'social_media_post': {
+        'instructions': "소셜 미디어 포스트를 작성해주세요.\n짧고 임팩트 있게, 해시태그 3-5개 포함하세요.",
+        'fields': [['내용', 'content']],
+        'aliases': ['social_media', 'social-media'],
+        'variants': {
+            'en': {'system': "You are a social media manager.",
+                   'instructions': "Write a short and catchy social media post based on the following content.",
+                   'fields': [['Content', 'content']]},
+        },
+    },
+    'how_to_guide': {
+        'instructions': "하우투 가이드를 작성해주세요.\n단계별로 명확하게 구분하고, 초보자도 따라할 수 있도록 설명하세요.",
+        'fields': [['주제', 'content']],
+        'aliases': ['how-to', 'how_to'],
+    },
+    'listicle': {
+        'instructions': "리스티클(목록형 글)을 작성해주세요.\n5-10개 항목으로 구성하고, 각 항목마다 설명을 추가하세요.",
+        'fields': [['주제', 'content']],
+    },
+    'review': {
+        'instructions': "리뷰를 작성해주세요.\n개요, 장점, 단점, 추천 대상, 총평을 포함하세요.",
+        'fields': [['대상', 'content']],
+        'aliases': ['product-review', 'product_review'],
+    },
+    DEFAULT_TEMPLATE: {
+        'instructions': "다음 내용으로 글을 작성해주세요.",
+        'fields': [['내용', 'content']],
+        'variants': {
+            'en': {'system': "You are a helpful assistant.",
+                   'instructions': "Generate text based on the following content.",
+                   'fields': [['Content', 'content']]},
+        },
+    },
+}
+
+# JSON 결과를 받는 분석 프롬프트 (시스템 프롬프트 없음, 응답 캐시 키에 템플릿 ID가 들어감)
+ANALYSIS_TEMPLATES = {
+    'seo_analysis': {
+        'system': None,
+        'instructions': "다음 블로그 콘텐츠에 대한 SEO 분석을 수행하고, 100점 만점의 점수와 구체적인 개선 제안 목록을 "
+                        "제공해주세요. 점수는 'score' 키에, 제안 목록은 'suggestions' 키에 담아 JSON 형식으로 반환해주세요.",
+        'fields': [['콘텐츠', 'content']],
+    },
+    'hashtags': {
+        'system': None,
+        'instructions': "다음 콘텐츠에 가장 적합한 해시태그 목록을 생성해주세요. "
+                        "결과는 JSON 형식의 리스트로, 각 해시태그는 '#'으로 시작해야 합니다.",
+        'fields': [['콘텐츠', 'content']],
+    },
+    'readability': {
+        'system': None,
+        'instructions': "다음 텍스트의 가독성을 분석해주세요. 100점 만점의 'score', 가독성 수준을 나타내는 "
+                        "'level' (예: 초급, 중급, 고급), 그리고 개선 제안 목록인 'suggestions'를 포함한 "
+                        "JSON 형식으로 결과를 반환해주세요.",
+        'fields': [['텍스트', 'content']],
+    },
+    'meta_tags': {
+        'system': None,
+        'instructions': "다음 블로그 제목과 내용을 바탕으로 SEO에 최적화된 title (50자 이내)과 meta description "
+                        "(150자 이내)을 생성해주세요. 결과는 'title'과 'description' 키를 가진 JSON 형식으로 반환해주세요.",
+        'fields': [['제목', 'title'], ['내용', 'content']],
+    },
+    'fact_check': {
+        'system': None,
+        'instructions': "다음 텍스트의 주요 주장들을 식별하고, 각 주장에 대한 팩트체크를 수행해주세요. "
+                        "각 주장에 대해 '검증됨', '검증 필요', '오류' 중 하나의 상태와 함께 간단한 설명을 제공해주세요. "
+                        "결과를 JSON 형식의 리스트로 반환해주세요. 각 항목은 'claim', 'status', 'explanation' 키를 "
+                        "가져야 합니다.",
+        'fields': [['텍스트', 'content']],
+    },
+}
+
+
+class PromptTemplate:
+    """컴파일된 템플릿 - 고정 부분(시스템 프롬프트, 지시문)은 미리 만들어 두고 입력만 뒤에 이어 붙임"""
+
+    def __init__(self, name: str, instructions: str, fields: Sequence[Sequence[str]] = (('내용', 'content'),),
+                 system: Optional[str] = DEFAULT_SYSTEM, locale: str = DEFAULT_LOCALE):
+        self.name = name
+        self.locale = locale
+        self.system = system
+        self.fields = [field for _, field in fields]
+        self.prefix = instructions.strip() + '\n\n'
+        self._labels = [(f"{label}: ", field) for label, field in fields]
+        # 렌더링 결과를 결정하는 내용으로만 만든 해시 - 템플릿 문구가 바뀌면 ID도 바뀜
+        digest = hashlib.sha256(json.dumps([system, self.prefix, list(map(list, fields))],
+                                           ensure_ascii=False).encode('utf-8')).hexdigest()
+        self.version = digest[:12]
+        self.id = f"{name}.{locale}@{self.version}"
+
+    def render(self, **inputs) -> str:
+        """사용자 프롬프트 (지시문 다음에 입력 필드를 정해진 순서로)"""
+        return self.prefix + '\n'.join(label + str(inputs[field]) for label, field in self._labels)
+
+    def messages(self, **inputs) -> Tuple[str, Optional[str]]:
+        """(프롬프트, 시스템 프롬프트)"""
+        return self.render(**inputs), self.system
+
+    def to_dict(self) -> Dict:
+        return {'id': self.id, 'name': self.name, 'locale': self.locale, 'fields': self.fields}
+
+
+class PromptRegistry:
+    """(이름/별칭, 언어) -> 컴파일된 템플릿"""
+
+    def __init__(self, specs: Dict[str, Dict] = None, default: str = DEFAULT_TEMPLATE):
+        self.templates: Dict[Tuple[str, str], PromptTemplate] = {}
+        self.aliases: Dict[str, str] = {}
+        self.default = default
+        for name, spec in (specs or {}).items():
+            self.register(name, spec)
+
+    def _compile(self, name: str, spec: Dict, locale: str) -> PromptTemplate:
+        template = PromptTemplate(name, spec['instructions'], spec.get('fields', (('내용', 'content'),)),
+                                  spec.get('system', DEFAULT_SYSTEM), locale)
+        self.templates[(name, locale)] = template
+        return template
+
+    def register(self, name: str, spec: Dict) -> PromptTemplate:
+        template = self._compile(name, spec, spec.get('locale', DEFAULT_LOCALE))
+        for locale, variant in spec.get('variants', {}).items():
+            self._compile(name, variant, locale)
+        for alias in spec.get('aliases', []):
+            self.aliases[alias] = name
+        return template
+
+    def load(self, path: str):
+        """JSON 파일의 템플릿으로 덮어쓰거나 추가 (형식은 CONTENT_TEMPLATES와 같음)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                specs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"프롬프트 템플릿 파일을 읽지 못했습니다 ({path}): {e}")
+            return
+        for name, spec in specs.items():
+            try:
+                self.register(name, spec)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"프롬프트 템플릿 '{name}'을(를) 건너뜁니다: {e}")
+
+    def get(self, name: str, locale: str = DEFAULT_LOCALE, fallback: Optional[str] = None) -> PromptTemplate:
+        """이름이나 별칭으로 찾고, 없거나 그 언어의 변형이 없으면 fallback(기본: default) 템플릿"""
+        name = self.aliases.get(name, name)
+        fallback = self.aliases.get(fallback, fallback) if fallback else self.default
+        for candidate in ((name, locale), (fallback, locale), (name, DEFAULT_LOCALE), (fallback, DEFAULT_LOCALE)):
+            if candidate in self.templates:
+                return self.templates[candidate]
+        return self.templates[(self.default, DEFAULT_LOCALE)]
+
+    def render(self, name: str, locale: str = DEFAULT_LOCALE, fallback: Optional[str] = None,
+               **inputs) -> Tuple[str, Optional[str]]:
+        """(프롬프트, 시스템 프롬프트)"""
+        return self.get(name, locale, fallback).messages(**inputs)
+
+    def catalog(self) -> List[Dict]:
+        aliases: Dict[str, List[str]] = {}
+        for alias, name in self.aliases.items():
+            aliases.setdefault(name, []).append(alias)
+        return [dict(template.to_dict(), aliases=sorted(aliases.get(name, [])))
+                for (name, _), template in self.templates.items()]
+
+
+def build_registry() -> PromptRegistry:
+    registry = PromptRegistry(CONTENT_TEMPLATES)
+    for name, spec in ANALYSIS_TEMPLATES.items():
+        registry.register(name, spec)
+    if PROMPT_TEMPLATES_FILE:
+        registry.load(PROMPT_TEMPLATES_FILE)
+    return registry
+
+
+# 프로세스 전역에서 공유하는 기본 프롬프트 레지스트리 (import 시점에 한 번 컴파일)
+prompt_registry = build_registry()
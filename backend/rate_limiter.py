@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+호스트별 요청 속도 제한기
+토큰 버킷 + 버스트 허용량 + 429/Retry-After 대응
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# 호스트별 (초당 요청 수, 버스트 허용량)
+DEFAULT_HOST_LIMITS = {
+    'www.reddit.com': (0.5, 4),        # 비인증 요청은 분당 약 30회
+    'hn.algolia.com': (2.5, 5),        # 시간당 10,000회
+    'export.arxiv.org': (1 / 3, 1),    # arXiv 권장: 3초에 1회
+    'news.google.com': (2.0, 5),
+}
+DEFAULT_LIMIT = (2.0, 5)
+
+# Retry-After 없이 429를 받은 경우의 대기 시간 (연속 실패 시 두 배씩 증가)
+DEFAULT_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+
+
+class TokenBucket:
+    """토큰 버킷 - 예약한 만큼 대기 시간을 돌려줌"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = DEFAULT_BACKOFF
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.waited = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용 가능해질 때까지 기다려야 할 시간(초)을 반환"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            ready_at = max(now, self.updated)
+            if self.tokens < 1:
+                ready_at += (1 - self.tokens) / self.rate
+            self.tokens -= 1
+            wait = ready_at - now
+            self.requests += 1
+            self.waited += wait
+            return wait
+
+    def penalize(self, delay: Optional[float]):
+        """원격 호스트가 제한을 알려오면 해당 시간 동안 버킷을 비움"""
+        with self.lock:
+            if delay is None:
+                delay = self.backoff
+                self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + delay)
+            self.tokens = 0.0
+            self.updated = max(self.updated, self.blocked_until)
+            self.throttled += 1
+
+    def reset_backoff(self):
+        with self.lock:
+            self.backoff = DEFAULT_BACKOFF
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """호스트별 토큰 버킷 모음"""
+
+    def __init__(self, host_limits: Dict[str, Tuple[float, int]] = None,
+                 default_limit: Tuple[float, int] = DEFAULT_LIMIT):
+        self.host_limits = {**DEFAULT_HOST_LIMITS, **(host_limits or {})}
+        self.default_limit = default_limit
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).hostname or url
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.host_limits.get(host, self.default_limit)
+                self.buckets[host] = TokenBucket(rate, burst)
+            return self.buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """요청 전에 호출 - 필요한 만큼만 현재 스레드에서 대기"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """acquire의 비동기 버전 - 이벤트 루프를 막지 않음"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, url: str, status: int, headers=None) -> bool:
+        """응답 상태를 기록하고, 제한에 걸렸으면 True 반환"""
+        bucket = self.bucket(url)
+        if status in (429, 503):
+            retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+            if status == 429 or retry_after is not None:
+                bucket.penalize(retry_after)
+                return True
+        elif status < 400:
+            bucket.reset_backoff()
+        return False
+
+    def stats(self) -> Dict:
+        """호스트별 요청 수, 누적 대기 시간, 제한 횟수"""
+        with self.lock:
+            buckets = dict(self.buckets)
+        return {
+            host: {
+                'rate': bucket.rate,
+                'burst': bucket.burst,
+                'requests': bucket.requests,
+                'waited': round(bucket.waited, 3),
+                'throttled': bucket.throttled,
+            }
+            for host, bucket in buckets.items()
+        }
+
+
+# 프로세스 전역에서 공유하는 기본 제한기
+rate_limiter = RateLimiter()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+뉴스 관련성 배치 채점 엔진
+전체 배치를 하나의 문자열로 이어 붙여 키워드를 한 번에 찾고, 가중치는 NumPy 배열 연산으로 계산
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import ahocorasick  # pyahocorasick (선택) - 모든 키워드를 한 번의 스캔으로 매칭
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+DEFAULT_KEYWORDS = ['ai', 'artificial intelligence', 'machine learning', 'deep learning',
+                    'gpt', 'claude', 'gemini', 'llm', 'neural network', 'automation']
+
+DEFAULT_SOURCE_WEIGHTS = {
+    'openai': 1.5,
+    'anthropic': 1.5,
+    'google_ai': 1.3,
+    'reddit_ai': 1.0,
+    'hackernews': 1.2
+}
+
+# (최대 경과 일수, 배율) - 위에서부터 처음 맞는 구간 적용
+DEFAULT_RECENCY_WEIGHTS = [(0, 2.0), (1, 1.5), (3, 1.2)]
+# (최소 인기 점수 초과, 배율)
+DEFAULT_POPULARITY_WEIGHTS = [(100, 1.5), (50, 1.2)]
+
+_SEPARATOR = '\x00'  # 키워드에 나올 수 없는 구분자 - 항목 경계를 넘는 매칭 방지
+
+
+class RelevanceScorer:
+    """키워드/가중치를 설정할 수 있는 배치 관련성 채점기"""
+
+    def __init__(self, keywords: List[str] = None, title_weight: float = 2.0, summary_weight: float = 1.0,
+                 source_weights: Dict[str, float] = None, recency_weights: List = None,
+                 popularity_weights: List = None, max_score: float = 10.0):
+        self.keywords = [keyword.lower() for keyword in (keywords or DEFAULT_KEYWORDS)]
+        self.title_weight = title_weight
+        self.summary_weight = summary_weight
+        self.source_weights = DEFAULT_SOURCE_WEIGHTS if source_weights is None else source_weights
+        self.recency_weights = DEFAULT_RECENCY_WEIGHTS if recency_weights is None else recency_weights
+        self.popularity_weights = DEFAULT_POPULARITY_WEIGHTS if popularity_weights is None else popularity_weights
+        self.max_score = max_score
+        self._compile()
+
+    def _compile(self):
+        ordered = list(dict.fromkeys(self.keywords))
+        self.keyword_index = {keyword: index for index, keyword in enumerate(ordered)}
+        if AHOCORASICK_AVAILABLE:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, index in self.keyword_index.items():
+                self.automaton.add_word(keyword, index)
+            self.automaton.make_automaton()
+        else:
+            # 대체 경로: 키워드별 리터럴 패턴 (C 수준의 부분 문자열 검색)
+            self.automaton = None
+            self.patterns = [re.compile(re.escape(keyword)) for keyword in ordered]
+
+    def _matches(self, corpus: str):
+        """(매칭 시작 위치, 키워드 번호) 목록"""
+        positions, keywords = [], []
+        if self.automaton is not None:
+            for end, index in self.automaton.iter(corpus):
+                positions.append(end)
+                keywords.append(index)
+        else:
+            for index, pattern in enumerate(self.patterns):
+                for match in pattern.finditer(corpus):
+                    positions.append(match.start())
+                    keywords.append(index)
+        return positions, keywords
+
+    def _keyword_hits(self, texts: List[str]) -> np.ndarray:
+        """항목별 키워드 포함 여부 행렬 (항목 수 × 키워드 수)"""
+        hits = np.zeros((len(texts), len(self.keyword_index)), dtype=bool)
+        if not texts:
+            return hits
+        texts = [text.lower() for text in texts]  # 소문자 변환으로 길이가 바뀌는 문자가 있으므로 먼저 변환
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        positions, keywords = self._matches(_SEPARATOR.join(texts))
+        if positions:
+            rows = np.searchsorted(starts, np.asarray(positions), side='right') - 1
+            hits[rows, np.asarray(keywords)] = True
+        return hits
+
+    def _tiers(self, values: np.ndarray, tiers: List, upper: bool) -> np.ndarray:
+        if not tiers:
+            return np.ones(len(values))
+        if upper:
+            conditions = [values <= bound for bound, _ in tiers]
+        else:
+            conditions = [values > bound for bound, _ in tiers]
+        return np.select(conditions, [weight for _, weight in tiers], default=1.0)
+
+    def score(self, items: List[Dict], now: Optional[datetime] = None) -> np.ndarray:
+        """여러 항목의 관련성 점수를 한 번에 계산 (0 ~ max_score)"""
+        count = len(items)
+        if count == 0:
+            return np.zeros(0)
+        now = now or datetime.now()
+
+        title_hits = self._keyword_hits([item.get('title', '') for item in items])
+        summary_hits = self._keyword_hits([item.get('summary', '') or '' for item in items])
+        scores = title_hits.sum(axis=1) * self.title_weight + summary_hits.sum(axis=1) * self.summary_weight
+
+        # 소스별 가중치
+        scores = scores * np.fromiter((self.source_weights.get(item.get('source_id'), 1.0) for item in items),
+                                      dtype=float, count=count)
+
+        # 최근성 가중치 (경과 일수 기준)
+        age_days = np.fromiter(((now - item['published_date']).days for item in items), dtype=float, count=count)
+        recency = self._tiers(age_days, self.recency_weights, upper=True)
+        if self.recency_weights:
+            # 발행일이 미래인 항목은 가장 낮은 최근성 구간으로 취급 (기존 동작 유지)
+            recency = np.where(age_days < 0, self.recency_weights[-1][1], recency)
+        scores = scores * recency
+
+        # 인기도 (있는 경우)
+        popularity = np.fromiter((item.get('score', np.nan) if 'score' in item else np.nan for item in items),
+                                 dtype=float, count=count)
+        has_popularity = ~np.isnan(popularity)
+        popularity_weight = self._tiers(np.nan_to_num(popularity), self.popularity_weights, upper=False)
+        scores = scores * np.where(has_popularity, popularity_weight, 1.0)
+
+        return np.minimum(scores, self.max_score)
+
+
+def top_k(items: List[Dict], scores: np.ndarray, k: int) -> List[Dict]:
+    """전체 정렬 없이 점수 상위 k개 선택 (동점이면 원래 순서 유지)"""
+    count = len(items)
+    if count == 0 or k <= 0:
+        return []
+    scores = np.asarray(scores, dtype=float)
+    if k < count:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        # 경계 점수와 같은 항목은 원래 순서가 앞선 것을 우선하도록 보정
+        threshold = scores[candidates].min()
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.concatenate((above, ties))
+    else:
+        candidates = np.arange(count)
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [items[index] for index in order]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+다중 출처 리서치 도우미
+여러 페이지를 동시에 가져와 문단을 나누고, 검색어와의 관련도로 순위를 매겨 토큰 예산 안에서 고름
+"""
+
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_SENTENCE_RE = re.compile(r'(?<=[.!?。])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (영문은 4글자, 한글 등 비ASCII는 1.5글자당 1토큰)"""
+    if not text:
+        return 0
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def split_passages(paragraphs: List[str], max_chars: int = 800, min_chars: int = 40) -> List[str]:
+    """문단을 검색 단위 구절로 나눔 (긴 문단은 문장 경계에서 자르고, 너무 짧은 것은 버림)"""
+    passages = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_chars:
+            if len(paragraph) >= min_chars:
+                passages.append(paragraph)
+            continue
+        current = ''
+        for sentence in _SENTENCE_RE.split(paragraph):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                passages.append(current)
+                current = ''
+            current = f"{current} {sentence}".strip() if current else sentence[:max_chars]
+        if len(current) >= min_chars:
+            passages.append(current)
+    return passages
+
+
+def _terms(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if len(token) > 1]
+
+
+def rank_passages(query: str, sources: List[Tuple[str, List[str]]]) -> List[Dict]:
+    """(url, 구절 목록) 묶음을 받아 관련도 내림차순 [{url, text, score, position}] 반환
+
+    검색어 단어별로 구절 포함 여부를 IDF로 가중하고(한국어 어미 변화를 고려해 부분 문자열 일치),
+    같은 점수면 페이지 앞쪽 구절을 우선
+    """
+    candidates = [
+        {'url': url, 'text': text, 'position': position, 'lower': text.lower()}
+        for url, passages in sources
+        for position, text in enumerate(passages)
+    ]
+    terms = list(dict.fromkeys(_terms(query)))
+    if not candidates:
+        return []
+
+    total = len(candidates)
+    weights = {}
+    for term in terms:
+        containing = sum(1 for candidate in candidates if term in candidate['lower'])
+        weights[term] = math.log(1 + (total - containing + 0.5) / (containing + 0.5))
+
+    for candidate in candidates:
+        lower = candidate.pop('lower')
+        score = sum(weight * (1 + math.log(lower.count(term))) for term, weight in weights.items()
+                    if term in lower)
+        # 앞쪽 문단일수록 본문 핵심일 가능성이 높음
+        candidate['score'] = round(score / (1 + 0.05 * candidate['position']), 4)
+
+    return sorted(candidates, key=lambda candidate: (-candidate['score'], candidate['position']))
+
+
+def select_passages(ranked: List[Dict], token_budget: int) -> List[Dict]:
+    """토큰 예산 안에서 구절 선택 - 출처마다 가장 좋은 구절을 먼저 넣어 여러 출처를 담음"""
+    selected, used, chosen = [], 0, set()
+    firsts, seen_urls = [], set()
+    for index, passage in enumerate(ranked):
+        if passage['url'] not in seen_urls:
+            seen_urls.add(passage['url'])
+            firsts.append(index)
+
+    for index in firsts + list(range(len(ranked))):
+        if index in chosen:
+            continue
+        passage = ranked[index]
+        cost = estimate_tokens(passage['text'])
+        if used + cost > token_budget:
+            continue
+        chosen.add(index)
+        selected.append(passage)
+        used += cost
+    return selected
+
+
+def format_passages(selected: List[Dict], urls: List[str]) -> str:
+    """출처 번호를 붙여 출처 순서대로 묶은 요약 입력 텍스트"""
+    blocks = []
+    for number, url in enumerate(urls, 1):
+        texts = [passage['text'] for passage in sorted(selected, key=lambda p: p['position'])
+                 if passage['url'] == url]
+        if texts:
+            blocks.append(f"[{number}] {url}\n" + "\n".join(texts))
+    return "\n\n".join(blocks)
+
+
+def fetch_all(urls: List[str], fetch: Callable[[str], object], timeout: float,
+              max_workers: int = 8) -> Tuple[Dict[str, object], Dict[str, str]]:
+    """URL들을 동시에 가져옴 - timeout 안에 끝난 결과와 실패/시간 초과 사유를 반환"""
+    results, errors = {}, {}
+    if not urls:
+        return results, errors
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)), thread_name_prefix='research')
+    started = time.monotonic()
+    try:
+        futures = {executor.submit(fetch, url): url for url in urls}
+        done, pending = wait(futures, timeout=timeout)
+        for future in done:
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                errors[url] = str(e)
+        for future in pending:
+            errors[futures[future]] = f"timeout after {time.monotonic() - started:.1f}s"
+    finally:
+        # 늦게 끝나는 요청은 기다리지 않음 (끝나면 캐시에는 남음)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, errors
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 캐시
+(제공자, 모델, 프롬프트 템플릿, 정규화한 입력)의 해시를 키로 모델 응답 텍스트를 저장
+같은 글을 여러 번 분석 요청해도 모델은 한 번만 호출
+"""
+
+import asyncio
+import os
+import threading
+import unicodedata
+from typing import Callable, Dict, Optional
+
+from cache import get_cache, cache_key, text_hash
+from prompts import PromptTemplate
+
+RESPONSE_CACHE_SIZE = int(os.getenv('LLM_RESPONSE_CACHE_SIZE', '1024'))
+RESPONSE_CACHE_TTL = float(os.getenv('LLM_RESPONSE_CACHE_TTL', str(24 * 3600)))
+RESPONSE_CACHE_PERSIST = os.getenv('LLM_RESPONSE_CACHE_PERSIST', '1') == '1'  # SQLite 영구 저장 여부
+
+
+def normalize_input(value):
+    """편집기에서 다시 보낸 같은 글이 같은 키가 되도록 정규화 (유니코드 NFC, 공백 정리)"""
+    if isinstance(value, str):
+        return ' '.join(unicodedata.normalize('NFC', value).split())
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(item) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize_input(item) for key, item in value.items()}
+    return value
+
+
+class ResponseCache:
+    """내용 주소 기반 응답 캐시 + 엔드포인트별 적중률"""
+
+    def __init__(self, namespace: str = 'llm_responses', maxsize: int = RESPONSE_CACHE_SIZE,
+                 ttl: float = RESPONSE_CACHE_TTL, persistent: bool = RESPONSE_CACHE_PERSIST):
+        self.store = get_cache(namespace, maxsize=maxsize, ttl=ttl, persistent=persistent)
+        self.lock = threading.Lock()
+        self.endpoints: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(provider: str, model: str, template, inputs: Dict) -> str:
+        """template은 프롬프트 문자열이나 레지스트리 템플릿 (템플릿이면 문구 해시가 든 ID로 구분)"""
+        template_key = template.id if isinstance(template, PromptTemplate) else text_hash(template)
+        return cache_key(provider, model, template_key, normalize_input(inputs))
+
+    def _count(self, endpoint: str, hit: bool):
+        with self.lock:
+            counters = self.endpoints.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    def lookup(self, endpoint: str, key: str) -> Optional[str]:
+        text = self.store.get(key)
+        self._count(endpoint, text is not None)
+        return text
+
+    def save(self, key: str, text: str, validate: Callable[[str], bool] = None):
+        # 검증에 실패한 응답(JSON이 아닌 답 등)은 저장하지 않아 다음 요청에서 다시 생성
+        if text and (validate is None or validate(text)):
+            self.store.set(key, text)
+
+    def get_or_generate(self, endpoint: str, provider: str, model: str, template, inputs: Dict,
+                        generate: Callable[[], str], validate: Callable[[str], bool] = None) -> str:
+        key = self.key(provider, model, template, inputs)
+        text = self.lookup(endpoint, key)
+        if text is None:
+            text = generate()
+            self.save(key, text, validate)
+        return text
+
+    async def get_or_generate_async(self, endpoint: str, provider: str, model: str, template,
+                                    inputs: Dict, generate, validate: Callable[[str], bool] = None) -> str:
+        """generate는 텍스트를 반환하는 코루틴 함수
+
+        저장소 조회/저장(SQLite)은 작업 스레드에서 실행해 이벤트 루프를 막지 않음
+        """
+        key = self.key(provider, model, template, inputs)
+        text = await asyncio.to_thread(self.lookup, endpoint, key)
+        if text is None:
+            text = await generate()
+            await asyncio.to_thread(self.save, key, text, validate)
+        return text
+
+    def stats(self) -> Dict:
+        with self.lock:
+            endpoints = {name: dict(counters) for name, counters in self.endpoints.items()}
+        for counters in endpoints.values():
+            total = counters['hits'] + counters['misses']
+            counters['hit_rate'] = round(counters['hits'] / total, 3) if total else 0.0
+        return {'endpoints': endpoints, 'store': self.store.stats()}
+
+
+# 프로세스 전역에서 공유하는 기본 응답 캐시
+response_cache = ResponseCache()
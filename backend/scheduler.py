@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+백그라운드 크롤링 스케줄러
+설정된 키워드/소스를 주기적으로 크롤링하고, (소스, 키워드)별 워터마크 이후 항목만 처리
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+import crud
+from database import SessionLocal
+
+DEFAULT_INTERVAL_MINUTES = 60
+DEFAULT_JITTER_RATIO = 0.1  # 주기의 ±10% 범위에서 실행 시각을 흩뜨림
+
+
+class CrawlScheduler:
+    """주기 실행 + 겹침 방지 + 상태 조회를 제공하는 크롤링 스케줄러"""
+
+    def __init__(self, crawler, get_config: Callable[[], Dict], session_factory=SessionLocal):
+        self.crawler = crawler
+        self.get_config = get_config
+        self.session_factory = session_factory
+        self.run_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.next_run_at: Optional[float] = None
+        self.state = {
+            'runs': 0,
+            'failures': 0,
+            'skipped_overlaps': 0,
+            'last_started_at': None,
+            'last_finished_at': None,
+            'last_result': None,
+            'last_error': None,
+        }
+
+    def _interval(self, config: Dict) -> float:
+        interval = float(config.get('interval_minutes', DEFAULT_INTERVAL_MINUTES)) * 60
+        jitter = interval * float(config.get('jitter_ratio', DEFAULT_JITTER_RATIO))
+        return max(60.0, interval + random.uniform(-jitter, jitter))
+
+    def _load_watermarks(self) -> Dict:
+        db = self.session_factory()
+        try:
+            return crud.get_crawl_watermarks(db)
+        finally:
+            db.close()
+
+    def _save_watermarks(self, watermarks: Dict):
+        db = self.session_factory()
+        try:
+            crud.set_crawl_watermarks(db, watermarks)
+        finally:
+            db.close()
+
+    def run_once(self) -> Optional[Dict]:
+        """한 번 크롤링 - 이미 실행 중이면 건너뛰고 None 반환"""
+        if not self.run_lock.acquire(blocking=False):
+            self.state['skipped_overlaps'] += 1
+            return None
+        try:
+            config = self.get_config()
+            keywords = config.get('keywords', [])
+            sources = config.get('sources', [])
+            self.state['last_started_at'] = datetime.now(timezone.utc).isoformat()
+
+            watermarks = self._load_watermarks()
+            updated = {}
+            items = []
+            summary = {}
+            for frame in self.crawler.iter_crawl(keywords, sources, deadline=config.get('deadline'),
+                                                 watermarks=watermarks):
+                if frame['type'] == 'batch':
+                    items.extend(frame['items'])
+                    if frame['watermark'] is not None:
+                        key = (frame['source'], frame['keyword'])
+                        updated[key] = max(frame['watermark'], updated.get(key, 0), watermarks.get(key) or 0)
+                else:
+                    summary = frame
+
+            stored = self.crawler.save_items(items)
+            # 저장에 성공한 뒤에만 워터마크를 전진시켜, 실패한 구간은 다음 실행에서 다시 가져옴
+            if updated and (stored or not items):
+                self._save_watermarks(updated)
+
+            self.state['runs'] += 1
+            self.state['last_error'] = None
+            self.state['last_result'] = {
+                'status': summary.get('status'),
+                'new_items': len(items),
+                'stored_items': stored,
+                'total_stories': summary.get('total_stories'),
+                'elapsed': summary.get('elapsed'),
+                'feed_cache': summary.get('feed_cache'),
+            }
+            return self.state['last_result']
+        except Exception as e:
+            self.state['failures'] += 1
+            self.state['last_error'] = str(e)
+            print(f"예약 크롤링 오류: {e}")
+            return None
+        finally:
+            self.state['last_finished_at'] = datetime.now(timezone.utc).isoformat()
+            self.run_lock.release()
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            config = self.get_config()
+            delay = self._interval(config)
+            self.next_run_at = time.time() + delay
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+            if self.stop_event.is_set():
+                break
+            self.run_once()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='crawl-scheduler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def trigger(self) -> bool:
+        """다음 주기를 기다리지 않고 바로 실행 (이미 실행 중이면 False)"""
+        if self.run_lock.locked():
+            self.state['skipped_overlaps'] += 1
+            return False
+        if self.thread and self.thread.is_alive():
+            self.wake_event.set()
+        else:
+            threading.Thread(target=self.run_once, name='crawl-manual', daemon=True).start()
+        return True
+
+    def status(self) -> Dict:
+        db = self.session_factory()
+        try:
+            watermarks = crud.get_crawl_watermarks(db)
+        finally:
+            db.close()
+        return {
+            'scheduler_running': bool(self.thread and self.thread.is_alive()),
+            'crawl_running': self.run_lock.locked(),
+            'next_run_at': datetime.fromtimestamp(self.next_run_at, timezone.utc).isoformat()
+            if self.next_run_at else None,
+            'config': self.get_config(),
+            **self.state,
+            'watermarks': [
+                {
+                    'source': source,
+                    'keyword': keyword,
+                    'published_at': datetime.fromtimestamp(published_ts, timezone.utc).isoformat()
+                    if published_ts else None,
+                }
+                for (source, keyword), published_ts in sorted(watermarks.items())
+            ],
+        }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
 # --- Post Schemas ---
@@ -145,9 +145,101 @@ class Insight(InsightBase):
     class Config:
         from_attributes = True
 
+# --- News Schemas ---
+class NewsItem(BaseModel):
+    id: int
+    url_hash: str
+    title: str
+    link: str
+    source: str
+    keyword: Optional[str] = None
+    summary: Optional[str] = None
+    published: Optional[str] = None
+    extra: Optional[dict] = None
+    collected_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# --- Post Analysis Schemas ---
+class PostAnalysis(BaseModel):
+    id: int
+    post_id: Optional[int] = None
+    content_hash: str
+    analysis: str
+    result: Optional[Any] = None
+    model: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# --- AI Output Schemas (structured_output.parse로 모델 응답 검증) ---
+class SEOAnalysis(BaseModel):
+    score: float
+    suggestions: List[str]
+
+    class Config:
+        extra = "allow"
+
+class ReadabilityAnalysis(BaseModel):
+    score: float
+    level: str = ""
+    suggestions: List[str]
+
+    class Config:
+        extra = "allow"
+
+class TitleSuggestion(BaseModel):
+    title: str
+
+    class Config:
+        extra = "allow"
+
+class TitleSuggestions(BaseModel):
+    titles: List[TitleSuggestion]
+
+class MetaTags(BaseModel):
+    title: str
+    description: str
+
+class FactCheckResult(BaseModel):
+    claim: str
+    status: str
+    explanation: str = ""
+
+class YouTubeAnalysis(BaseModel):
+    summary: str = ""
+    keywords: List[str] = []
+    blog_suggestions: Any = ""
+    timestamps: List[Any] = []
+
 # --- Request Schemas ---
 class ResearchRequest(BaseModel):
     query: str
+    refresh: bool = False  # True면 캐시를 건너뛰고 검색/수집/요약을 다시 수행
+    num_results: int = 1  # 2 이상이면 상위 N개 페이지를 동시에 가져와 함께 요약
+    page_timeout: float = 8.0  # 페이지별 수집 제한 시간 (초)
+    token_budget: int = 1500  # 요약 입력에 넣을 구절의 최대 토큰 수
+
+class BatchContent(BaseModel):
+    title: str = ""
+    content: str
+
+class BatchAnalysisRequest(BaseModel):
+    post_ids: List[int] = []
+    contents: List[BatchContent] = []  # DB에 없는 글을 직접 보낼 때
+    analyses: List[str] = ["seo", "readability", "hashtags", "meta_tags"]
+    batch_size: int = 8  # 한 프롬프트에 묶는 최대 글 수
+    concurrency: int = 4  # 동시에 실행하는 묶음 수
+
+class FanoutRequest(BaseModel):
+    prompt: str
+    system: Optional[str] = None
+    mode: str = "first"  # first, all, quorum
+    models: List[str] = []  # "provider:model" 목록, 비우면 FANOUT_MODELS
+    deadline: Optional[float] = None  # 초, 비우면 FANOUT_DEADLINE
+    quorum: Optional[int] = None  # quorum 모드에서 같은 답이 모여야 하는 수 (기본: 과반)
 
 class TemplateRequest(BaseModel):
     template: str
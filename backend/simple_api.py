@@ -4,14 +4,17 @@ AI 블로그 백엔드 - 간단한 FastAPI 버전
 빠른 테스트를 위한 최소 구현
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 import json
 import random
 from datetime import datetime
-import ollama
+from llm_gateway import gateway, LLMError
+from fanout import fanout, MODES as FANOUT_MODES
+from ollama_scheduler import ollama_scheduler
+from prompts import prompt_registry
 
 app = FastAPI(title="AI Auto Blog Simple API", version="1.0.0")
 
@@ -61,20 +64,11 @@ dummy_posts = [
     }
 ]
 
-def call_ollama(prompt: str, system_prompt: str = "") -> str:
-    """Ollama 모델 호출"""
+def call_ollama(prompt: str, system_prompt: str = "", priority: str = "interactive") -> str:
+    """Ollama 모델 호출 (스케줄러 큐를 거침, 일괄 작업은 priority="batch")"""
     try:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        response = ollama.chat(
-            model=MODEL_NAME,
-            messages=messages
-        )
-        return response['message']['content']
-    except Exception as e:
+        return ollama_scheduler.generate(prompt, system=system_prompt, model=MODEL_NAME, priority=priority).text
+    except LLMError as e:
         print(f"Ollama 호출 오류: {e}")
         return f"[오류: {e}]"
 
@@ -161,7 +155,7 @@ def change_tone(request: dict):
     
     # Ollama 호출
     prompt = f"다음 텍스트를 {tone} 톤으로 다시 써주세요:\n\n{text}"
-    result = call_ollama(prompt, "당신은 전문 콘텐츠 작가입니다.")
+    result = call_ollama(prompt, "당신은 전문 콘텐츠 작가입니다.", request.get("priority", "interactive"))
     
     return {"status": "success", "changed_text": result}
 
@@ -199,15 +193,9 @@ def generate_template(request: dict):
     template_type = request.get("template", "blog_intro")
     content = request.get("content", "")
     
-    # Ollama 호출
-    prompts = {
-        "blog_intro": f"다음 주제로 블로그 도입부를 작성해주세요: {content}",
-        "product_description": f"다음 제품에 대한 설명을 작성해주세요: {content}",
-        "social_media": f"다음 내용으로 소셜미디어 포스트를 작성해주세요: {content}"
-    }
-    
-    prompt = prompts.get(template_type, f"다음 내용으로 글을 작성해주세요: {content}")
-    result = call_ollama(prompt, "당신은 전문 콘텐츠 작가입니다.")
+    # Ollama 호출 (공유 레지스트리의 컴파일된 템플릿)
+    prompt, system = prompt_registry.render(template_type, content=content)
+    result = call_ollama(prompt, system, request.get("priority", "interactive"))
     
     return {"status": "success", "generated_text": result}
 
@@ -231,6 +219,47 @@ def get_engagement():
         "engagement_rate": round(random.uniform(2, 8), 1)
     }
 
+def _positive(request: dict, name: str, cast):
+    """요청의 선택 숫자 값 -> cast(값) 또는 None (생략 시), 숫자가 아니거나 0 이하면 400"""
+    value = request.get(name)
+    if value is None:
+        return None
+    try:
+        number = cast(value) if not isinstance(value, bool) else 0
+    except (TypeError, ValueError):
+        number = 0
+    if not number > 0:
+        raise HTTPException(status_code=400, detail=f"{name}은(는) 0보다 큰 숫자여야 합니다")
+    return number
+
+@app.post("/api/ai/generate-multi")
+async def generate_multi(request: dict):
+    """여러 모델 동시 생성 (mode: first, all, quorum)"""
+    prompt = request.get("prompt", "")
+    mode = request.get("mode", "first")
+    if not prompt or mode not in FANOUT_MODES:
+        raise HTTPException(status_code=400, detail="prompt와 올바른 mode(first, all, quorum)가 필요합니다")
+    deadline = _positive(request, "deadline", float)
+    quorum = _positive(request, "quorum", int)
+    result = await fanout.generate(prompt, system=request.get("system"), mode=mode,
+                                   targets=request.get("models") or None, deadline=deadline, quorum=quorum)
+    return {"status": "success", **result}
+
+@app.get("/api/ai/metrics")
+def get_llm_metrics():
+    """LLM 호출 지표"""
+    return gateway.metrics()
+
+@app.get("/api/ai/scheduler")
+def get_scheduler_metrics():
+    """Ollama 스케줄러 큐 길이, 대기 시간, 모델 로드 시간"""
+    return ollama_scheduler.metrics()
+
+@app.get("/api/ai/fanout-metrics")
+def get_fanout_metrics():
+    """모델별 동시 생성 지연 시간/비용/승리 횟수"""
+    return fanout.metrics()
+
 # 기타 필요한 엔드포인트들
 @app.get("/api/news")
 def get_news():
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+요청 합치기 (single-flight)
+같은 키의 호출이 이미 진행 중이면 새로 시작하지 않고 그 결과(또는 예외)를 함께 받음
+동기 호출은 스레드끼리, 비동기 호출은 같은 이벤트 루프 안에서 합침
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Awaitable, Callable, Dict
+
+
+def flight_key(*parts) -> str:
+    """호출 인자들로 만든 키 (dict 순서와 무관)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """진행 중인 호출 목록 + 합쳐진 호출 수"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, _Call] = {}
+        self.async_calls: Dict = {}  # (이벤트 루프 id, 키) -> _AsyncCall
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable):
+        """동기 호출 - 먼저 온 스레드가 fn을 실행하고 나머지는 결과를 기다림"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable]):
+        """비동기 호출 - 첫 요청이 만든 작업을 모두가 기다림
+
+        기다리던 요청 하나가 취소되어도(연결 끊김 등) 다른 요청을 위해 작업은 계속 진행하고,
+        모두 취소되면 작업도 취소
+        """
+        loop = asyncio.get_running_loop()
+        flight = (id(loop), key)
+        with self.lock:
+            call = self.async_calls.get(flight)
+            if call is None:
+                call = self.async_calls[flight] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(lambda done: self._forget(flight, done))
+                self.leaders += 1
+            else:
+                self.shared += 1
+            call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self.lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0
+            if abandoned and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, flight, task: asyncio.Task):
+        with self.lock:
+            call = self.async_calls.get(flight)
+            if call is not None and call.task is task:
+                del self.async_calls[flight]
+        # 기다리던 요청이 모두 취소된 경우에도 예외 경고가 남지 않도록 결과를 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            total = self.leaders + self.shared
+            return {
+                'in_flight': len(self.calls) + len(self.async_calls),
+                'leaders': self.leaders,
+                'coalesced': self.shared,
+                'coalesced_rate': round(self.shared / total, 3) if total else 0.0,
+            }
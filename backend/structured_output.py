@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 구조화 파서
+모델 응답(코드 펜스, 앞뒤 설명 문장 포함)에서 첫 번째 균형 잡힌 JSON 값을 한 번의 선형 스캔으로 찾고,
+엔드포인트의 pydantic 스키마로 검증. 스트리밍 조각을 받는 대로 넣을 수도 있음
+"""
+
+import ast
+import json
+import re
+import typing
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+_OPENERS = {'{': '}', '[': ']'}
+_OPEN_RE = {None: re.compile(r'[{\[]'), '{': re.compile(r'\{'), '[': re.compile(r'\[')}
+_STRING_RE = re.compile(r'["\\]')
+_STRUCTURE_RE = re.compile(r'[{}\[\]"]')
+# 여는 괄호 다음 첫 글자가 JSON 값이 될 수 없으면("[참고]" 같은 본문 괄호) 파싱을 시도하지 않음
+_VALUE_START_RE = re.compile(r'[{\[]\s*(?:["\'{\[\]}\-\dtfnTFN]|$)')
+_MISSING = object()
+
+
+class StructuredOutputError(ValueError):
+    """응답에서 JSON을 찾지 못했거나 스키마 검증에 실패"""
+
+
+def _loads(candidate: str):
+    if not _VALUE_START_RE.match(candidate):
+        return _MISSING
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        pass
+    # 모델이 예시를 따라 작은따옴표/True/None 같은 파이썬 표기로 답하는 경우
+    if "'" not in candidate and 'True' not in candidate and 'None' not in candidate and 'False' not in candidate:
+        return _MISSING
+    try:
+        value = ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return _MISSING
+    return value if isinstance(value, (dict, list)) else _MISSING
+
+
+class JSONScanner:
+    """텍스트 조각을 이어 받으며 첫 번째 완결된 JSON 객체/배열을 찾음
+
+    조각마다 새로 들어온 글자만 스캔하고, 열린 후보의 조각만 목록에 모아 두었다가 닫힐 때 한 번 이어 붙임
+    후보가 파싱에 실패하면 그 안에서 처음 열린 괄호부터만 다시 보고(없으면 실패 위치 다음부터 계속)
+    expect가 '{' 또는 '['이면 그 종류의 값만 후보로 삼고, accept가 있으면 그 검사를 통과한 값만 받음
+    """
+
+    def __init__(self, expect: Optional[str] = None, accept: Callable[[object], bool] = None):
+        self.expect = expect
+        self.accept = accept
+        self.chunks: List[str] = []  # 열린 후보의 앞 조각들
+        self.length = 0  # chunks의 글자 수
+        self.stack = []
+        self.inner = -1  # 후보 안에서 처음 열린 괄호의 위치 (후보 시작 기준)
+        self.in_string = False
+        self.escaped = False  # 직전 조각이 문자열 안의 역슬래시로 끝남
+        self.value = _MISSING
+
+    @property
+    def done(self) -> bool:
+        return self.value is not _MISSING
+
+    def _reset(self):
+        self.chunks = []
+        self.length = 0
+        self.stack = []
+        self.inner = -1
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """조각을 추가하고 값이 완성되었으면 True"""
+        if self.done:
+            return True
+        pos = 0
+        if self.escaped and chunk:
+            self.escaped = False
+            pos = 1
+        # (텍스트, 위치) - 실패한 후보 안쪽을 다시 볼 때는 그 부분을 위에 쌓고, 끝나면 원래 조각을 이어서 봄
+        pending = [(chunk, pos)]
+        while pending:
+            text, pos = pending.pop()
+            if self._scan(text, pos, pending):
+                return True
+        return False
+
+    def _scan(self, text: str, pos: int, pending: list) -> bool:
+        origin = 0  # 이 텍스트에서 후보가 시작된 위치
+        while True:
+            # 의미 있는 글자(괄호, 따옴표, 이스케이프)로만 건너뜀
+            if not self.stack:
+                pattern = _OPEN_RE[self.expect]
+            else:
+                pattern = _STRING_RE if self.in_string else _STRUCTURE_RE
+            match = pattern.search(text, pos)
+            if match is None:
+                if self.stack:
+                    self.chunks.append(text[origin:])
+                    self.length += len(text) - origin
+                return False
+            index = match.start()
+            char = text[index]
+            pos = index + 1
+            if not self.stack:
+                origin = index
+                self.stack.append(_OPENERS[char])
+            elif self.in_string:
+                if char == '\\':
+                    if pos >= len(text):
+                        # 이스케이프 다음 글자는 다음 조각에서 건너뜀
+                        self.escaped = True
+                    pos += 1
+                else:
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in _OPENERS:
+                if self.inner < 0:
+                    self.inner = self.length + index - origin
+                self.stack.append(_OPENERS[char])
+            else:
+                matched = char == self.stack.pop()
+                if matched and self.stack:
+                    continue
+                candidate = ''.join(self.chunks) + text[origin:index + 1]
+                if matched:
+                    value = _loads(candidate)
+                    if value is not _MISSING and (self.accept is None or self.accept(value)):
+                        self.value = value
+                        self._reset()
+                        return True
+                inner = self.inner
+                self._reset()
+                if inner >= 0:
+                    # 실패한 후보 안쪽에 든 값만 다시 스캔한 뒤, 이 텍스트는 실패 위치 다음부터 이어서 봄
+                    pending.append((text, pos))
+                    pending.append((candidate[inner:], 0))
+                    return False
+                origin = pos
+
+    def result(self):
+        if not self.done:
+            raise StructuredOutputError('no complete JSON value in response')
+        return self.value
+
+
+def _expected_opener(schema) -> Optional[str]:
+    if schema is None:
+        return None
+    if isinstance(schema, type) and issubclass(schema, (BaseModel, dict)):
+        return '{'
+    origin = typing.get_origin(schema)
+    if schema is list or origin in (list, tuple, set):
+        return '['
+    if origin is dict:
+        return '{'
+    return None
+
+
+_adapters = {}
+
+
+def _adapter(schema) -> TypeAdapter:
+    key = repr(schema)
+    if key not in _adapters:
+        _adapters[key] = TypeAdapter(schema)
+    return _adapters[key]
+
+
+def validate(value, schema):
+    """파싱된 값을 스키마로 검증 (BaseModel이면 dict로 돌려줌)"""
+    if schema is None:
+        return value
+    try:
+        validated = _adapter(schema).validate_python(value)
+    except ValidationError as e:
+        raise StructuredOutputError(f"response does not match {getattr(schema, '__name__', schema)}: {e}") from e
+    return _adapter(schema).dump_python(validated, mode='json')
+
+
+def extract_json(text: str, expect: Optional[str] = None):
+    """텍스트에서 첫 번째 JSON 객체/배열 (없으면 StructuredOutputError)"""
+    scanner = JSONScanner(expect)
+    scanner.feed(text or '')
+    return scanner.result()
+
+
+def _scanner(schema) -> JSONScanner:
+    # 스키마에 맞지 않는 값(본문의 "[1]" 같은 각주 등)은 건너뛰고 다음 후보를 찾음
+    def accept(value) -> bool:
+        try:
+            _adapter(schema).validate_python(value)
+            return True
+        except ValidationError:
+            return False
+    return JSONScanner(_expected_opener(schema), accept if schema is not None else None)
+
+
+def _result(scanner: JSONScanner, schema):
+    if not scanner.done:
+        if schema is not None:
+            raise StructuredOutputError(f"no JSON value matching {getattr(schema, '__name__', schema)} in response")
+        raise StructuredOutputError('no complete JSON value in response')
+    return validate(scanner.value, schema)
+
+
+def parse(text: str, schema=None):
+    """응답 텍스트 -> 스키마로 검증한 첫 번째 값 (pydantic 모델, List[...] 등 TypeAdapter가 받는 타입)"""
+    scanner = _scanner(schema)
+    scanner.feed(text or '')
+    return _result(scanner, schema)
+
+
+def parse_chunks(chunks: Iterable[str], schema=None):
+    """스트리밍 조각을 받는 대로 스캔 - 값이 완성되면 나머지 조각은 읽지 않음"""
+    scanner = _scanner(schema)
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return _result(scanner, schema)
+
+
+async def parse_stream(chunks: AsyncIterator[str], schema=None):
+    """parse_chunks의 비동기 버전 (LLMGateway.stream_async 결과 등)"""
+    scanner = _scanner(schema)
+    async for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return _result(scanner, schema)
+
+
+def validator(schema=None) -> Callable[[str], bool]:
+    """응답 캐시 저장 여부 판단용 - 스키마에 맞는 응답만 True"""
+    def is_valid(text: str) -> bool:
+        try:
+            parse(text, schema)
+            return True
+        except StructuredOutputError:
+            return False
+    return is_valid
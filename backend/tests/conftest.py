@@ -0,0 +1,9 @@
+"""
+테스트 공통 설정
+backend 모듈은 평평한 구조(import rate_limiter 등)라서 backend 디렉터리를 import 경로에 추가
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
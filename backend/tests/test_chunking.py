@@ -0,0 +1,128 @@
+"""chunking - 내용 기반 조각 나누기, 조각별 분석(map), 결과 합치기(reduce)"""
+
+import asyncio
+import threading
+
+import pytest
+
+import chunking
+from chunking import (chunk_weights, map_chunks, map_chunks_sync, merge_results, merge_unique,
+                      rank_by_frequency, split_chunks, split_units)
+from research import estimate_tokens
+
+
+def paragraphs(count: int, words: int = 40):
+    return [' '.join(f"p{index}w{word}" for word in range(words)) + '.' for index in range(count)]
+
+
+def test_short_text_is_one_chunk():
+    assert split_chunks('짧은 글입니다.\n\n두 번째 문단.') == ['짧은 글입니다.\n두 번째 문단.']
+    assert split_chunks('') == []
+
+
+def test_units_split_on_blank_lines_and_html_blocks():
+    assert split_units('<p>하나</p><p>둘</p>\n\n셋') == ['<p>하나</p>', '<p>둘</p>', '셋']
+
+
+def test_chunks_respect_budget_and_keep_all_units():
+    text = '\n\n'.join(paragraphs(60))
+    chunks = split_chunks(text, max_tokens=300)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+    assert '\n'.join(chunks).split('\n') == split_units(text, 300)
+
+
+def test_long_paragraph_falls_back_to_sentences_and_characters():
+    sentence = 'word ' * 200 + '.'
+    units = split_units(sentence + ' ' + 'x' * 4000, max_tokens=100)
+    assert len(units) > 2
+    assert all(estimate_tokens(unit) <= 100 for unit in units)
+
+
+def test_editing_one_paragraph_keeps_later_chunks():
+    original = paragraphs(80)
+    edited = list(original)
+    edited[3] = 'completely rewritten opening paragraph with different words.'
+    before = split_chunks('\n\n'.join(original), max_tokens=400)
+    after = split_chunks('\n\n'.join(edited), max_tokens=400)
+    # 내용 기반 경계라서 고친 문단이 든 조각(과 예산이 밀린 다음 조각)만 달라짐 -> 나머지는 응답 캐시 재사용
+    changed = [chunk for chunk in after if chunk not in before]
+    assert 1 <= len(changed) <= 2
+    assert any(edited[3] in chunk for chunk in changed)
+    assert len(before) >= 5
+
+
+def test_boundary_frequency_setting(monkeypatch):
+    text = '\n\n'.join(paragraphs(40, words=5))
+    monkeypatch.setattr(chunking, 'CHUNK_BOUNDARY_EVERY', 1)
+    # 모든 문단이 경계 후보 -> 예산의 1/4을 넘을 때마다 끊김
+    assert len(split_chunks(text, max_tokens=40)) > len(split_chunks(text, max_tokens=400))
+
+
+def test_map_chunks_keeps_order_and_limits_concurrency():
+    running = 0
+    peak = 0
+
+    async def analyze(chunk):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 if chunk == 'a' else 0)
+        running -= 1
+        return chunk.upper()
+    assert asyncio.run(map_chunks(['a', 'b', 'c', 'd'], analyze, concurrency=2)) == ['A', 'B', 'C', 'D']
+    assert peak == 2
+
+
+def test_map_chunks_sync_runs_in_threads_and_keeps_order():
+    threads = set()
+
+    def analyze(chunk):
+        threads.add(threading.get_ident())
+        return len(chunk)
+    assert map_chunks_sync(['a', 'bb', 'ccc'], analyze, concurrency=3) == [1, 2, 3]
+    assert map_chunks_sync(['only'], analyze) == [4]
+
+
+def test_map_chunks_propagates_errors():
+    async def analyze(chunk):
+        raise ValueError(chunk)
+    with pytest.raises(ValueError):
+        asyncio.run(map_chunks(['x'], analyze))
+
+
+def test_merge_unique_normalizes_case_and_whitespace():
+    assert merge_unique([['Use headings', 'Add links'], ['use  HEADINGS', 'Shorten intro']]) == \
+        ['Use headings', 'Add links', 'Shorten intro']
+    assert merge_unique([[1, 2], [2, 3]], limit=2) == [1, 2]
+    claims = [[{'claim': 'A'}], [{'claim': 'a '}, {'claim': 'B'}]]
+    assert merge_unique(claims, key=lambda item: item['claim'].strip().lower()) == [{'claim': 'A'}, {'claim': 'B'}]
+
+
+def test_rank_by_frequency_puts_repeated_items_first():
+    lists = [['#a', '#b', '#b'], ['#c', '#B'], ['#b', '#c']]
+    assert rank_by_frequency(lists) == ['#b', '#c', '#a']
+    assert rank_by_frequency(lists, limit=1) == ['#b']
+
+
+def test_merge_results_combines_fields_by_type():
+    results = [
+        {'score': 80, 'level': '중급', 'suggestions': ['a', 'b'], 'ok': True, 'detail': {'ratio': 0.5}},
+        {'score': 60, 'level': '고급', 'suggestions': ['B', 'c'], 'ok': False, 'detail': {'ratio': 1.0}},
+        {'score': 70, 'level': '중급', 'suggestions': None, 'ok': True, 'detail': {'ratio': 0.8}},
+    ]
+    merged = merge_results(results, [1, 3, 1])
+    assert merged['score'] == 66  # (80 + 180 + 70) / 5, 정수끼리면 반올림한 정수
+    assert merged['level'] == '고급'  # 가중 다수결: 고급 3 > 중급 2
+    assert merged['suggestions'] == ['a', 'b', 'c']
+    assert merged['ok'] is False
+    assert merged['detail'] == {'ratio': 0.9}
+
+
+def test_merge_results_single_result_is_returned_as_is():
+    result = {'score': 1}
+    assert merge_results([result], [10]) is result
+
+
+def test_chunk_weights_are_positive_token_counts():
+    assert chunk_weights(['', 'abcd' * 10]) == [1, 10]
@@ -0,0 +1,66 @@
+"""dedup - SimHash 지문, LSH 클러스터 배정, 대표 항목 선택"""
+
+from dedup import (StoryClusterIndex, cluster_items, hamming, normalize_text, simhash)
+
+TITLE = "OpenAI releases new GPT model with improved reasoning and lower cost"
+SUMMARY = "The company said the model outperforms previous versions on coding and math benchmarks"
+
+
+def test_normalize_strips_prefix_and_source_suffix():
+    assert normalize_text("[논문] Scaling Laws - TechCrunch", "Summary!") == "scaling laws summary"
+
+
+def test_simhash_is_stable_and_64_bit():
+    fingerprint = simhash(normalize_text(TITLE, SUMMARY))
+    assert fingerprint == simhash(normalize_text(TITLE, SUMMARY))
+    assert 0 <= fingerprint < 1 << 64
+
+
+def test_simhash_of_empty_text_is_none():
+    assert simhash('') is None
+    assert simhash(normalize_text('', '')) is None
+
+
+def test_near_duplicates_are_close_and_unrelated_stories_are_far():
+    original = simhash(normalize_text(TITLE, SUMMARY))
+    syndicated = simhash(normalize_text(TITLE + " - Reuters", SUMMARY))
+    unrelated = simhash(normalize_text("Local bakery wins award for sourdough bread",
+                                       "Residents lined up early to taste the winning loaf"))
+    assert hamming(original, syndicated) == 0
+    assert hamming(original, unrelated) > 3
+
+
+def test_index_groups_same_story_from_different_sources():
+    index = StoryClusterIndex()
+    first = index.add('a', TITLE, SUMMARY)
+    assert index.add('b', f"[News] {TITLE} - The Verge", SUMMARY) == first
+    other = index.add('c', "Local bakery wins award for sourdough bread", "Residents lined up early")
+    assert other != first
+    assert index.clusters[first] == ['a', 'b']
+    assert len(index) == 3
+
+
+def test_items_without_text_get_their_own_clusters():
+    index = StoryClusterIndex()
+    first = index.add('a', '', '')
+    second = index.add('b', '', '')
+    assert first != second
+    # 빈 항목은 밴드 인덱스에 들어가지 않으므로 이후 항목과도 묶이지 않음
+    assert index.add('c', TITLE, SUMMARY) not in (first, second)
+
+
+def test_cluster_items_annotates_items_and_picks_representative():
+    items = [
+        {'id': '1', 'title': TITLE, 'summary': SUMMARY, 'score': 10},
+        {'id': '2', 'title': TITLE + " - Reuters", 'summary': SUMMARY, 'score': 50},
+        {'id': '3', 'title': "Local bakery wins award for sourdough bread", 'summary': '', 'score': 5},
+    ]
+    representatives = cluster_items(items, rank_key=lambda item: item['score'])
+    assert [item['id'] for item in representatives] == ['2', '3']
+    assert [item['cluster_size'] for item in items] == [2, 2, 1]
+    assert items[0]['cluster_id'] == items[1]['cluster_id'] != items[2]['cluster_id']
+
+
+def test_cluster_items_defaults_to_first_seen_representative():
+    items = [{'title': TITLE, 'summary': SUMMARY}, {'title': TITLE, 'summary': SUMMARY}]
+    assert cluster_items(items) == [items[0]]
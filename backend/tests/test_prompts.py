@@ -0,0 +1,69 @@
+"""prompts - 템플릿 렌더링, 버전 ID, 별칭/언어/fallback 조회, JSON 덮어쓰기"""
+
+import json
+
+from prompts import CONTENT_TEMPLATES, PromptRegistry, PromptTemplate, build_registry
+
+
+def test_render_puts_inputs_after_fixed_prefix():
+    template = PromptTemplate('t', '지시문', [['제목', 'title'], ['내용', 'content']])
+    prompt, system = template.messages(content='본문', title='제목1')
+    assert prompt == '지시문\n\n제목: 제목1\n내용: 본문'
+    assert prompt.startswith(template.prefix)
+    assert system == template.system
+
+
+def test_template_id_changes_only_with_wording():
+    first = PromptTemplate('t', '지시문')
+    assert first.id == PromptTemplate('t', '지시문').id
+    assert first.id != PromptTemplate('t', '다른 지시문').id
+    assert first.id.startswith('t.ko@')
+
+
+def test_aliases_and_locale_variants():
+    registry = build_registry()
+    assert registry.get('blog-intro').name == 'blog_post_intro'
+    assert registry.get('blog-intro', 'en').locale == 'en'
+    # 영어 변형이 없는 템플릿은 영어 default
+    assert registry.get('review', 'en').id == registry.get('default', 'en').id
+    # 모르는 언어는 한국어 템플릿
+    assert registry.get('listicle', 'fr').id == registry.get('listicle').id
+
+
+def test_unknown_name_uses_fallback():
+    registry = build_registry()
+    assert registry.get('unknown').name == 'default'
+    assert registry.get('unknown', fallback='blog-intro').name == 'blog_post_intro'
+    assert registry.get('unknown', 'en', fallback='blog-intro').id == registry.get('blog_post_intro', 'en').id
+    assert registry.get('listicle', fallback='blog-intro').name == 'listicle'
+    prompt, _ = registry.render('unknown', fallback='blog-intro', content='본문')
+    assert prompt.endswith('내용: 본문')
+
+
+def test_load_overrides_and_skips_bad_entries(tmp_path, capsys):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps({
+        'listicle': {'instructions': '새 리스티클 지시문'},
+        'broken': {'fields': []},
+        'newsletter': {'instructions': '뉴스레터', 'aliases': ['mail']},
+    }, ensure_ascii=False), encoding='utf-8')
+    registry = PromptRegistry(CONTENT_TEMPLATES)
+    before = registry.get('listicle').id
+    registry.load(str(path))
+    assert registry.get('listicle').id != before
+    assert registry.get('mail').name == 'newsletter'
+    assert registry.get('broken').name == 'default'
+    assert 'broken' in capsys.readouterr().out
+
+
+def test_load_missing_file_keeps_registry(tmp_path):
+    registry = PromptRegistry(CONTENT_TEMPLATES)
+    registry.load(str(tmp_path / 'missing.json'))
+    assert registry.get('listicle').name == 'listicle'
+
+
+def test_catalog_lists_every_variant_with_aliases():
+    catalog = {entry['id']: entry for entry in build_registry().catalog()}
+    intro = [entry for entry in catalog.values() if entry['name'] == 'blog_post_intro']
+    assert {entry['locale'] for entry in intro} == {'ko', 'en'}
+    assert intro[0]['aliases'] == ['blog-intro', 'blog_intro']
@@ -0,0 +1,98 @@
+"""rate_limiter - 토큰 버킷 충전/대기 시간, 429 대응, Retry-After 파싱"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import rate_limiter
+from rate_limiter import DEFAULT_BACKOFF, RateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', clock)
+    return clock
+
+
+def test_burst_is_free_then_requests_are_spaced_by_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # 버스트를 다 쓰면 초당 2개 -> 0.5초 간격으로 예약
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.waited == pytest.approx(1.5)
+    assert bucket.requests == 5
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.advance(60)
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_partial_refill_shortens_wait(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.reserve()
+    clock.advance(0.25)
+    assert bucket.reserve() == pytest.approx(0.75)
+
+
+def test_penalize_blocks_bucket_until_delay_passes(clock):
+    bucket = TokenBucket(rate=10.0, burst=5)
+    bucket.penalize(30)
+    assert bucket.reserve() == pytest.approx(30.1)
+    assert bucket.throttled == 1
+
+
+def test_penalize_without_retry_after_backs_off_exponentially(clock):
+    bucket = TokenBucket(rate=10.0, burst=5)
+    bucket.penalize(None)
+    assert bucket.blocked_until == pytest.approx(clock.now + DEFAULT_BACKOFF)
+    bucket.penalize(None)
+    assert bucket.blocked_until == pytest.approx(clock.now + DEFAULT_BACKOFF * 2)
+    bucket.reset_backoff()
+    assert bucket.backoff == DEFAULT_BACKOFF
+
+
+def test_observe_penalizes_only_rate_limit_responses(clock):
+    limiter = RateLimiter()
+    url = 'https://www.reddit.com/r/artificial.json'
+    assert limiter.observe(url, 200) is False
+    assert limiter.observe(url, 503) is False  # Retry-After 없는 503은 일시 오류로 보고 넘어감
+    assert limiter.observe(url, 503, {'Retry-After': '7'}) is True
+    assert limiter.observe(url, 429) is True
+    assert limiter.stats()['www.reddit.com']['throttled'] == 2
+
+
+def test_buckets_are_per_host_with_configured_limits():
+    limiter = RateLimiter(host_limits={'example.com': (1.0, 2)})
+    assert limiter.bucket('https://example.com/a') is limiter.bucket('https://example.com/b')
+    assert (limiter.bucket('https://example.com/a').rate, limiter.bucket('https://example.com/a').burst) == (1.0, 2)
+    assert limiter.bucket('https://other.org/').burst == rate_limiter.DEFAULT_LIMIT[1]
+
+
+@pytest.mark.parametrize('value, expected', [('120', 120.0), ('-5', 0.0), (None, None), ('', None),
+                                             ('soon', None)])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert parse_retry_after(format_datetime(retry_at, usegmt=True)) == pytest.approx(90, abs=2)
@@ -0,0 +1,86 @@
+"""relevance - 배치 채점 가중치와 top_k 선택 (동점 순서 포함)"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import relevance
+from relevance import RelevanceScorer, top_k
+
+NOW = datetime(2026, 1, 10, 12, 0)
+
+
+def item(title, summary='', days=10, **extra):
+    return {'title': title, 'summary': summary, 'published_date': NOW - timedelta(days=days), **extra}
+
+
+@pytest.fixture(params=[True, False], ids=['ahocorasick', 'regex'])
+def scorer(request, monkeypatch):
+    if request.param and not relevance.AHOCORASICK_AVAILABLE:
+        pytest.skip('pyahocorasick not installed')
+    monkeypatch.setattr(relevance, 'AHOCORASICK_AVAILABLE', request.param)
+    return RelevanceScorer(keywords=['llm', 'gpt', 'Neural Network'], source_weights={'lab': 1.5},
+                           max_score=100)
+
+
+def test_title_and_summary_hits_are_weighted(scorer):
+    scores = scorer.score([item('LLM and GPT news', 'gpt again'), item('nothing here', 'neural network')], NOW)
+    # 키워드는 항목마다 한 번만 셈: 제목 2개 × 2 + 요약 1개 × 1
+    assert scores.tolist() == [5.0, 1.0]
+
+
+def test_matches_do_not_cross_item_boundaries(scorer):
+    # 앞 항목 끝 "neural"과 다음 항목 시작 "network"가 이어 붙여져도 매칭되지 않아야 함
+    scores = scorer.score([item('about neural'), item('network effects')], NOW)
+    assert scores.tolist() == [0.0, 0.0]
+
+
+def test_source_recency_and_popularity_multipliers(scorer):
+    items = [
+        item('llm', source_id='lab'),             # 2 × 1.5
+        item('llm', days=0),                      # 2 × 2.0 (오늘)
+        item('llm', days=2),                      # 2 × 1.2 (3일 이내)
+        item('llm', score=150),                   # 2 × 1.5 (인기 100 초과)
+        item('llm', score=60),                    # 2 × 1.2
+        item('llm', days=-1),                     # 미래 날짜 -> 가장 낮은 최근성 구간 1.2
+    ]
+    assert scorer.score(items, NOW) == pytest.approx([3.0, 4.0, 2.4, 3.0, 2.4, 2.4])
+
+
+def test_scores_are_capped_at_max_score():
+    scorer = RelevanceScorer(keywords=['a', 'b', 'c'], max_score=3)
+    assert scorer.score([item('a b c', 'a b c', days=0)], NOW).tolist() == [3.0]
+
+
+def test_empty_batch():
+    assert RelevanceScorer().score([], NOW).shape == (0,)
+
+
+def test_top_k_orders_by_score_descending():
+    items = ['a', 'b', 'c', 'd']
+    assert top_k(items, np.array([1.0, 4.0, 2.0, 3.0]), 2) == ['b', 'd']
+
+
+def test_top_k_ties_keep_original_order():
+    items = ['a', 'b', 'c', 'd', 'e']
+    scores = np.array([1.0, 2.0, 2.0, 5.0, 2.0])
+    assert top_k(items, scores, 3) == ['d', 'b', 'c']
+    assert top_k(items, scores, 5) == ['d', 'b', 'c', 'e', 'a']
+
+
+def test_top_k_matches_stable_sort_on_random_input():
+    rng = np.random.default_rng(7)
+    scores = rng.integers(0, 5, size=200).astype(float)
+    items = list(range(200))
+    expected = sorted(items, key=lambda index: -scores[index])[:25]
+    assert top_k(items, scores, 25) == expected
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_top_k_with_non_positive_k(k):
+    assert top_k(['a'], np.array([1.0]), k) == []
+
+
+def test_top_k_larger_than_batch_returns_everything():
+    assert top_k(['a', 'b'], np.array([1.0, 2.0]), 10) == ['b', 'a']
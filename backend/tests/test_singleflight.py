@@ -0,0 +1,102 @@
+"""singleflight - 같은 키의 동시 호출 합치기 (스레드, 이벤트 루프)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight, flight_key
+
+
+def test_flight_key_ignores_dict_order():
+    assert flight_key('ollama', {'a': 1, 'b': 2}) == flight_key('ollama', {'b': 2, 'a': 1})
+    assert flight_key('ollama', 'p', 'batch') != flight_key('ollama', 'p', 'interactive')
+
+
+def test_concurrent_sync_calls_share_one_execution():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('k', fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do('k', fn))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flights.stats()['coalesced'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+    assert results == ['result'] * 4
+    assert len(calls) == 1
+    assert flights.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 3, 'coalesced_rate': 0.75}
+
+
+def test_sync_errors_are_shared_and_not_cached():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+    with pytest.raises(ValueError):
+        flights.do('k', fail)
+    # 끝난 호출은 목록에서 빠지므로 다음 호출은 새로 실행
+    assert flights.do('k', lambda: 'ok') == 'ok'
+
+
+def test_async_calls_share_one_task():
+    flights = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async('k', fn) for _ in range(5)))
+    assert asyncio.run(main()) == [1] * 5
+    assert flights.stats()['coalesced'] == 4
+
+
+def test_cancelled_waiter_does_not_cancel_shared_task():
+    flights = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def main():
+        first = asyncio.ensure_future(flights.do_async('k', fn))
+        second = asyncio.ensure_future(flights.do_async('k', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    assert asyncio.run(main()) == 'done'
+
+
+def test_task_is_cancelled_when_every_waiter_leaves():
+    flights = SingleFlight()
+    finished = []
+
+    async def fn():
+        await asyncio.sleep(1)
+        finished.append(1)
+
+    async def main():
+        waiter = asyncio.ensure_future(flights.do_async('k', fn))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        return flights.stats()['in_flight']
+    assert asyncio.run(main()) == 0
+    assert finished == []
@@ -0,0 +1,117 @@
+"""structured_output - 응답 속 JSON 추출, 스키마 검증, 조각 단위 스캔"""
+
+import asyncio
+from typing import Dict, List, Union
+
+import pytest
+
+import schemas
+import structured_output
+from structured_output import JSONScanner, StructuredOutputError, extract_json, parse, parse_chunks
+
+
+def chunked(text: str, size: int) -> List[str]:
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('```json\n{"score": 80, "suggestions": ["a"]}\n```', {'score': 80, 'suggestions': ['a']}),
+    ('결과는 다음과 같습니다: ["#ai", "#llm"] 참고하세요', ['#ai', '#llm']),
+    ('{"text": "괄호 } 와 \\"따옴표\\"", "nested": [1, {"a": [2]}]} 뒤 설명',
+     {'text': '괄호 } 와 "따옴표"', 'nested': [1, {'a': [2]}]}),
+    ("{'score': 3, 'ok': True, 'note': None}", {'score': 3, 'ok': True, 'note': None}),
+])
+def test_extract_first_json_value(text, expected):
+    assert extract_json(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', 'JSON이 없는 응답', '{"unterminated": [1, 2'])
+def test_missing_json_raises(text):
+    with pytest.raises(StructuredOutputError):
+        extract_json(text)
+
+
+def test_prose_brackets_are_skipped():
+    assert extract_json('[참고] 본문 [1] 이후 {"a": 1}', expect='{') == {'a': 1}
+    assert extract_json('[참고] {"a": 1}') == {'a': 1}
+
+
+def test_schema_skips_values_that_do_not_match():
+    text = '각주 [1] 그리고 {"score": 1} 최종 {"score": 70, "suggestions": ["x"]}'
+    assert parse(text, schemas.SEOAnalysis) == {'score': 70.0, 'suggestions': ['x']}
+
+
+def test_required_fields_are_enforced():
+    with pytest.raises(StructuredOutputError):
+        parse('{}', schemas.SEOAnalysis)
+    with pytest.raises(StructuredOutputError):
+        parse('{"score": 50, "level": "중급"}', schemas.ReadabilityAnalysis)
+
+
+def test_list_and_dict_schemas():
+    assert parse('{"a": "x"} 그리고 [1, 2]', List[int]) == [1, 2]
+    assert parse('[1] {"a": 1}', Dict[str, int]) == {'a': 1}
+    facts = parse('```[{"claim": "c", "status": "검증됨"}]```', List[schemas.FactCheckResult])
+    assert facts == [{'claim': 'c', 'status': '검증됨', 'explanation': ''}]
+
+
+def test_title_suggestions_accept_object_or_bare_list():
+    schema = Union[schemas.TitleSuggestions, List[schemas.TitleSuggestion]]
+    assert parse('{"titles": [{"title": "a"}]}', schema) == {'titles': [{'title': 'a'}]}
+    assert parse("예: [{'title': '제목1'}]", schema) == [{'title': '제목1'}]
+    with pytest.raises(StructuredOutputError):
+        parse('["제목만"]', schema)
+
+
+def test_value_nested_in_broken_wrapper_is_found():
+    text = '{ 설명 [ {"score": 2, "suggestions": ["z"]} ] }'
+    assert parse(text, schemas.SEOAnalysis) == {'score': 2.0, 'suggestions': ['z']}
+
+
+def test_mismatched_brackets_resume_after_failure():
+    assert parse('{"x": [1, 2} {"score": 5, "suggestions": []}', schemas.SEOAnalysis)['score'] == 5.0
+
+
+def test_brackets_inside_strings_are_not_candidates():
+    assert extract_json('{"note": "[1, 2]" 깨진 객체} [3]') == [3]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64])
+def test_chunked_feed_matches_whole_text(size):
+    text = '앞 설명 [참고] {"a": "이스케이프 \\\\ 와 \\" 포함", "b": [1, {"c": "}"}]} 뒤 {"d": 1}'
+    assert parse_chunks(chunked(text, size)) == extract_json(text)
+
+
+def test_scanner_stops_reading_after_value_completes():
+    read = []
+
+    def chunks():
+        for chunk in ['{"score": 9, ', '"suggestions": []}', ' 나머지']:
+            read.append(chunk)
+            yield chunk
+    assert parse_chunks(chunks(), schemas.SEOAnalysis)['score'] == 9.0
+    assert read == ['{"score": 9, ', '"suggestions": []}']
+
+
+def test_scanner_keeps_only_open_candidate_chunks():
+    scanner = JSONScanner()
+    scanner.feed('긴 설명 ' * 1000)
+    assert scanner.chunks == [] and scanner.length == 0
+    scanner.feed('{"a": ')
+    scanner.feed('[1, 2')
+    assert scanner.chunks == ['{"a": ', '[1, 2'] and not scanner.done
+    assert scanner.feed(']}') and scanner.result() == {'a': [1, 2]}
+
+
+def test_parse_stream():
+    async def chunks():
+        for chunk in chunked('응답: ["#a", "#b"]', 3):
+            yield chunk
+    assert asyncio.run(structured_output.parse_stream(chunks(), List[str])) == ['#a', '#b']
+
+
+def test_validator():
+    is_valid = structured_output.validator(schemas.MetaTags)
+    assert is_valid('{"title": "t", "description": "d"}')
+    assert not is_valid('{"title": "t"}')
+    assert not is_valid('설명만 있는 응답')
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+HTML 본문 텍스트 추출
+파이썬 객체 트리(BeautifulSoup) 없이 <p> 문단 텍스트를 뽑아냄
+selectolax(lexbor, C 트리) -> lxml(target 파서, 트리 없이 이벤트만) -> html.parser 순으로 사용 가능한 것을 씀
+"""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import List, Optional, Union
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+BACKEND = 'selectolax' if SELECTOLAX_AVAILABLE else 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+_TAG_RE = re.compile(r'<[^>]*>')
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class _ParagraphCollector:
+    """시작/끝 태그와 텍스트 이벤트를 받아 <p> 단위로 텍스트를 모음 (lxml target 인터페이스)"""
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.paragraphs: List[str] = []
+        self.total = 0
+        self.depth = 0  # 열린 <p> 수 (중첩된 <p>도 바깥 문단에 포함)
+        self.skip = 0
+        self.buffer: List[str] = []
+
+    def _tag(self, tag) -> str:
+        # lxml은 주석/처리 명령 이벤트에 문자열이 아닌 태그를 넘기므로 방어
+        return tag.lower() if isinstance(tag, str) else ''
+
+    def start(self, tag, attrs=None):
+        tag = self._tag(tag)
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag == 'p':
+            self.depth += 1
+
+    def end(self, tag):
+        tag = self._tag(tag)
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag == 'p' and self.depth:
+            self.depth -= 1
+            if not self.depth:
+                self._flush()
+
+    def data(self, text: str):
+        if self.depth and not self.skip and not self.full:
+            self.buffer.append(text)
+
+    def _flush(self):
+        text = ' '.join(''.join(self.buffer).split())
+        self.buffer = []
+        if text and not self.full:
+            self.paragraphs.append(text)
+            self.total += len(text) + 1
+
+    @property
+    def full(self) -> bool:
+        return self.max_chars is not None and self.total >= self.max_chars
+
+    def close(self) -> List[str]:
+        if self.depth:
+            self._flush()
+        return self.paragraphs
+
+
+class _StdlibParser(HTMLParser):
+    """lxml이 없을 때 쓰는 표준 라이브러리 토크나이저"""
+
+    def __init__(self, collector: _ParagraphCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def _decode(html: bytes, encoding: Optional[str] = None) -> str:
+    if not encoding:
+        match = _CHARSET_RE.search(html[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return html.decode(encoding, errors='replace')
+    except LookupError:
+        return html.decode('utf-8', errors='replace')
+
+
+def _extract_lexbor(html: Union[bytes, str], max_chars: Optional[int], encoding: Optional[str]) -> List[str]:
+    if isinstance(html, bytes):
+        html = _decode(html, encoding)  # lexbor는 바이트를 UTF-8로만 해석하므로 meta charset을 먼저 반영
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(SKIP_TAGS))
+    paragraphs, total = [], 0
+    for node in tree.css('p'):
+        text = ' '.join(node.text(separator='').split())
+        if text:
+            paragraphs.append(text)
+            total += len(text) + 1
+            if max_chars is not None and total >= max_chars:
+                break
+    return paragraphs
+
+
+def extract_paragraphs(html: Union[bytes, str], max_chars: Optional[int] = None,
+                       encoding: Optional[str] = None) -> List[str]:
+    """HTML에서 <p> 문단 텍스트 목록 추출 (max_chars에 도달하면 더 모으지 않음)"""
+    if not html:
+        return []
+    if SELECTOLAX_AVAILABLE:
+        return _extract_lexbor(html, max_chars, encoding)
+
+    collector = _ParagraphCollector(max_chars)
+    if LXML_AVAILABLE:
+        if isinstance(html, bytes) and encoding:
+            html = _decode(html, encoding)
+        parser = etree.HTMLParser(target=collector, recover=True)
+        try:
+            parser.feed(html)
+            return parser.close()
+        except etree.LxmlError:
+            # 손상이 심한 문서는 표준 파서로 다시 시도
+            collector = _ParagraphCollector(max_chars)
+
+    if isinstance(html, bytes):
+        html = _decode(html, encoding)
+    parser = _StdlibParser(collector)
+    parser.feed(html)
+    parser.close()
+    return collector.close()
+
+
+def extract_text(html: Union[bytes, str], max_chars: Optional[int] = None,
+                 encoding: Optional[str] = None) -> str:
+    """문단 텍스트를 공백으로 이어 붙인 본문"""
+    return ' '.join(extract_paragraphs(html, max_chars=max_chars, encoding=encoding))
+
+
+def html_to_text(text: Optional[str]) -> str:
+    """짧은 HTML 조각(피드 요약 등)의 태그 제거 + 엔티티 변환 + 공백 정리"""
+    if not text:
+        return ""
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = unescape(text)
+    return ' '.join(text.split())